@@ -1,20 +1,27 @@
-from typing import Any
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from enum import Enum
+from typing import Any, TypeVar
+
+from core.metrics import cache_requests_counter
+
+T = TypeVar("T")
 
 
 class LRUCache:
     """A class representing an LRU cache."""
 
     def __init__(self, capacity: int = 10) -> None:
-        self.cache: dict[str, Any] = {}
-        self.keys: list[str] = []
+        self.cache: OrderedDict[str, Any] = OrderedDict()
         self.capacity = capacity
 
     def get(self, key: str) -> Any:  # noqa: ANN401
         """Get a value from the cache and mark as most recently used."""
         if key in self.cache:
             # Move the key to the end to mark it as most recently used
-            self.keys.remove(key)
-            self.keys.append(key)
+            self.cache.move_to_end(key)
             return self.cache[key]
         return None
 
@@ -22,11 +29,71 @@ class LRUCache:
         """Set a value in the cache and handle capacity."""
         if key in self.cache:
             # Move the key to the end to mark it as most recently used
-            self.keys.remove(key)
-        elif len(self.keys) >= self.capacity:
-            lru_key = self.keys.pop(0)  # Remove and return the least recently used key
-            del self.cache[lru_key]  # Remove the least recently used item from the cache
+            self.cache.move_to_end(key)
+        elif len(self.cache) >= self.capacity:
+            # Remove the least recently used item from the cache
+            self.cache.popitem(last=False)
 
-        # Add the new key and value to the cache and mark as most recently used
         self.cache[key] = value
-        self.keys.append(key)
+
+    def __len__(self) -> int:
+        """Return the number of cached items."""
+        return len(self.cache)
+
+
+class CacheStatus(str, Enum):
+    """Describes how a response was obtained, sent in the ``X-Cache`` header."""
+
+    hit = "HIT"
+    miss = "MISS"
+    coalesced = "COALESCED"
+
+
+class ResponseCache:
+    """Coalesces concurrent identical computations and caches their result for a short TTL.
+
+    While a value is being computed, every request with the same key awaits the same task
+    instead of starting its own. The task is shielded, so a disconnected client doesn't
+    cancel the computation for the others.
+    """
+
+    def __init__(self, ttl: float = 0, capacity: int = 128) -> None:
+        self.ttl = ttl
+        self.cache = LRUCache(capacity=capacity)
+        self.in_flight: dict[str, asyncio.Task[Any]] = {}
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[T]],
+    ) -> tuple[T, CacheStatus]:
+        """Get a cached value, join a computation in flight or start a new one."""
+        cached = self.cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            cache_requests_counter.inc(cache="response", result="hit")
+            return cached[1], CacheStatus.hit
+
+        task = self.in_flight.get(key)
+        if task is not None:
+            cache_requests_counter.inc(cache="response", result="coalesced")
+            return await asyncio.shield(task), CacheStatus.coalesced
+
+        cache_requests_counter.inc(cache="response", result="miss")
+        task = asyncio.create_task(compute())
+        self.in_flight[key] = task
+        task.add_done_callback(lambda done: self._on_done(key, done))
+        return await asyncio.shield(task), CacheStatus.miss
+
+    def is_available(self, key: str) -> bool:
+        """Indicates whether a value is cached or being computed, i.e. cheap to get."""
+        cached = self.cache.get(key)
+        return (cached is not None and cached[0] > time.monotonic()) or key in self.in_flight
+
+    def clear(self) -> None:
+        """Drop all cached values, e.g. after a job has been changed."""
+        self.cache = LRUCache(capacity=self.cache.capacity)
+
+    def _on_done(self, key: str, task: asyncio.Task[Any]) -> None:
+        self.in_flight.pop(key, None)
+        if self.ttl > 0 and not task.cancelled() and task.exception() is None:
+            self.cache.set(key, (time.monotonic() + self.ttl, task.result()))
@@ -0,0 +1,184 @@
+import gzip
+import logging
+from collections.abc import Callable, Iterable
+
+from core.cache import LRUCache
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+Compressor = Callable[[bytes, int | None], bytes]
+
+
+def gzip_compress(data: bytes, level: int | None = None) -> bytes:
+    """Compress with gzip; ``mtime`` is fixed so equal inputs give equal outputs."""
+    return gzip.compress(data, compresslevel=6 if level is None else level, mtime=0)
+
+
+COMPRESSORS: dict[str, Compressor] = {"gzip": gzip_compress}
+BEST_LEVELS: dict[str, int] = {"gzip": 9}
+
+# Brotli and zstd are optional (`pdm install -G compression`), gzip is always available.
+try:
+    import brotli
+
+    def brotli_compress(data: bytes, level: int | None = None) -> bytes:
+        """Compress with brotli; the default quality favours speed for dynamic responses."""
+        return brotli.compress(data, quality=4 if level is None else level)
+
+    COMPRESSORS["br"] = brotli_compress
+    BEST_LEVELS["br"] = 11
+except ImportError:
+    pass
+
+try:
+    import zstandard
+
+    def zstd_compress(data: bytes, level: int | None = None) -> bytes:
+        """Compress with zstd."""
+        return zstandard.ZstdCompressor(level=3 if level is None else level).compress(data)
+
+    COMPRESSORS["zstd"] = zstd_compress
+    BEST_LEVELS["zstd"] = 19
+except ImportError:
+    pass
+
+COMPRESSIBLE_TYPES = {
+    "application/json",
+    "application/javascript",
+    "application/problem+json",
+    "image/svg+xml",
+}
+
+
+def is_compressible(content_type: str) -> bool:
+    """Check whether a content type is worth compressing."""
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type.startswith("text/") or media_type in COMPRESSIBLE_TYPES
+
+
+def add_vary_accept_encoding(headers: MutableHeaders) -> None:
+    """Add ``Accept-Encoding`` to the ``Vary`` header, unless it's already there."""
+    vary = [value.strip().lower() for value in headers.get("vary", "").split(",")]
+    if "accept-encoding" not in vary:
+        headers.add_vary_header("Accept-Encoding")
+
+
+def parse_accept_encoding(header: str) -> dict[str, float]:
+    """Parse an ``Accept-Encoding`` header into quality values, e.g. ``{"gzip": 1.0}``."""
+    qualities: dict[str, float] = {}
+    for item in header.split(","):
+        name, *params = (part.strip() for part in item.split(";"))
+        if not name:
+            continue
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name.lower()] = quality
+    return qualities
+
+
+def negotiate_encoding(header: str, encodings: Iterable[str]) -> str | None:
+    """Choose the first of ``encodings`` (in server preference order) the client accepts."""
+    qualities = parse_accept_encoding(header)
+    for encoding in encodings:
+        if qualities.get(encoding, qualities.get("*", 0)) > 0:
+            return encoding
+    return None
+
+
+class CompressionMiddleware:
+    """Compresses responses with the best encoding accepted by the client.
+
+    Only complete (non-streamed) responses of a compressible type and at least
+    ``minimum_size`` bytes are compressed. Compressed bodies of responses with an
+    ``ETag`` are cached, so polling an unchanged resource compresses it only once.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        encodings: Iterable[str] = ("zstd", "br", "gzip"),
+        cache_size: int = 64,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encodings = [encoding for encoding in encodings if encoding in COMPRESSORS]
+        unavailable = set(encodings) - set(self.encodings)
+        if unavailable:
+            logger.warning(
+                f"Compression with {', '.join(sorted(unavailable))} is unavailable,"
+                " install the backend with the 'compression' extra.",
+            )
+        self.cache = LRUCache(capacity=cache_size)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle an ASGI request."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(
+            Headers(scope=scope).get("accept-encoding", ""),
+            self.encodings,
+        )
+        start_message: Message | None = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                if message["status"] == 304:  # noqa: PLR2004
+                    add_vary_accept_encoding(MutableHeaders(scope=message))
+                    await send(message)
+                    return
+                # Hold the headers back until the body tells whether to compress.
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            headers = MutableHeaders(scope=start)
+            if not is_compressible(headers.get("content-type", "")):
+                await send(start)
+                await send(message)
+                return
+
+            add_vary_accept_encoding(headers)
+            body = message.get("body", b"")
+            if (
+                encoding is None
+                or message.get("more_body", False)
+                or len(body) < self.minimum_size
+                or "content-encoding" in headers
+            ):
+                await send(start)
+                await send(message)
+                return
+
+            compressed = self.compress(encoding, body, headers.get("etag"))
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
+
+    def compress(self, encoding: str, body: bytes, etag: str | None) -> bytes:
+        """Compress a body, reusing the result for a body with the same ``ETag``."""
+        if etag is None:
+            return COMPRESSORS[encoding](body, None)
+        key = f"{encoding}:{etag}"
+        compressed = self.cache.get(key)
+        if compressed is None:
+            compressed = COMPRESSORS[encoding](body, None)
+            self.cache.set(key, compressed)
+        return compressed
@@ -1,5 +1,6 @@
 import os
 from functools import lru_cache
+from zoneinfo import ZoneInfo
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -36,7 +37,64 @@ class Settings(BaseSettings):
 
     max_jobs: int = 50000
     request_semaphore_jobs: int = 5
+    redis_concurrency_max: int = 32
+    redis_latency_target: float = 0.05
+    fetch_batch_size: int = 500
+    warmup_enabled: bool = True
+    warmup_chunk_size: int = 5000
     queue_name: str = "arq:queue"
+    indexed_kwargs: list[str] = []
+    health_check_keys: list[str] = []
+    worker_history_size: int = 60
+
+    changelog_size: int = 10000
+    index_refresh_interval: float = 10.0
+
+    forecast_alpha: float = 0.2
+    forecast_drain_warning: float = 600.0
+    forecast_drain_critical: float = 1800.0
+
+    cleanup_enabled: bool = False
+    cleanup_max_commands_per_second: int = 1000
+
+    # Off by default: behind a proxy, clients are told apart by RATE_LIMIT_CLIENT_HEADER only.
+    rate_limit_rate: float = 0.0
+    rate_limit_burst: float = 600.0
+    rate_limit_max_wait: float = 2.0
+    rate_limit_clients: int = 10000
+    rate_limit_client_header: str = ""
+
+    job_serializer: str = "pickle"
+    deserialize_cache_size: int = 50000
+    deserialize_process_pool_threshold: int = 0
+    deserialize_process_pool_workers: int | None = None
+
+    cpu_executor: str = "thread"
+    cpu_executor_workers: int | None = None
+    cpu_executor_max_queue: int = 32
+
+    jobs_response_ttl: float = 2.0
+    jobs_response_cache_size: int = 128
+
+    health_ping_timeout: float = 1.0
+    health_max_loop_lag: float = 5.0
+    health_max_index_age: float = 0.0
+
+    timing_log_threshold: float = 0.5
+    profiling_enabled: bool = False
+    profiling_interval: float = 0.005
+
+    compression_min_size: int = 1024
+    compression_encodings: list[str] = ["zstd", "br", "gzip"]
+    compression_cache_size: int = 64
+    static_max_age: int = 31536000
+
+    snapshot_path: str = ""
+    snapshot_interval: float = 2.0
+    replay_path: str = ""
+    replay_shift_times: bool = True
+
+    server_side_statistics: bool = False
 
     model_config = SettingsConfigDict(env_file=os.getenv("ENV_FILE", ".env"))
 
@@ -51,3 +109,9 @@ def get_app_settings() -> Settings:
 
     """
     return Settings()
+
+
+@lru_cache
+def get_timezone() -> ZoneInfo:
+    """Retrieve the timezone dates are displayed in, loaded once."""
+    return ZoneInfo(get_app_settings().timezone)
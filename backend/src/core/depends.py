@@ -1,9 +1,80 @@
+from typing import TYPE_CHECKING
+
 from arq.connections import RedisSettings
-from core.cache import LRUCache
+from arq.constants import health_check_key_suffix
+from core.cache import LRUCache, ResponseCache
 from core.config import Settings, get_app_settings
+from core.executor import CpuExecutor
+from core.limiter import AdaptiveLimiter
+from core.monitoring import LoopLagMonitor
+from core.rate_limit import ClientRateLimiter
+from core.redis_pool import RedisPool
+from core.serializers import JobDecoder
+from services.job_index import JobIndex
+from services.job_refresher import JobRefresher
+from services.job_replay import JobReplay
+from services.job_service import JobService
+from services.job_warmup import JobWarmup
+from services.worker_monitor import WorkerMonitor
+
+if TYPE_CHECKING:
+    from services.job_snapshot import JobSnapshot
 
 settings: Settings = get_app_settings()
 cache_singleton = LRUCache(capacity=settings.max_jobs)
+executor_singleton = CpuExecutor(
+    settings.cpu_executor,
+    max_workers=settings.cpu_executor_workers,
+    max_queue=settings.cpu_executor_max_queue,
+)
+loop_monitor_singleton = LoopLagMonitor()
+redis_limiter_singleton = AdaptiveLimiter(
+    initial_limit=settings.request_semaphore_jobs,
+    max_limit=settings.redis_concurrency_max,
+    latency_target=settings.redis_latency_target,
+)
+rate_limiter_singleton = ClientRateLimiter(
+    settings.rate_limit_rate,
+    capacity=settings.rate_limit_burst,
+    max_wait=settings.rate_limit_max_wait,
+    max_clients=settings.rate_limit_clients,
+)
+job_index_singleton = JobIndex(
+    forecast_alpha=settings.forecast_alpha,
+    changelog_size=settings.changelog_size,
+    default_queue=settings.queue_name,
+)
+response_cache_singleton = ResponseCache(
+    ttl=settings.jobs_response_ttl,
+    capacity=settings.jobs_response_cache_size,
+)
+decoder_singleton = JobDecoder(
+    settings.job_serializer,
+    LRUCache(capacity=settings.deserialize_cache_size),
+    executor=executor_singleton,
+    process_pool_threshold=settings.deserialize_process_pool_threshold,
+    process_pool_workers=settings.deserialize_process_pool_workers,
+)
+job_warmup_singleton = JobWarmup(chunk_size=settings.warmup_chunk_size)
+job_refresher_singleton = JobRefresher(interval=settings.index_refresh_interval)
+job_snapshot_singleton: "JobSnapshot | JobReplay | None" = None
+if settings.replay_path:
+    job_snapshot_singleton = JobReplay(
+        settings.replay_path,
+        decoder_singleton,
+        max_jobs=settings.max_jobs,
+        batch_size=settings.fetch_batch_size,
+        shift_times=settings.replay_shift_times,
+    )
+elif settings.snapshot_path:
+    # Only multi-worker deployments share a snapshot, its module is imported for them only.
+    from services.job_snapshot import JobSnapshot
+
+    job_snapshot_singleton = JobSnapshot(
+        settings.snapshot_path,
+        interval=settings.snapshot_interval,
+        executor=executor_singleton,
+    )
 
 
 def get_lru_cache() -> LRUCache:
@@ -11,6 +82,21 @@ def get_lru_cache() -> LRUCache:
     return cache_singleton
 
 
+def get_job_decoder() -> JobDecoder:
+    """Get job payload decoder."""
+    return decoder_singleton
+
+
+def get_cpu_executor() -> CpuExecutor:
+    """Get executor for CPU-bound work."""
+    return executor_singleton
+
+
+def get_loop_monitor() -> LoopLagMonitor:
+    """Get event loop lag monitor."""
+    return loop_monitor_singleton
+
+
 def get_redis_settings() -> RedisSettings:
     """Get Redis settings."""
     return RedisSettings(
@@ -21,3 +107,77 @@ def get_redis_settings() -> RedisSettings:
         ssl=settings.redis_ssl,
         ssl_cert_reqs=settings.redis_ssl_cert_reqs,
     )
+
+
+redis_pool_singleton = RedisPool(get_redis_settings(), settings.queue_name)
+worker_monitor_singleton = WorkerMonitor(
+    redis_pool_singleton,
+    settings.health_check_keys or [settings.queue_name + health_check_key_suffix],
+    limiter=redis_limiter_singleton,
+    history_size=settings.worker_history_size,
+)
+job_service_singleton = JobService(
+    redis_pool_singleton,
+    cache_singleton,
+    decoder_singleton,
+    job_index_singleton,
+    job_snapshot_singleton,
+    redis_limiter_singleton,
+    executor_singleton,
+)
+
+
+def get_redis_pool() -> RedisPool:
+    """Get Redis pool shared by all requests."""
+    return redis_pool_singleton
+
+
+async def get_job_service() -> JobService:
+    """Get service reading the jobs, shared by all requests.
+
+    Async so that FastAPI resolves it in the event loop rather than in a worker thread.
+    """
+    return job_service_singleton
+
+
+def get_job_index() -> JobIndex:
+    """Get index of the jobs found in Redis."""
+    return job_index_singleton
+
+
+def get_response_cache() -> ResponseCache:
+    """Get cache of computed job responses."""
+    return response_cache_singleton
+
+
+def get_job_snapshot() -> "JobSnapshot | JobReplay | None":
+    """Get job snapshot shared by worker processes, or the replayed capture file.
+
+    ``None`` when the jobs are read from Redis by every request.
+    """
+    return job_snapshot_singleton
+
+
+def get_job_warmup() -> JobWarmup:
+    """Get loader of the jobs at startup."""
+    return job_warmup_singleton
+
+
+def get_job_refresher() -> JobRefresher:
+    """Get refresher of the job index polled for changes."""
+    return job_refresher_singleton
+
+
+def get_redis_limiter() -> AdaptiveLimiter:
+    """Get limiter of concurrent Redis fetches shared by all requests."""
+    return redis_limiter_singleton
+
+
+def get_worker_monitor() -> WorkerMonitor:
+    """Get monitor of the workers' health checks."""
+    return worker_monitor_singleton
+
+
+def get_rate_limiter() -> ClientRateLimiter:
+    """Get per-client limiter of the expensive job requests."""
+    return rate_limiter_singleton
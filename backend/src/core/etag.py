@@ -0,0 +1,77 @@
+import hashlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Headers a 304 response keeps from the response it replaces (RFC 9110, section 15.4.5).
+NOT_MODIFIED_HEADERS = {"cache-control", "content-location", "date", "etag", "expires", "vary"}
+
+
+def make_etag(body: bytes) -> str:
+    """Get a weak ``ETag`` for a body; weak, so it holds for every content encoding."""
+    return f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(etag: str, if_none_match: str) -> bool:
+    """Check an ``If-None-Match`` header with the weak comparison."""
+    if if_none_match.strip() == "*":
+        return True
+    opaque_tag = etag.removeprefix("W/")
+    candidates = (candidate.strip().removeprefix("W/") for candidate in if_none_match.split(","))
+    return opaque_tag in candidates
+
+
+class ETagMiddleware:
+    """Adds an ``ETag`` to successful ``GET`` responses and answers matching polls with 304.
+
+    The tag is a digest of the body, so an unchanged resource returns 304 without a body
+    even though it was computed again (or taken from the response cache). Streamed
+    responses and responses which already have an ``ETag`` are left alone.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle an ASGI request."""
+        if scope["type"] != "http" or scope["method"] not in {"GET", "HEAD"}:
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        start_message: Message | None = None
+
+        async def send_with_etag(message: Message) -> None:
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                if message["status"] != 200:  # noqa: PLR2004
+                    await send(message)
+                    return
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            headers = MutableHeaders(scope=start)
+            if message.get("more_body", False) or "etag" in headers:
+                await send(start)
+                await send(message)
+                return
+
+            etag = make_etag(message.get("body", b""))
+            headers["ETag"] = etag
+            if if_none_match is not None and etag_matches(etag, if_none_match):
+                not_modified = [
+                    (name, value)
+                    for name, value in start["headers"]
+                    if name.decode("latin-1").lower() in NOT_MODIFIED_HEADERS
+                ]
+                await send({"type": "http.response.start", "status": 304, "headers": not_modified})
+                await send({"type": "http.response.body", "body": b""})
+                return
+            await send(start)
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
@@ -1,5 +1,8 @@
 import logging
+import math
 
+from core.executor import ExecutorOverloadedError
+from core.rate_limit import RateLimitedError
 from fastapi import Request, status
 from fastapi.exceptions import HTTPException, RequestValidationError
 from fastapi.responses import JSONResponse
@@ -62,6 +65,14 @@ async def http_exception_handler(request: Request, exc: HTTPException) -> JSONRe
     )
 
     match exc.status_code:
+        case status.HTTP_400_BAD_REQUEST:
+            problem_detail = ProblemDetail(
+                type="bad_request",
+                title="Bad request",
+                text=exc.detail or "The request was invalid.",
+                status=exc.status_code,
+                detail=[],
+            )
         case status.HTTP_403_FORBIDDEN:
             problem_detail = ProblemDetail(
                 type="forbidden",
@@ -188,3 +199,42 @@ async def starlette_http_exception_handler(
         content=problem_detail.model_dump(exclude_none=True),
         status_code=exc.status_code,
     )
+
+
+async def executor_overloaded_exception_handler(
+    request: Request,  # noqa: ARG001
+    exc: ExecutorOverloadedError,
+) -> JSONResponse:
+    """Handle a full CPU executor queue and return a JSON response."""
+    logger.warning(exc)
+    problem_detail = ProblemDetail(
+        type="service_unavailable",
+        title="Service unavailable",
+        text=str(exc),
+        status=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=[],
+    )
+    return JSONResponse(
+        content=problem_detail.model_dump(exclude_none=True),
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+    )
+
+
+async def rate_limited_exception_handler(
+    request: Request,  # noqa: ARG001
+    exc: RateLimitedError,
+) -> JSONResponse:
+    """Handle a client over its request budget and return a JSON response."""
+    logger.warning(exc)
+    problem_detail = ProblemDetail(
+        type="too_many_requests",
+        title="Too many requests",
+        text=str(exc),
+        status=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=[],
+    )
+    return JSONResponse(
+        content=problem_detail.model_dump(exclude_none=True),
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        headers={"Retry-After": str(math.ceil(exc.retry_after))},
+    )
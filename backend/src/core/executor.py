@@ -0,0 +1,82 @@
+import asyncio
+import concurrent.futures
+import contextvars
+import functools
+from collections.abc import Callable
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class ExecutorOverloadedError(Exception):
+    """Raised when too many tasks are already waiting for the CPU executor."""
+
+
+class CpuExecutor:
+    """Runs CPU-bound functions outside of the event loop.
+
+    ``kind`` is ``thread``, ``process`` or ``inline`` (run in the event loop, as before).
+    At most ``max_queue`` tasks can be running or waiting at the same time; any further
+    task is rejected with ``ExecutorOverloadedError`` instead of piling up.
+    Functions run in a process executor must be picklable, i.e. defined at module level.
+    """
+
+    def __init__(
+        self,
+        kind: str = "thread",
+        max_workers: int | None = None,
+        max_queue: int = 32,
+    ) -> None:
+        if kind not in {"thread", "process", "inline"}:
+            raise ValueError(f"Unknown executor kind '{kind}'.")
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.pending = 0
+        self._executor: Executor | None = None
+
+    def get_executor(self) -> Executor:
+        """Get the underlying executor, created on first use."""
+        if self._executor is None:
+            if self.kind == "process":
+                # Looked up here, the process pool machinery is only imported when used.
+                self._executor = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="arq-ui-cpu",
+                )
+        return self._executor
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:  # noqa: ANN401
+        """Run a function in the executor and wait for its result."""
+        if self.kind == "inline":
+            return func(*args)
+
+        if self.pending >= self.max_queue:
+            raise ExecutorOverloadedError(
+                f"Too many requests are being processed ({self.pending}), try again later.",
+            )
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            if self.kind == "thread":
+                # Keep the context (e.g. request timings) in the worker thread.
+                context = contextvars.copy_context()
+                return await loop.run_in_executor(
+                    self.get_executor(),
+                    functools.partial(context.run, func, *args),
+                )
+            return await loop.run_in_executor(self.get_executor(), func, *args)
+        finally:
+            self.pending -= 1
+
+    def shutdown(self) -> None:
+        """Shut down the underlying executor."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
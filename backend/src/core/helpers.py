@@ -1,3 +1,6 @@
+from datetime import UTC, datetime, tzinfo
+
+
 def join_paths_safely(base_path: str, relative_path: str) -> str:
     """Joins a base path and a relative path safely, ensuring only one slash between them.
 
@@ -5,3 +8,14 @@ def join_paths_safely(base_path: str, relative_path: str) -> str:
     regardless of whether the base path ends with a slash or the relative path starts with one.
     """
     return base_path.rstrip("/") + "/" + relative_path.lstrip("/")
+
+
+def to_utc(value: datetime, naive_timezone: tzinfo = UTC) -> datetime:
+    """Normalize a datetime to UTC; a naive one is taken to be in ``naive_timezone``.
+
+    Jobs are stored in UTC and compared in UTC, the configured timezone is only applied
+    when they are serialized.
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=naive_timezone)
+    return value.astimezone(UTC)
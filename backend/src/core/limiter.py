@@ -0,0 +1,102 @@
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+
+class AdaptiveLimiter:
+    """Limits concurrent Redis operations, adapting the limit to their latency (AIMD).
+
+    An operation is slow when it takes longer than ``latency_target`` and more than
+    ``tolerance`` times the baseline, the lowest latency seen recently. A fast operation
+    raises the limit by ``1 / limit`` (about one per round of operations), a slow or
+    failed one multiplies it by ``backoff``. The limit stays between ``min_limit`` and
+    ``max_limit`` and is shared by all requests of the process, so concurrent requests
+    can't overload Redis together. Operations over the limit wait in FIFO order.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 5,
+        min_limit: int = 1,
+        max_limit: int = 32,
+        latency_target: float = 0.05,
+        tolerance: float = 2.0,
+        backoff: float = 0.9,
+    ) -> None:
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(min(max(initial_limit, min_limit), max_limit))
+        self.latency_target = latency_target
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.baseline: float | None = None
+        self.in_flight = 0
+        # Exponentially weighted average of the time spent waiting for a slot.
+        self.queue_delay = 0.0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    @property
+    def waiting(self) -> int:
+        """Get the number of operations waiting for a slot."""
+        return len(self._waiters)
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[None]:
+        """Wait for a slot, run the operation and adapt the limit to how it went."""
+        queued_at = time.perf_counter()
+        await self._wait_for_slot()
+        started = time.perf_counter()
+        self.queue_delay += 0.2 * (started - queued_at - self.queue_delay)
+
+        failed = False
+        try:
+            yield
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self.in_flight -= 1
+            self._adapt(time.perf_counter() - started, failed=failed)
+            self._wake_waiters()
+
+    async def _wait_for_slot(self) -> None:
+        if not self._waiters and self.in_flight < int(self.limit):
+            self.in_flight += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just before the cancellation, pass it on.
+                self.in_flight -= 1
+                self._wake_waiters()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+
+    def _wake_waiters(self) -> None:
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def _adapt(self, latency: float, *, failed: bool) -> None:
+        if failed:
+            self.limit = max(self.min_limit, self.limit * self.backoff)
+            return
+        # The baseline follows the minimum down at once and drifts up slowly, so that it
+        # adjusts to a Redis which got slower for good (e.g. bigger batches).
+        if self.baseline is None or latency < self.baseline:
+            self.baseline = latency
+        else:
+            self.baseline += 0.01 * (latency - self.baseline)
+        if latency > max(self.latency_target, self.tolerance * self.baseline):
+            self.limit = max(self.min_limit, self.limit * self.backoff)
+        else:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
@@ -0,0 +1,228 @@
+import math
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+
+# A minimal implementation of the Prometheus text exposition format.
+# Every metric keeps its samples in memory and is updated where the event happens,
+# so rendering costs O(number of series) and never touches Redis.
+
+LabelValues = tuple[str, ...]
+
+
+def escape_label_value(value: str) -> str:
+    """Escape a label value for the text exposition format."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """Format label pairs, e.g. ``{status="queued"}``."""
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{escape_label_value(value)}"' for name, value in zip(names, values, strict=True)
+    )
+    return "{" + pairs + "}"
+
+
+def format_value(value: float) -> str:
+    """Format a sample value."""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+class Metric(ABC):
+    """Base class for a metric family."""
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+
+    def label_values(self, labels: dict[str, str]) -> LabelValues:
+        """Get label values in the declared order."""
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    @abstractmethod
+    def samples(self) -> list[str]:
+        """Get sample lines."""
+
+    def render(self) -> str:
+        """Render the metric family."""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+            *self.samples(),
+        ]
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """A monotonically increasing value."""
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labels)
+        self.values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """Increment the counter."""
+        key = self.label_values(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def samples(self) -> list[str]:
+        """Get sample lines."""
+        return [
+            f"{self.name}_total{format_labels(self.label_names, key)} {format_value(value)}"
+            for key, value in self.values.items()
+        ]
+
+
+class Gauge(Metric):
+    """A value that can go up and down."""
+
+    type = "gauge"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labels)
+        self.values: dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        """Set the gauge."""
+        self.values[self.label_values(labels)] = value
+
+    def samples(self) -> list[str]:
+        """Get sample lines."""
+        return [
+            f"{self.name}{format_labels(self.label_names, key)} {format_value(value)}"
+            for key, value in self.values.items()
+        ]
+
+
+class Histogram(Metric):
+    """Counts observations in cumulative buckets."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    ) -> None:
+        super().__init__(name, documentation, labels)
+        self.buckets = (*sorted(buckets), math.inf)
+        self.counts: dict[LabelValues, list[int]] = {}
+        self.sums: dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Observe a value."""
+        key = self.label_values(labels)
+        counts = self.counts.setdefault(key, [0] * len(self.buckets))
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[index] += 1
+                break
+        self.sums[key] = self.sums.get(key, 0) + value
+
+    def samples(self) -> list[str]:
+        """Get sample lines."""
+        lines = []
+        bucket_labels = (*self.label_names, "le")
+        for key, counts in self.counts.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts, strict=True):
+                cumulative += count
+                labels = format_labels(bucket_labels, (*key, format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {format_value(self.sums[key])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """A collection of metrics rendered together."""
+
+    def __init__(self) -> None:
+        self.metrics: list[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        """Register a metric."""
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text format."""
+        return "\n".join(metric.render() for metric in self.metrics) + "\n"
+
+
+registry = MetricsRegistry()
+
+jobs_gauge = Gauge(
+    "arq_ui_jobs",
+    "Number of jobs in Redis by status, complete jobs are split into complete and failed.",
+    labels=("status",),
+)
+job_duration_histogram = Histogram(
+    "arq_ui_job_duration_seconds",
+    "Execution duration of completed jobs.",
+    labels=("function",),
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800, 3600),
+)
+redis_fetch_histogram = Histogram(
+    "arq_ui_redis_fetch_duration_seconds",
+    "Latency of Redis round-trips made to fetch jobs.",
+    labels=("operation",),
+)
+cache_requests_counter = Counter(
+    "arq_ui_cache_requests",
+    "Cache lookups by cache and result (hit or miss).",
+    labels=("cache", "result"),
+)
+index_age_gauge = Gauge(
+    "arq_ui_index_age_seconds",
+    "Seconds since the job index was last refreshed from Redis, alert when it grows.",
+)
+loop_lag_gauge = Gauge(
+    "arq_ui_event_loop_lag_seconds",
+    "Last measured event loop lag.",
+)
+redis_concurrency_limit_gauge = Gauge(
+    "arq_ui_redis_concurrency_limit",
+    "Current limit of concurrent Redis fetches, adapted to their latency.",
+)
+redis_queue_delay_gauge = Gauge(
+    "arq_ui_redis_queue_delay_seconds",
+    "Average time a Redis fetch waits for the concurrency limiter.",
+)
+backlog_drain_gauge = Gauge(
+    "arq_ui_backlog_drain_seconds",
+    "Estimated seconds until the queued jobs are drained, +Inf if they aren't draining.",
+    labels=("function",),
+)
+rate_limited_counter = Counter(
+    "arq_ui_rate_limited_requests",
+    "Requests over their client's budget by endpoint and outcome (queued or rejected).",
+    labels=("endpoint", "result"),
+)
+
+for metric in (
+    jobs_gauge,
+    job_duration_histogram,
+    redis_fetch_histogram,
+    cache_requests_counter,
+    index_age_gauge,
+    loop_lag_gauge,
+    redis_concurrency_limit_gauge,
+    redis_queue_delay_gauge,
+    backlog_drain_gauge,
+    rate_limited_counter,
+):
+    registry.register(metric)
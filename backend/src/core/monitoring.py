@@ -0,0 +1,46 @@
+import asyncio
+import contextlib
+from collections import deque
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop wakes up a sleeping task.
+
+    A lag close to zero means the loop is free; a high lag means that something
+    is blocking it and every request waits for that long.
+    """
+
+    def __init__(self, interval: float = 0.5, window: int = 120) -> None:
+        self.interval = interval
+        self.samples: deque[float] = deque(maxlen=window)
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def current(self) -> float:
+        """Get the last measured lag in seconds."""
+        return self.samples[-1] if self.samples else 0.0
+
+    @property
+    def max(self) -> float:
+        """Get the maximum lag in seconds over the window."""
+        return max(self.samples, default=0.0)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(loop.time() - started - self.interval, 0.0))
+
+    def start(self) -> None:
+        """Start measuring in the running event loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop measuring."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
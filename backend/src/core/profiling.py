@@ -0,0 +1,54 @@
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+
+
+def frame_name(frame: FrameType) -> str:
+    """Get a short, stable name of a frame: ``file.py:function``."""
+    return f"{Path(frame.f_code.co_filename).name}:{frame.f_code.co_qualname}"
+
+
+class StackSampler:
+    """A sampling profiler collecting the stacks of all threads at a fixed interval.
+
+    The result is in the collapsed stack format (``root;caller;callee count`` per line)
+    understood by flamegraph.pl, speedscope and most flame graph viewers.
+    """
+
+    def __init__(self, interval: float = 0.005) -> None:
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _sample(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():  # noqa: SLF001
+                if thread_id == own_id:
+                    continue
+                names = []
+                current: FrameType | None = frame
+                while current is not None:
+                    names.append(frame_name(current))
+                    current = current.f_back
+                names.append(thread_names.get(thread_id, str(thread_id)))
+                self.stacks[";".join(reversed(names))] += 1
+
+    def start(self) -> None:
+        """Start sampling in a background thread."""
+        self._thread = threading.Thread(target=self._sample, name="arq-ui-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def collapsed(self) -> str:
+        """Get the samples in the collapsed stack format."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
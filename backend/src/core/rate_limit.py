@@ -0,0 +1,92 @@
+import asyncio
+import math
+import time
+
+from core.cache import LRUCache
+
+
+class TokenBucket:
+    """Token bucket allowing ``rate`` tokens per second, with bursts of up to ``capacity``.
+
+    Taking more tokens than there are puts the bucket in debt: the caller waits until
+    the debt is paid back, so a large batch is spread over the following seconds.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None) -> None:
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    def refill(self) -> None:
+        """Add the tokens earned since the last refill."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self, tokens: float = 1) -> None:
+        """Take tokens, waiting as long as the bucket is in debt."""
+        self.refill()
+        self.tokens -= tokens
+        if self.tokens < 0:
+            await asyncio.sleep(-self.tokens / self.rate)
+
+    def wait_time(self, tokens: float = 1) -> float:
+        """Get the seconds the caller would wait to take tokens, without taking them."""
+        self.refill()
+        return max(0.0, (tokens - self.tokens) / self.rate)
+
+
+class RateLimitedError(Exception):
+    """Raised when a client has spent its budget, with the seconds to wait before retrying."""
+
+    def __init__(self, retry_after: float) -> None:
+        super().__init__(f"Too many requests, retry in {math.ceil(retry_after)} seconds.")
+        self.retry_after = retry_after
+
+
+class ClientRateLimiter:
+    """A token bucket per client, for the endpoints whose cost grows with the jobs.
+
+    A request takes tokens in proportion to its estimated cost. When the bucket of its
+    client doesn't have enough, the request is queued if the tokens are earned back
+    within ``max_wait`` seconds and rejected with ``RateLimitedError`` otherwise. The
+    buckets of the ``max_clients`` most recent clients are kept. A ``rate`` of 0 disables
+    the limits.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float | None = None,
+        max_wait: float = 0,
+        max_clients: int = 10000,
+    ) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.max_wait = max_wait
+        self.buckets = LRUCache(capacity=max_clients)
+
+    @property
+    def enabled(self) -> bool:
+        """Indicates whether requests are limited."""
+        return self.rate > 0
+
+    def get_bucket(self, client: str) -> TokenBucket:
+        """Get the bucket of a client, full for a client not seen recently."""
+        bucket = self.buckets.get(client)
+        if bucket is None:
+            bucket = TokenBucket(self.rate, self.capacity)
+            self.buckets.set(client, bucket)
+        return bucket
+
+    async def acquire(self, client: str, cost: float) -> float:
+        """Take the cost of a request from its client's bucket, returning the seconds waited."""
+        if not self.enabled:
+            return 0.0
+        bucket = self.get_bucket(client)
+        wait = bucket.wait_time(cost)
+        if wait > self.max_wait:
+            raise RateLimitedError(wait)
+        await bucket.acquire(cost)
+        return wait
@@ -0,0 +1,31 @@
+import asyncio
+
+from arq import ArqRedis, create_pool
+from arq.connections import RedisSettings
+
+
+class RedisPool:
+    """Lazily creates a single Redis connection pool shared by all requests."""
+
+    def __init__(self, redis_settings: RedisSettings, queue_name: str) -> None:
+        self.redis_settings = redis_settings
+        self.queue_name = queue_name
+        self.pool: ArqRedis | None = None
+        self._lock = asyncio.Lock()
+
+    async def get(self) -> ArqRedis:
+        """Get the pool, connecting on first use."""
+        if self.pool is None:
+            async with self._lock:
+                if self.pool is None:
+                    self.pool = await create_pool(
+                        self.redis_settings,
+                        default_queue_name=self.queue_name,
+                    )
+        return self.pool
+
+    async def close(self) -> None:
+        """Close the pool."""
+        if self.pool is not None:
+            await self.pool.aclose()
+            self.pool = None
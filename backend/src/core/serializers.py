@@ -0,0 +1,181 @@
+import asyncio
+import concurrent.futures
+import hashlib
+import importlib
+import json
+import math
+import os
+from collections.abc import Callable
+from functools import lru_cache, partial
+from typing import Any
+
+import arq.jobs
+from arq.jobs import DeserializationError, JobDef, JobResult
+from core.cache import LRUCache
+from core.executor import CpuExecutor
+from core.metrics import cache_requests_counter
+
+Deserializer = Callable[[bytes], dict[str, Any]]
+
+PICKLE = "pickle"
+MSGPACK = "msgpack"
+JSON = "json"
+
+
+@lru_cache
+def load_deserializer(name: str) -> Deserializer | None:
+    """Resolve the deserializer configured in the settings.
+
+    Supported values are ``pickle`` (arq default), ``msgpack``, ``json`` or a dotted path
+    to a callable accepting bytes, e.g. ``myproject.serializers:unpack``.
+    ``None`` is returned for ``pickle`` so that arq falls back to its own default.
+    """
+    match name:
+        case "" | "pickle":
+            return None
+        case "msgpack":
+            try:
+                import msgpack  # noqa: PLC0415
+            except ImportError as exc:
+                raise RuntimeError(
+                    "The msgpack serializer requires the 'msgpack' package, "
+                    "install the backend with the 'msgpack' extra.",
+                ) from exc
+            return partial(msgpack.unpackb, raw=False)
+        case "json":
+            return json.loads
+
+    module_name, _, attribute = name.replace(":", ".").rpartition(".")
+    if not module_name:
+        raise ValueError(f"Unknown job serializer '{name}'.")
+    deserializer: Deserializer = getattr(importlib.import_module(module_name), attribute)
+    return deserializer
+
+
+def content_hash(raw: bytes, is_result: bool) -> str:  # noqa: FBT001
+    """Get a short digest of a raw Redis payload, used as the decode cache key.
+
+    The same bytes decode to a job definition or a job result, so the kind is part of it.
+    """
+    digest = hashlib.blake2b(raw, digest_size=16).hexdigest()
+    return f"{'result' if is_result else 'job'}:{digest}"
+
+
+def decode_payload(
+    raw: bytes,
+    is_result: bool,  # noqa: FBT001
+    serializer: str,
+) -> JobDef | JobResult | None:
+    """Decode a single job definition or job result, ``None`` if it can't be deserialized."""
+    deserializer = load_deserializer(serializer)
+    try:
+        if is_result:
+            return arq.jobs.deserialize_result(raw, deserializer=deserializer)
+        return arq.jobs.deserialize_job(raw, deserializer=deserializer)
+    except DeserializationError:
+        return None
+
+
+def decode_payloads(
+    payloads: list[tuple[bytes, bool]],
+    serializer: str,
+) -> list[JobDef | JobResult | None]:
+    """Decode a chunk of payloads.
+
+    Module level so that it can be sent to a process pool.
+    """
+    return [decode_payload(raw, is_result, serializer) for raw, is_result in payloads]
+
+
+class JobDecoder:
+    """Decodes raw arq payloads, caching the decoded value by content hash.
+
+    Batches with at least ``process_pool_threshold`` uncached payloads are decoded in a
+    process pool, smaller batches in the CPU executor, so that unpickling doesn't block
+    the event loop.
+    """
+
+    def __init__(
+        self,
+        serializer: str,
+        cache: LRUCache,
+        executor: CpuExecutor | None = None,
+        process_pool_threshold: int = 0,
+        process_pool_workers: int | None = None,
+    ) -> None:
+        # Fail early on a misconfigured serializer rather than on the first request.
+        load_deserializer(serializer)
+        self.serializer = serializer
+        self.cache = cache
+        self.executor = executor
+        self.process_pool_threshold = process_pool_threshold
+        self.process_pool_workers = process_pool_workers
+        self._process_pool: concurrent.futures.Executor | None = None
+
+    def decode(self, raw: bytes, is_result: bool) -> JobDef | JobResult | None:  # noqa: FBT001
+        """Decode a payload, using the cache when the same bytes were decoded before."""
+        key = content_hash(raw, is_result)
+        decoded = self.cache.get(key)
+        if decoded is None:
+            decoded = decode_payload(raw, is_result, self.serializer)
+            if decoded is not None:
+                self.cache.set(key, decoded)
+        return decoded
+
+    async def decode_many(
+        self,
+        payloads: list[tuple[bytes, bool]],
+    ) -> list[JobDef | JobResult | None]:
+        """Decode a batch of ``(raw, is_result)`` payloads, preserving their order."""
+        keys = [content_hash(raw, is_result) for raw, is_result in payloads]
+        decoded: list[JobDef | JobResult | None] = [self.cache.get(key) for key in keys]
+        missing = [index for index, value in enumerate(decoded) if value is None]
+        cache_requests_counter.inc(len(decoded) - len(missing), cache="decode", result="hit")
+        cache_requests_counter.inc(len(missing), cache="decode", result="miss")
+        if not missing:
+            return decoded
+
+        chunk = [payloads[index] for index in missing]
+        if 0 < self.process_pool_threshold <= len(chunk):
+            results = await self._decode_in_pool(chunk)
+        elif self.executor is not None:
+            results = await self.executor.run(decode_payloads, chunk, self.serializer)
+        else:
+            results = decode_payloads(chunk, self.serializer)
+
+        for index, value in zip(missing, results, strict=True):
+            decoded[index] = value
+            if value is not None:
+                self.cache.set(keys[index], value)
+        return decoded
+
+    def shutdown(self) -> None:
+        """Shut down the process pool, if it was started."""
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+            self._process_pool = None
+
+    async def _decode_in_pool(
+        self,
+        payloads: list[tuple[bytes, bool]],
+    ) -> list[JobDef | JobResult | None]:
+        if self._process_pool is None:
+            self._process_pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.process_pool_workers,
+            )
+
+        workers = self.process_pool_workers or os.cpu_count() or 1
+        size = math.ceil(len(payloads) / workers)
+        loop = asyncio.get_running_loop()
+        chunks = await asyncio.gather(
+            *[
+                loop.run_in_executor(
+                    self._process_pool,
+                    decode_payloads,
+                    payloads[start : start + size],
+                    self.serializer,
+                )
+                for start in range(0, len(payloads), size)
+            ],
+        )
+        return [value for chunk in chunks for value in chunk]
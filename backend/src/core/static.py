@@ -0,0 +1,71 @@
+import os
+
+from core.compression import add_vary_accept_encoding, negotiate_encoding
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+# File suffixes of the variants written by ``tools/precompress.py``, in preference order.
+PRECOMPRESSED_SUFFIXES = {"zstd": ".zst", "br": ".br", "gzip": ".gz"}
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """Serves the UI build, preferring precompressed variants of the files.
+
+    Files under ``immutable_dir`` have a content hash in their name (the Vite default),
+    so they are cached for ``max_age`` seconds without revalidation. Everything else,
+    ``index.html`` above all, is revalidated on every use.
+    """
+
+    def __init__(
+        self,
+        *args: object,
+        max_age: int = 31536000,
+        immutable_dir: str = "assets",
+        **kwargs: object,
+    ) -> None:
+        super().__init__(*args, **kwargs)  # type: ignore
+        self.max_age = max_age
+        self.immutable_dir = immutable_dir
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        """Get the response for a path, precompressed when the client accepts it."""
+        response = await super().get_response(path, scope)
+        if isinstance(response, FileResponse) and response.status_code == 200:  # noqa: PLR2004
+            response = self.precompressed_response(response, scope)
+        if response.status_code in {200, 304}:
+            if path.split(os.sep, 1)[0] == self.immutable_dir:
+                response.headers["Cache-Control"] = f"public, max-age={self.max_age}, immutable"
+            else:
+                response.headers["Cache-Control"] = "no-cache"
+        return response
+
+    def precompressed_response(self, response: FileResponse, scope: Scope) -> Response:
+        """Replace a file response with its best precompressed variant, if there is one."""
+        available = {}
+        for encoding, suffix in PRECOMPRESSED_SUFFIXES.items():
+            try:
+                variant_path = f"{response.path}{suffix}"
+                available[encoding] = (variant_path, os.stat(variant_path))  # noqa: PTH116
+            except OSError:
+                continue
+        if not available:
+            return response
+
+        request_headers = Headers(scope=scope)
+        encoding = negotiate_encoding(request_headers.get("accept-encoding", ""), available)
+        if encoding is None:
+            add_vary_accept_encoding(response.headers)
+            return response
+
+        variant_path, variant_stat = available[encoding]
+        variant = FileResponse(
+            variant_path,
+            stat_result=variant_stat,
+            media_type=response.media_type,
+            headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"},
+        )
+        if self.is_not_modified(variant.headers, request_headers):
+            return NotModifiedResponse(variant.headers)
+        return variant
@@ -0,0 +1,130 @@
+import json
+import logging
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from urllib.parse import parse_qs
+
+from starlette.datastructures import MutableHeaders
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+class RequestTimings:
+    """Durations of the phases of a single request, in seconds."""
+
+    def __init__(self) -> None:
+        self.phases: dict[str, float] = {}
+
+    def add(self, name: str, duration: float) -> None:
+        """Add time spent in a phase; a phase entered several times is summed up."""
+        self.phases[name] = self.phases.get(name, 0) + duration
+
+    def server_timing(self, total: float) -> str:
+        """Format the phases as a ``Server-Timing`` header value."""
+        metrics = [f"{name};dur={duration * 1000:.1f}" for name, duration in self.phases.items()]
+        metrics.append(f"total;dur={total * 1000:.1f}")
+        return ", ".join(metrics)
+
+
+request_timings: ContextVar[RequestTimings | None] = ContextVar("request_timings", default=None)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Measure a phase of the current request; does nothing outside of a request."""
+    timings = request_timings.get()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timings is not None:
+            timings.add(name, time.perf_counter() - started)
+
+
+class TimingMiddleware:
+    """Adds a ``Server-Timing`` header with the phases of each request and logs slow ones.
+
+    When profiling is enabled, a request with the ``profile`` query parameter returns
+    the stacks sampled while it was processed instead of its response.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        log_threshold: float = 0.5,
+        profiling_enabled: bool = False,  # noqa: FBT001, FBT002
+        profiling_interval: float = 0.005,
+    ) -> None:
+        self.app = app
+        self.log_threshold = log_threshold
+        self.profiling_enabled = profiling_enabled
+        self.profiling_interval = profiling_interval
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle an ASGI request."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if self.profiling_enabled and "profile" in parse_qs(scope["query_string"].decode()):
+            await self.profile(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = request_timings.set(timings)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                total = time.perf_counter() - started
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", timings.server_timing(total))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            request_timings.reset(token)
+            total = time.perf_counter() - started
+            if total >= self.log_threshold:
+                logger.info(
+                    json.dumps(
+                        {
+                            "event": "request_timing",
+                            "method": scope["method"],
+                            "path": scope["path"],
+                            "query": scope["query_string"].decode(),
+                            "status": status_code,
+                            "total_ms": round(total * 1000, 1),
+                            "phases_ms": {
+                                name: round(duration * 1000, 1)
+                                for name, duration in timings.phases.items()
+                            },
+                        },
+                    ),
+                )
+
+    async def profile(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Process the request under the sampling profiler and return the collapsed stacks."""
+
+        async def discard(message: Message) -> None:  # noqa: ARG001
+            pass
+
+        # Profiling is off by default, its sampler is only imported when used.
+        from core.profiling import StackSampler  # noqa: PLC0415
+
+        sampler = StackSampler(self.profiling_interval)
+        sampler.start()
+        try:
+            await self.app(scope, receive, discard)
+        finally:
+            sampler.stop()
+        response = PlainTextResponse(sampler.collapsed())
+        await response(scope, receive, send)
@@ -1,7 +1,10 @@
-from endpoints import jobs, status
+from endpoints import health, jobs, metrics, status, workers
 from fastapi import APIRouter
 
 routers = APIRouter()
 
 routers.include_router(jobs.router)
 routers.include_router(status.router)
+routers.include_router(metrics.router)
+routers.include_router(workers.router)
+routers.include_router(health.router)
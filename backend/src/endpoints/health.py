@@ -0,0 +1,109 @@
+import asyncio
+import logging
+import time
+
+from core.config import Settings, get_app_settings
+from core.depends import (
+    get_job_index,
+    get_job_snapshot,
+    get_job_warmup,
+    get_loop_monitor,
+    get_redis_pool,
+)
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse
+from schemas.health import Health
+from services.job_replay import JobReplay
+
+logger = logging.getLogger(__name__)
+# The probes never scan Redis: they cost a PING at most, whatever the number of jobs.
+router = APIRouter(prefix="/health", tags=["Health"])
+settings: Settings = get_app_settings()
+
+
+def health_response(health: Health) -> JSONResponse:
+    """Wrap a probe result, with a 503 status unless it is ok."""
+    return JSONResponse(
+        content=health.model_dump(exclude_none=True),
+        status_code=(
+            status.HTTP_200_OK
+            if health.status == "ok"
+            else status.HTTP_503_SERVICE_UNAVAILABLE
+        ),
+        headers={"Cache-Control": "no-store"},
+    )
+
+
+@router.get(
+    "/live",
+    summary="Liveness probe",
+    response_model=Health,
+    responses={
+        200: {"model": Health, "description": "The event loop is responsive."},
+        503: {"model": Health, "description": "The event loop is blocked."},
+    },
+)
+async def live() -> JSONResponse:
+    """Check that the event loop is responsive, without touching Redis."""
+    lag = get_loop_monitor().current
+    health = Health(status="ok", loop_lag_ms=round(lag * 1000, 1))
+    if lag > settings.health_max_loop_lag:
+        health.status = "unavailable"
+        health.reason = f"The event loop lags by {lag:.1f}s."
+    return health_response(health)
+
+
+@router.get(
+    "/ready",
+    summary="Readiness probe",
+    response_model=Health,
+    responses={
+        200: {"model": Health, "description": "The service can answer requests."},
+        503: {"model": Health, "description": "The service is warming up or Redis is down."},
+    },
+)
+async def ready() -> JSONResponse:
+    """Check that Redis answers a PING and that the jobs are loaded."""
+    job_index = get_job_index()
+    warmup = get_job_warmup()
+    health = Health(
+        status="ok",
+        loop_lag_ms=round(get_loop_monitor().current * 1000, 1),
+        index_age=round(job_index.age, 1) if job_index.age is not None else None,
+        jobs_len=len(job_index.jobs) if job_index.age is not None else None,
+        warmup_progress=round(warmup.progress, 3),
+    )
+
+    snapshot = get_job_snapshot()
+    if isinstance(snapshot, JobReplay):
+        # A replay is served without Redis, it is ready once the capture is loaded.
+        if snapshot.error is not None:
+            health.status = "unavailable"
+            health.reason = snapshot.error
+        elif snapshot.jobs is None:
+            health.status = "warming"
+            health.reason = "The capture file is being loaded."
+        return health_response(health)
+
+    started = time.perf_counter()
+    try:
+        redis = await get_redis_pool().get()
+        await asyncio.wait_for(redis.ping(), settings.health_ping_timeout)
+    except Exception as exc:  # noqa: BLE001
+        health.status = "unavailable"
+        health.reason = f"Redis didn't answer the ping: {exc!r}"
+        logger.warning(health.reason)
+        return health_response(health)
+    health.redis_ping_ms = round((time.perf_counter() - started) * 1000, 1)
+
+    if warmup.warming:
+        health.status = "warming"
+        health.reason = "The jobs are being loaded."
+    elif (
+        settings.health_max_index_age
+        and job_index.age is not None
+        and job_index.age > settings.health_max_index_age
+    ):
+        health.status = "unavailable"
+        health.reason = f"The job index wasn't refreshed for {job_index.age:.0f}s."
+    return health_response(health)
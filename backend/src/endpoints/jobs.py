@@ -1,27 +1,173 @@
 import logging
+from collections.abc import AsyncIterator
 from datetime import datetime
-from zoneinfo import ZoneInfo
 
-from core.config import Settings, get_app_settings
-from core.depends import get_lru_cache, get_redis_settings
-from fastapi import APIRouter, HTTPException, Query
+from core.cache import CacheStatus
+from core.config import Settings, get_app_settings, get_timezone
+from core.depends import (
+    get_cpu_executor,
+    get_job_index,
+    get_job_refresher,
+    get_job_service,
+    get_job_warmup,
+    get_rate_limiter,
+    get_response_cache,
+)
+from core.helpers import to_utc
+from core.metrics import rate_limited_counter
+from core.rate_limit import RateLimitedError
+from core.responses import JSONBytesResponse, dump_json
+from core.timing import phase
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from schemas.breakdown import Breakdown
+from schemas.cleanup import CleanupProgress, CleanupRequest
+from schemas.failure import FailuresInfo
+from schemas.forecast import Forecast
 from schemas.job import (
     Job,
+    JobChanges,
     JobCreate,
+    JobField,
     JobsInfo,
     JobSortBy,
     JobSortOrder,
+    JobsQuery,
     JobStatus,
     JobsTimeStatistics,
     Statistics,
 )
-from schemas.paged import Paged
 from schemas.problem import ProblemDetail
-from services.job_service import JobService
+from services.aggregation import (
+    QUERY_BASE_COST,
+    build_jobs_info,
+    estimate_query_cost,
+    generate_statistics,
+    generate_status_statistics,
+)
+from services.job_index import JobIndex
+from services.job_service import JobService, recent_jobs
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/jobs", tags=["Jobs"])
 settings: Settings = get_app_settings()
+KWARG_FILTER_PREFIX = "kwarg."
+
+
+def cached_response(content: bytes, cache_status: CacheStatus) -> JSONBytesResponse:
+    """Wrap serialized content, telling the client whether it was computed, shared or cached."""
+    return JSONBytesResponse(
+        content=content,
+        headers={
+            "X-Cache": cache_status.value,
+            "Cache-Control": f"private, max-age={int(settings.jobs_response_ttl)}",
+        },
+    )
+
+
+async def get_recent_jobs(job_service: JobService) -> tuple[list[Job], bool]:
+    """Get the jobs of the last hour, only those loaded so far while warming up.
+
+    The second value tells whether the jobs are partial.
+    """
+    warmup = get_job_warmup()
+    if warmup.warming:
+        return await get_cpu_executor().run(recent_jobs, warmup.loaded_jobs()), True
+    return await job_service.get_all_jobs(settings.max_jobs), False
+
+
+def parse_kwargs_filters(request: Request) -> tuple[tuple[str, str], ...]:
+    """Get the ``kwarg.<name>=<value>`` filters of a request, for indexed names only."""
+    kwargs = set()
+    for key, value in request.query_params.multi_items():
+        if not key.startswith(KWARG_FILTER_PREFIX):
+            continue
+        name = key.removeprefix(KWARG_FILTER_PREFIX)
+        if name not in settings.indexed_kwargs:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Keyword argument '{name}' isn't indexed, see INDEXED_KWARGS.",
+            )
+        kwargs.add((name, value))
+    return tuple(sorted(kwargs))
+
+
+async def get_fresh_job_index(max_age: float = settings.jobs_response_ttl) -> JobIndex:
+    """Get the job index, refreshed from Redis unless it is at most ``max_age`` seconds old.
+
+    While warming up, the index is filled by the warm-up and returned as it is.
+    """
+    job_index = get_job_index()
+    if get_job_warmup().warming:
+        return job_index
+    if job_index.age is None or job_index.age > max_age:
+
+        async def refresh() -> None:
+            job_service = await get_job_service()
+            await job_service.get_all_jobs(settings.max_jobs)
+
+        # Concurrent pollers share a single refresh.
+        await get_response_cache().get_or_compute("job_index", refresh)
+    return job_index
+
+
+async def get_polled_job_index() -> JobIndex:
+    """Get the job index as it is, asking the background refresher to keep it fresh.
+
+    Redis is only read if the index was never filled, otherwise the request costs no more
+    than reading the index. Responses tell how old it is with ``index_age``.
+    """
+    job_index = get_job_index()
+    if job_index.age is None:
+        job_index = await get_fresh_job_index()
+    get_job_refresher().poll()
+    return job_index
+
+
+def get_index_age(job_index: JobIndex) -> float | None:
+    """Get the age of the job index to report, ``None`` if it was never filled."""
+    return round(job_index.age, 1) if job_index.age is not None else None
+
+
+def client_id(request: Request) -> str:
+    """Get the client a request is counted against, by its address or a proxy's header.
+
+    The last address of the header is the one the trusted proxy appended, the ones before
+    it come from the client and could be forged to get a budget of its own.
+    """
+    if settings.rate_limit_client_header:
+        forwarded = request.headers.get(settings.rate_limit_client_header)
+        if forwarded:
+            return forwarded.split(",")[-1].strip()
+    return request.client.host if request.client else "unknown"
+
+
+async def limit_request(
+    request: Request,
+    endpoint: str,
+    cache_key: str,
+    query: JobsQuery | None = None,
+) -> None:
+    """Charge the estimated cost of a request to its client, queuing or rejecting it."""
+    limiter = get_rate_limiter()
+    if not limiter.enabled:
+        return
+    # Statistics computed by Redis cost it a few commands, whatever the number of jobs.
+    if get_response_cache().is_available(cache_key) or (
+        query is None and settings.server_side_statistics
+    ):
+        cost = QUERY_BASE_COST
+    else:
+        job_index = get_job_index()
+        job_count = len(job_index.jobs) if job_index.age is not None else settings.max_jobs
+        cost = estimate_query_cost(query, min(job_count, settings.max_jobs))
+    try:
+        waited = await limiter.acquire(client_id(request), cost)
+    except RateLimitedError:
+        rate_limited_counter.inc(endpoint=endpoint, result="rejected")
+        raise
+    if waited:
+        rate_limited_counter.inc(endpoint=endpoint, result="queued")
 
 
 @router.get(
@@ -33,11 +179,15 @@ settings: Settings = get_app_settings()
             "model": JobsInfo,
             "description": "Jobs successfully retrieved.",
         },
+        400: {"description": "Keyword argument not indexed.", "model": ProblemDetail},
         422: {"description": "Data validation error.", "model": ProblemDetail},
+        429: {"description": "Request budget of the client spent.", "model": ProblemDetail},
         500: {"description": "Internal server error.", "model": ProblemDetail},
+        503: {"description": "Too many requests in progress.", "model": ProblemDetail},
     },
 )
 async def get_all(
+    request: Request,
     limit: int = Query(
         default=50,
         le=500,
@@ -69,6 +219,10 @@ async def get_all(
         None,
         description="Search for jobs by all fields.",
     ),
+    signature: str | None = Query(  # noqa: B008
+        None,
+        description="Filter failed jobs by error signature.",
+    ),
     start_time: datetime | None = Query(  # noqa: B008
         None,
         description="Filter jobs by start time.",
@@ -77,84 +231,228 @@ async def get_all(
         None,
         description="Filter jobs by finish time.",
     ),
-) -> JobsInfo:
-    """Get all jobs."""
-    job_service = JobService(
-        get_redis_settings(),
-        get_lru_cache(),
-    )
-    # We retrieve all tasks because we cannot initially filter them directly in Redis.
-    # Subsequently, we filter them at the application level.
-    # This code is simple, so we don't separate it out.
-    jobs = await job_service.get_all_jobs(settings.max_jobs)
-
-    functions: list[str] = list({job.function for job in jobs})
-    statistics = Statistics(
-        total=len(jobs),
-        in_progress=len([job for job in jobs if job.status == JobStatus.in_progress]),
-        completed=len([job for job in jobs if job.status == JobStatus.complete]),
-        queued=len([job for job in jobs if job.status == JobStatus.queued]),
-        failed=len(
-            [job for job in jobs if job.status == JobStatus.complete and job.success is False],
-        ),
+    ids: list[str] = Query(  # noqa: B008
+        default=[],
+        description="Get only the jobs with these ids, fetched in one round-trip.",
+    ),
+    fields: list[JobField] = Query(  # noqa: B008
+        default=[],
+        description="Return only these fields of the jobs (the id always), e.g. for a list.",
+    ),
+    job_service: JobService = Depends(get_job_service),  # noqa: B008
+) -> JSONBytesResponse:
+    """Get all jobs.
+
+    Jobs can also be filtered by the value of an indexed keyword argument (see
+    ``INDEXED_KWARGS``) with ``kwarg.<name>=<value>``, e.g. ``kwarg.customer_id=123``.
+    Such a lookup goes through the job index and returns the matching jobs of any age, as
+    of ``index_age``: the index is served as it is and refreshed in the background.
+    """
+    query = JobsQuery(
+        limit=limit,
+        offset=offset,
+        sort_by=sort_by,
+        sort_order=sort_order,
+        statuses=tuple(sorted(set(statuses))),
+        success=success,
+        function=function,
+        search=search,
+        signature=signature,
+        # Times without an offset are in the configured timezone, as displayed in the UI.
+        start_time=to_utc(start_time, get_timezone()) if start_time else None,
+        finish_time=to_utc(finish_time, get_timezone()) if finish_time else None,
+        ids=tuple(sorted(set(ids))),
+        kwargs=parse_kwargs_filters(request),
+        fields=tuple(sorted(set(fields))),
     )
 
-    time_statistic: list[JobsTimeStatistics] = job_service.generate_statistics(jobs)
+    async def compute() -> bytes:
+        # We retrieve all tasks because we cannot initially filter them directly in Redis.
+        # Subsequently, we filter them at the application level, outside of the event loop.
+        partial, index_age = False, None
+        if query.ids:
+            jobs = await job_service.get_jobs_by_ids(list(query.ids))
+        elif query.kwargs:
+            job_index = await get_polled_job_index()
+            jobs, partial = job_index.find_by_kwargs(query.kwargs), get_job_warmup().warming
+            index_age = get_index_age(job_index)
+        else:
+            jobs, partial = await get_recent_jobs(job_service)
+        with phase("aggregate"):
+            jobs_info = await get_cpu_executor().run(build_jobs_info, jobs, query)
+        if partial:
+            jobs_info.partial = True
+            jobs_info.progress = get_job_warmup().progress
+        jobs_info.index_age = index_age
+        with phase("serialize"):
+            return await get_cpu_executor().run(dump_json, JobsInfo, jobs_info, query.exclude)
+
+    # Identical requests (e.g. the same dashboard open on several screens) share one result.
+    cache_key = f"jobs:{query.model_dump_json()}:{get_job_warmup().state.value}"
+    await limit_request(request, "jobs", cache_key, query)
+    content, cache_status = await get_response_cache().get_or_compute(cache_key, compute)
+    return cached_response(content, cache_status)
+
+
+@router.get(
+    "/statistics",
+    summary="Get statistics",
+    response_model=Statistics,
+    responses={
+        200: {
+            "model": Statistics,
+            "description": "Statistics of the jobs of the last hour successfully retrieved.",
+        },
+        422: {"description": "Data validation error.", "model": ProblemDetail},
+        429: {"description": "Request budget of the client spent.", "model": ProblemDetail},
+        500: {"description": "Internal server error.", "model": ProblemDetail},
+        503: {"description": "Too many requests in progress.", "model": ProblemDetail},
+    },
+)
+async def get_statistics(
+    request: Request,
+    job_service: JobService = Depends(get_job_service),  # noqa: B008
+) -> JSONBytesResponse:
+    """Get the number of jobs of the last hour by status."""
 
-    if start_time:
-        start_time = start_time.replace(tzinfo=ZoneInfo(settings.timezone))
-        jobs = [
-            job
-            for job in jobs
-            if job.enqueue_time >= start_time
-            and (job.start_time is None or job.start_time >= start_time)
-        ]
+    async def compute() -> bytes:
+        if job_service.server_side_statistics:
+            statistics, _ = await job_service.get_statistics_summary()
+        else:
+            jobs, _ = await get_recent_jobs(job_service)
+            with phase("aggregate"):
+                statistics = await get_cpu_executor().run(generate_status_statistics, jobs)
+        with phase("serialize"):
+            return await get_cpu_executor().run(dump_json, Statistics, statistics)
 
-    if finish_time:
-        finish_time = finish_time.replace(tzinfo=ZoneInfo(settings.timezone))
-        jobs = [
-            job
-            for job in jobs
-            if job.enqueue_time <= finish_time
-            and (job.finish_time is None or job.finish_time <= finish_time)
-        ]
+    cache_key = f"statistics:{get_job_warmup().state.value}"
+    await limit_request(request, "statistics", cache_key)
+    content, cache_status = await get_response_cache().get_or_compute(cache_key, compute)
+    return cached_response(content, cache_status)
 
-    if len(statuses) > 0:
-        jobs = [job for job in jobs if job.status in statuses]
 
-    if success is not None:
-        jobs = [job for job in jobs if job.success == success]
+@router.get(
+    "/forecast",
+    summary="Get backlog forecast",
+    response_model=Forecast,
+    responses={
+        200: {
+            "model": Forecast,
+            "description": "Backlog forecast successfully computed.",
+        },
+        500: {"description": "Internal server error.", "model": ProblemDetail},
+        503: {"description": "Too many requests in progress.", "model": ProblemDetail},
+    },
+)
+async def get_forecast() -> Forecast:
+    """Estimate when the queued backlog is drained, overall and for every function.
 
-    if function:
-        jobs = [job for job in jobs if job.function == function]
+    The rates are exponentially weighted averages of the jobs enqueued and completed per
+    minute, maintained by the job index, so serving them costs O(functions). The index
+    is served as it is and refreshed in the background, see ``index_age``.
+    """
+    job_index = await get_polled_job_index()
+    forecast = job_index.forecast(
+        settings.forecast_drain_warning,
+        settings.forecast_drain_critical,
+    )
+    forecast.index_age = get_index_age(job_index)
+    return forecast
 
-    if search:
-        jobs = [job for job in jobs if search.lower() in str(job).lower()]
 
-    if sort_order == "asc":
-        jobs = sorted(jobs, key=lambda x: (getattr(x, sort_by) is None, getattr(x, sort_by)))
-    else:
-        jobs = sorted(
-            jobs,
-            key=lambda x: (getattr(x, sort_by) is None, getattr(x, sort_by)),
-            reverse=True,
-        )
+@router.get(
+    "/breakdown",
+    summary="Get jobs by function and queue",
+    response_model=Breakdown,
+    responses={
+        200: {
+            "model": Breakdown,
+            "description": "Breakdown successfully retrieved.",
+        },
+        500: {"description": "Internal server error.", "model": ProblemDetail},
+        503: {"description": "Too many requests in progress.", "model": ProblemDetail},
+    },
+)
+async def get_breakdown() -> Breakdown:
+    """Get the counts, success rate, durations and queue waits by function and by queue.
+
+    The counters and duration histograms are maintained by the job index as jobs are
+    ingested, so serving them costs O(functions + queues) whatever the number of jobs.
+    The percentiles are estimated within 5%. The index is served as it is and refreshed
+    in the background, see ``index_age``.
+    """
+    job_index = await get_polled_job_index()
+    breakdown = job_index.breakdown()
+    breakdown.index_age = get_index_age(job_index)
+    return breakdown
+
+
+@router.get(
+    "/changes",
+    summary="Get jobs changed since a version",
+    response_model=JobChanges,
+    responses={
+        200: {
+            "model": JobChanges,
+            "description": "Changes successfully retrieved.",
+        },
+        422: {"description": "Data validation error.", "model": ProblemDetail},
+        500: {"description": "Internal server error.", "model": ProblemDetail},
+        503: {"description": "Too many requests in progress.", "model": ProblemDetail},
+    },
+)
+async def get_changes(
+    since: str | None = Query(  # noqa: B008
+        None,
+        description="Version token of the previous response, omitted to get the current one.",
+    ),
+) -> JSONBytesResponse:
+    """Get the jobs created, updated or removed since a version token.
+
+    The job index keeps a changelog of its latest changes, so polling costs in
+    proportion to the churn rather than to the number of jobs. When the changes since
+    the token aren't known anymore (too old, or the server restarted), ``reset`` is set
+    and the jobs must be loaded again with ``GET /jobs``.
 
-    paging_jobs = jobs[offset : offset + limit]
-
-    return JobsInfo(
-        functions=functions,
-        statistics=statistics,
-        statistics_hourly=time_statistic,
-        paged_jobs=Paged[Job](
-            items=paging_jobs,
-            count=len(jobs),
-            limit=limit,
-            offset=offset,
-        ),
+    The changes are those of the index as it is, never refreshed by the request: while
+    clients poll, it is refreshed in the background every ``INDEX_REFRESH_INTERVAL``
+    seconds. ``index_age`` tells how old it is.
+    """
+    job_index = await get_polled_job_index()
+    changes = job_index.changes_since(since)
+    changes.index_age = get_index_age(job_index)
+    return JSONBytesResponse(
+        content=dump_json(JobChanges, changes),
+        headers={"Cache-Control": "no-store"},
     )
 
 
+@router.get(
+    "/failures",
+    summary="Get failures by error signature",
+    response_model=FailuresInfo,
+    responses={
+        200: {
+            "model": FailuresInfo,
+            "description": "Failures successfully grouped.",
+        },
+        500: {"description": "Internal server error.", "model": ProblemDetail},
+        503: {"description": "Too many requests in progress.", "model": ProblemDetail},
+    },
+)
+async def get_failures() -> FailuresInfo:
+    """Get the failed jobs grouped by function and error signature, the most frequent first.
+
+    The groups are maintained by the job index as results are ingested, so serving them
+    costs O(signatures). The index is served as it is and refreshed in the background,
+    see ``index_age``. The jobs of a group are listed by ``GET /jobs?signature=...``.
+    """
+    job_index = await get_polled_job_index()
+    failures_info = job_index.failures_info()
+    failures_info.index_age = get_index_age(job_index)
+    return failures_info
+
+
 @router.get(
     "/{job_id}",
     summary="Get job by id",
@@ -169,13 +467,16 @@ async def get_all(
         500: {"description": "Internal server error.", "model": ProblemDetail},
     },
 )
-async def get_job_by_id(job_id: str) -> Job:
+async def get_job_by_id(
+    job_id: str,
+    status: JobStatus | None = Query(  # noqa: B008
+        None,
+        description="Known status of the job. A complete job is read without probing its status.",
+    ),
+    job_service: JobService = Depends(get_job_service),  # noqa: B008
+) -> Job:
     """Get job by id."""
-    job_service = JobService(
-        get_redis_settings(),
-        get_lru_cache(),
-    )
-    job = await job_service.get_job_by_id(job_id)
+    job = await job_service.get_job_by_id(job_id, status)
     if not job:
         raise HTTPException(
             status_code=404,
@@ -192,17 +493,23 @@ async def get_job_by_id(job_id: str) -> Job:
             "description": "Job successfully aborted.",
         },
         400: {"description": "Failed to abort the job.", "model": ProblemDetail},
+        409: {"description": "Jobs replayed from a capture file.", "model": ProblemDetail},
         422: {"description": "Data validation error.", "model": ProblemDetail},
         500: {"description": "Internal server error.", "model": ProblemDetail},
     },
 )
-async def abort_job(job_id: str) -> None:
+async def abort_job(
+    job_id: str,
+    job_service: JobService = Depends(get_job_service),  # noqa: B008
+) -> None:
     """Abort job."""
-    job_service = JobService(
-        get_redis_settings(),
-        get_lru_cache(),
-    )
+    if job_service.replay is not None:
+        raise HTTPException(
+            status_code=409,
+            detail="Jobs can't be aborted while replaying a capture file.",
+        )
     result: bool = await job_service.abort_job(job_id)
+    get_response_cache().clear()
     if not result:
         raise HTTPException(
             status_code=400,
@@ -220,18 +527,31 @@ async def abort_job(job_id: str) -> None:
             "description": "Hourly statistics successfully retrieved.",
         },
         422: {"description": "Data validation error.", "model": ProblemDetail},
+        429: {"description": "Request budget of the client spent.", "model": ProblemDetail},
         500: {"description": "Internal server error.", "model": ProblemDetail},
+        503: {"description": "Too many requests in progress.", "model": ProblemDetail},
     },
 )
-async def get_hourly_statistics() -> list[JobsTimeStatistics]:
+async def get_hourly_statistics(
+    request: Request,
+    job_service: JobService = Depends(get_job_service),  # noqa: B008
+) -> JSONBytesResponse:
     """Get hourly statistics."""
-    job_service = JobService(
-        get_redis_settings(),
-        get_lru_cache(),
-    )
-    jobs = await job_service.get_all_jobs(settings.max_jobs)
 
-    return job_service.generate_statistics(jobs)
+    async def compute() -> bytes:
+        if job_service.server_side_statistics:
+            _, statistics = await job_service.get_statistics_summary()
+        else:
+            jobs, _ = await get_recent_jobs(job_service)
+            with phase("aggregate"):
+                statistics = await get_cpu_executor().run(generate_statistics, jobs)
+        with phase("serialize"):
+            return await get_cpu_executor().run(dump_json, list[JobsTimeStatistics], statistics)
+
+    cache_key = f"statistics_hourly:{get_job_warmup().state.value}"
+    await limit_request(request, "statistics_hourly", cache_key)
+    content, cache_status = await get_response_cache().get_or_compute(cache_key, compute)
+    return cached_response(content, cache_status)
 
 
 @router.post(
@@ -254,3 +574,50 @@ async def create_job(new_job: JobCreate) -> Job:
             status_code=501,
             detail="Not implemented",
         )
+
+
+@router.post(
+    "/cleanup",
+    summary="Delete old job results",
+    responses={
+        200: {
+            "model": CleanupProgress,
+            "description": "Progress of the cleanup, one JSON object per line.",
+            "content": {"application/x-ndjson": {}},
+        },
+        403: {"description": "Cleanup disabled.", "model": ProblemDetail},
+        409: {"description": "Jobs replayed from a capture file.", "model": ProblemDetail},
+        422: {"description": "Data validation error.", "model": ProblemDetail},
+        500: {"description": "Internal server error.", "model": ProblemDetail},
+    },
+)
+async def cleanup_results(
+    request: CleanupRequest,
+    job_service: JobService = Depends(get_job_service),  # noqa: B008
+) -> StreamingResponse:
+    """Delete the results of old jobs, or only count them with ``dry_run``.
+
+    The progress is streamed as a JSON line per batch. Redis is read and written at a
+    rate capped by the ``CLEANUP_MAX_COMMANDS_PER_SECOND`` setting. Deleting is off unless
+    the ``CLEANUP_ENABLED`` setting is on.
+    """
+    if not settings.cleanup_enabled:
+        raise HTTPException(
+            status_code=403,
+            detail="Cleanup of job results is disabled, set CLEANUP_ENABLED to allow it.",
+        )
+    if job_service.replay is not None:
+        raise HTTPException(
+            status_code=409,
+            detail="Job results can't be cleaned up while replaying a capture file.",
+        )
+    logger.info(f"Cleaning job results up: {request.model_dump_json()}")
+
+    async def stream() -> AsyncIterator[str]:
+        async for progress in job_service.cleanup_results(request):
+            yield progress.model_dump_json() + "\n"
+        if not request.dry_run:
+            get_response_cache().clear()
+        logger.info(f"Job results cleaned up: {progress.model_dump_json()}")
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
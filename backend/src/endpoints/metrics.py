@@ -0,0 +1,54 @@
+import logging
+
+from core.config import Settings, get_app_settings
+from core.depends import get_job_index, get_job_refresher, get_loop_monitor, get_redis_limiter
+from core.metrics import (
+    backlog_drain_gauge,
+    index_age_gauge,
+    jobs_gauge,
+    loop_lag_gauge,
+    redis_concurrency_limit_gauge,
+    redis_queue_delay_gauge,
+    registry,
+)
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from schemas.job import JobStatus
+from services.forecast import drain_seconds_value
+from services.job_index import FAILED
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+settings: Settings = get_app_settings()
+
+
+@router.get("", summary="Get metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """Get metrics in the Prometheus text format.
+
+    Served from the job index as it is, a scrape never reads Redis. It asks the background
+    refresher to keep the index fresh, so the counts don't freeze on an instance nobody
+    browses. Alert on ``arq_ui_index_age_seconds`` to catch an index that can't be
+    refreshed anymore.
+    """
+    job_index = get_job_index()
+    get_job_refresher().poll()
+    for state in [*[job_status.value for job_status in JobStatus], FAILED]:
+        jobs_gauge.set(job_index.state_counts[state], status=state)
+    if job_index.age is not None:
+        index_age_gauge.set(job_index.age)
+        forecast = job_index.forecast(
+            settings.forecast_drain_warning,
+            settings.forecast_drain_critical,
+        )
+        backlog_drain_gauge.set(drain_seconds_value(forecast.overall), function="")
+        for backlog in forecast.functions:
+            backlog_drain_gauge.set(drain_seconds_value(backlog), function=backlog.function or "")
+    loop_lag_gauge.set(get_loop_monitor().current)
+    redis_concurrency_limit_gauge.set(get_redis_limiter().limit)
+    redis_queue_delay_gauge.set(get_redis_limiter().queue_delay)
+
+    return PlainTextResponse(
+        registry.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
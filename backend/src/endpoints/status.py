@@ -1,8 +1,16 @@
 import logging
 
 from core.config import Settings, get_app_settings
-from core.depends import get_lru_cache, get_redis_settings
-from fastapi import APIRouter
+from core.depends import (
+    get_cpu_executor,
+    get_job_service,
+    get_job_snapshot,
+    get_job_warmup,
+    get_loop_monitor,
+    get_redis_limiter,
+)
+from fastapi import APIRouter, Depends
+from services.job_replay import JobReplay
 from services.job_service import JobService
 
 logger = logging.getLogger(__name__)
@@ -11,8 +19,32 @@ settings: Settings = get_app_settings()
 
 
 @router.get("")
-async def status() -> dict[str, str]:
+async def status(
+    job_service: JobService = Depends(get_job_service),  # noqa: B008
+) -> dict[str, str]:
     """Get status redis."""
-    job_service = JobService(get_redis_settings(), get_lru_cache())
     result: dict[str, str] = await job_service.get_status()
+    loop_monitor = get_loop_monitor()
+    result["loop_lag_ms"] = f"{loop_monitor.current * 1000:.1f}"
+    result["loop_lag_max_ms"] = f"{loop_monitor.max * 1000:.1f}"
+    result["cpu_executor_pending"] = str(get_cpu_executor().pending)
+    limiter = get_redis_limiter()
+    result["redis_concurrency_limit"] = str(int(limiter.limit))
+    result["redis_in_flight"] = str(limiter.in_flight)
+    result["redis_queue_delay_ms"] = f"{limiter.queue_delay * 1000:.1f}"
+    warmup = get_job_warmup()
+    result["readiness"] = "warming" if warmup.warming else "ready"
+    result["warmup_state"] = warmup.state.value
+    result["warmup_progress"] = f"{warmup.progress:.3f}"
+    if warmup.duration is not None:
+        result["warmup_seconds"] = f"{warmup.duration:.2f}"
+    snapshot = get_job_snapshot()
+    if isinstance(snapshot, JobReplay):
+        result["snapshot_role"] = "replay"
+        result["replay_captured_at"] = str(snapshot.captured_at)
+        result["replay_jobs_captured"] = str(snapshot.status_counts.total())
+        if snapshot.error is not None:
+            result["replay_error"] = snapshot.error
+    elif snapshot is not None:
+        result["snapshot_role"] = "leader" if snapshot.is_leader else "follower"
     return result
@@ -0,0 +1,30 @@
+import logging
+
+from core.depends import get_worker_monitor
+from fastapi import APIRouter
+from schemas.problem import ProblemDetail
+from schemas.worker import WorkersInfo
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/workers", tags=["Workers"])
+
+
+@router.get(
+    "",
+    summary="Get workers",
+    response_model=WorkersInfo,
+    responses={
+        200: {
+            "model": WorkersInfo,
+            "description": "Workers successfully retrieved.",
+        },
+        500: {"description": "Internal server error.", "model": ProblemDetail},
+    },
+)
+async def get_workers() -> WorkersInfo:
+    """Get the workers from their health-check keys, with their recent heartbeats.
+
+    Reads only the health-check keys, in one pipeline: never the jobs nor the in-progress keys,
+    the workers report their ongoing jobs themselves.
+    """
+    return await get_worker_monitor().get_workers()
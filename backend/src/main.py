@@ -1,23 +1,71 @@
 import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
+from core.compression import CompressionMiddleware
 from core.config import Settings, get_app_settings
+from core.depends import (
+    get_cpu_executor,
+    get_job_decoder,
+    get_job_refresher,
+    get_job_service,
+    get_job_snapshot,
+    get_job_warmup,
+    get_loop_monitor,
+    get_redis_pool,
+)
+from core.etag import ETagMiddleware
 from core.exception_handler import (
     all_exception_handler,
     custom_validation_exception_handler,
+    executor_overloaded_exception_handler,
     http_exception_handler,
+    rate_limited_exception_handler,
     starlette_http_exception_handler,
 )
+from core.executor import ExecutorOverloadedError
 from core.helpers import join_paths_safely
+from core.rate_limit import RateLimitedError
+from core.static import PrecompressedStaticFiles
+from core.timing import TimingMiddleware
 from endpoints.api import routers
+from endpoints.jobs import get_fresh_job_index
 from fastapi import FastAPI
 from fastapi.exceptions import HTTPException, RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
+from services.job_replay import JobReplay
+from services.job_service import build_job
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 logger = logging.getLogger(__name__)
 
 
+@asynccontextmanager
+async def lifespan(application: FastAPI) -> AsyncIterator[None]:  # noqa: ARG001
+    """Start background services on startup and stop them on shutdown."""
+    settings: Settings = get_app_settings()
+    get_loop_monitor().start()
+    snapshot = get_job_snapshot()
+    if snapshot is not None:
+        job_service = await get_job_service()
+        if isinstance(snapshot, JobReplay):
+            snapshot.start(build_job)
+        else:
+            snapshot.start(lambda: job_service.scan_jobs(settings.max_jobs))
+    elif settings.warmup_enabled:
+        get_job_warmup().start(await get_job_service(), settings.max_jobs)
+    get_job_refresher().start(get_fresh_job_index)
+    yield
+    await get_job_refresher().stop()
+    await get_job_warmup().stop()
+    if snapshot is not None:
+        await snapshot.stop()
+    await get_loop_monitor().stop()
+    get_cpu_executor().shutdown()
+    get_job_decoder().shutdown()
+    await get_redis_pool().close()
+
+
 def get_application() -> FastAPI:
     """Returns the FastAPI application instance."""
     settings: Settings = get_app_settings()
@@ -31,6 +79,7 @@ def get_application() -> FastAPI:
         docs_url=join_paths_safely(settings.root_path, settings.docs_url),
         openapi_url=join_paths_safely(settings.root_path, settings.openapi_url),
         summary=settings.summary,
+        lifespan=lifespan,
     )
 
     if settings.cors_allowed_hosts:
@@ -42,6 +91,20 @@ def get_application() -> FastAPI:
             allow_headers=["*"],
         )
 
+    application.add_middleware(ETagMiddleware)
+    application.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_min_size,
+        encodings=settings.compression_encodings,
+        cache_size=settings.compression_cache_size,
+    )
+    application.add_middleware(
+        TimingMiddleware,
+        log_threshold=settings.timing_log_threshold,
+        profiling_enabled=settings.profiling_enabled,
+        profiling_interval=settings.profiling_interval,
+    )
+
     application.include_router(
         routers,
         prefix=join_paths_safely(settings.root_path, settings.api_prefix),
@@ -51,10 +114,22 @@ def get_application() -> FastAPI:
     application.add_exception_handler(HTTPException, http_exception_handler)  # type: ignore
     application.add_exception_handler(Exception, all_exception_handler)  # type: ignore
     application.add_exception_handler(StarletteHTTPException, starlette_http_exception_handler)  # type: ignore
+    application.add_exception_handler(
+        ExecutorOverloadedError,
+        executor_overloaded_exception_handler,  # type: ignore
+    )
+    application.add_exception_handler(
+        RateLimitedError,
+        rate_limited_exception_handler,  # type: ignore
+    )
 
     application.mount(
         join_paths_safely(settings.root_path, "ui"),
-        StaticFiles(directory="static", html=True),
+        PrecompressedStaticFiles(
+            directory="static",
+            html=True,
+            max_age=settings.static_max_age,
+        ),
         name="static",
     )
 
@@ -0,0 +1,90 @@
+from pydantic import BaseModel, Field
+
+
+class BreakdownRow(BaseModel):
+    """Represents the jobs of a function or a queue."""
+
+    name: str = Field(
+        description="Name of the function or the queue",
+        examples=["download_content"],
+    )
+
+    total: int = Field(
+        default=0,
+        description="Number of jobs in Redis",
+        examples=[1500],
+    )
+
+    queued: int = Field(
+        default=0,
+        description="Number of queued or deferred jobs",
+        examples=[120],
+    )
+
+    in_progress: int = Field(
+        default=0,
+        description="Number of jobs in progress",
+        examples=[8],
+    )
+
+    completed: int = Field(
+        default=0,
+        description="Number of completed jobs, failed ones included",
+        examples=[1372],
+    )
+
+    failed: int = Field(
+        default=0,
+        description="Number of jobs with errors",
+        examples=[12],
+    )
+
+    success_rate: float | None = Field(
+        default=None,
+        description="Fraction of the completed jobs which succeeded, empty without any",
+        examples=[0.991],
+    )
+
+    avg_duration: float | None = Field(
+        default=None,
+        description="Average execution duration of the completed jobs in seconds",
+        examples=[2.4],
+    )
+
+    p95_duration: float | None = Field(
+        default=None,
+        description="Estimated 95th percentile of the execution duration in seconds",
+        examples=[7.9],
+    )
+
+    avg_queue_wait: float | None = Field(
+        default=None,
+        description="Average time between enqueue and start of the completed jobs in seconds",
+        examples=[0.8],
+    )
+
+    p95_queue_wait: float | None = Field(
+        default=None,
+        description="Estimated 95th percentile of the queue wait in seconds",
+        examples=[3.1],
+    )
+
+
+class Breakdown(BaseModel):
+    """Represents the jobs broken down by function and by queue."""
+
+    functions: list[BreakdownRow] = Field(
+        default_factory=list,
+        description="Rows by function, the most jobs first",
+    )
+
+    queues: list[BreakdownRow] = Field(
+        default_factory=list,
+        description="Rows by queue, the most jobs first",
+    )
+
+    index_age: float | None = Field(
+        default=None,
+        description="Seconds since the job index was refreshed, the rows are as of then",
+        examples=[3.2],
+    )
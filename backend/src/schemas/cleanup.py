@@ -0,0 +1,92 @@
+from pydantic import BaseModel, Field
+
+
+class CleanupRequest(BaseModel):
+    """Represents a request to delete old job results."""
+
+    older_than: float = Field(
+        default=7 * 24 * 3600,
+        ge=0,
+        description="Delete the results of jobs finished more than this many seconds ago",
+        examples=[604800],
+    )
+
+    failed_older_than: float | None = Field(
+        default=None,
+        ge=0,
+        description="Delete the results of failed jobs finished more than this many seconds ago",
+        examples=[86400],
+    )
+
+    dry_run: bool = Field(
+        default=True,
+        description="Only count the results which would be deleted",
+        examples=[True],
+    )
+
+    max_commands_per_second: int | None = Field(
+        default=None,
+        gt=0,
+        description="Budget of Redis commands per second, capped by the server setting",
+        examples=[500],
+    )
+
+    batch_size: int = Field(
+        default=200,
+        ge=1,
+        le=1000,
+        description="Number of keys scanned, read and deleted per batch",
+        examples=[200],
+    )
+
+
+class CleanupProgress(BaseModel):
+    """Represents the progress of a cleanup of job results."""
+
+    dry_run: bool = Field(
+        default=True,
+        description="Indicates whether results are only counted",
+        examples=[True],
+    )
+
+    scanned: int = Field(
+        default=0,
+        description="Number of result keys scanned",
+        examples=[1000],
+    )
+
+    matched: int = Field(
+        default=0,
+        description="Number of results old enough to be deleted",
+        examples=[800],
+    )
+
+    deleted: int = Field(
+        default=0,
+        description="Number of results deleted",
+        examples=[800],
+    )
+
+    without_ttl: int = Field(
+        default=0,
+        description="Number of results scanned which never expire",
+        examples=[20],
+    )
+
+    commands: int = Field(
+        default=0,
+        description="Number of Redis commands, counting a command per key read or deleted",
+        examples=[2601],
+    )
+
+    elapsed: float = Field(
+        default=0.0,
+        description="Seconds since the cleanup started",
+        examples=[5.2],
+    )
+
+    done: bool = Field(
+        default=False,
+        description="Indicates whether the whole keyspace was scanned",
+        examples=[False],
+    )
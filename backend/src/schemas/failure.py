@@ -0,0 +1,73 @@
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from core.config import get_timezone
+from pydantic import BaseModel, Field
+
+timezone: ZoneInfo = get_timezone()
+
+
+class FailureSignature(BaseModel):
+    """Represents the failed jobs of a function sharing an error signature."""
+
+    signature: str = Field(
+        description="Type of the error and its message with ids and numbers replaced",
+        examples=["ValueError: order <n> not found"],
+    )
+
+    function: str = Field(
+        description="Name of the function that failed",
+        examples=["download_content"],
+    )
+
+    count: int = Field(
+        default=0,
+        description="Number of failed jobs in Redis with this signature",
+        examples=[1200],
+    )
+
+    first_seen: datetime | None = Field(
+        default=None,
+        description="Date and time of the first failure seen",
+        examples=["2024-03-24T17:32:30.587000+00:00"],
+    )
+
+    last_seen: datetime | None = Field(
+        default=None,
+        description="Date and time of the last failure seen",
+        examples=["2024-03-24T17:32:30.587000+00:00"],
+    )
+
+    sample_ids: list[str] = Field(
+        default_factory=list,
+        description="Ids of a few of the failed jobs",
+        examples=[["f0c9d0944f1b4763b261ab5d49581321"]],
+    )
+
+    class Config:
+        """Pydantic model configuration."""
+
+        json_encoders = {
+            datetime: lambda v: v.astimezone(timezone).isoformat(),
+        }
+
+
+class FailuresInfo(BaseModel):
+    """Represents the failed jobs grouped by error signature."""
+
+    total: int = Field(
+        default=0,
+        description="Number of failed jobs in Redis",
+        examples=[1250],
+    )
+
+    signatures: list[FailureSignature] = Field(
+        default_factory=list,
+        description="Error signatures, the most frequent first",
+    )
+
+    index_age: float | None = Field(
+        default=None,
+        description="Seconds since the job index was refreshed, the failures are as of then",
+        examples=[3.2],
+    )
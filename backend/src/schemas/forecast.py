@@ -0,0 +1,71 @@
+from enum import Enum
+
+from pydantic import BaseModel, Field
+
+
+class ForecastAlert(str, Enum):
+    """Enumeration for backlog alert levels."""
+
+    ok = "ok"
+    warning = "warning"
+    critical = "critical"
+
+
+class BacklogForecast(BaseModel):
+    """Represents the forecast of a queued backlog."""
+
+    function: str | None = Field(
+        default=None,
+        description="Name of the function, empty for the whole queue",
+        examples=["download_content"],
+    )
+
+    queued: int = Field(
+        default=0,
+        description="Number of queued jobs",
+        examples=[120],
+    )
+
+    arrival_rate: float = Field(
+        default=0.0,
+        description="Average number of jobs enqueued per minute",
+        examples=[30.0],
+    )
+
+    completion_rate: float = Field(
+        default=0.0,
+        description="Average number of jobs completed per minute, failed ones included",
+        examples=[42.0],
+    )
+
+    drain_seconds: float | None = Field(
+        default=None,
+        description="Estimated seconds until the backlog is drained, empty if it doesn't drain",
+        examples=[600.0],
+    )
+
+    alert: ForecastAlert = Field(
+        default=ForecastAlert.ok,
+        description="Alert level of the drain time",
+        examples=["ok"],
+    )
+
+
+class Forecast(BaseModel):
+    """Represents the backlog forecast of the queue and of every function."""
+
+    overall: BacklogForecast = Field(
+        default_factory=BacklogForecast,
+        description="Forecast for the whole queue",
+    )
+
+    functions: list[BacklogForecast] = Field(
+        default_factory=list,
+        description="Forecast per function, the longest drain first",
+    )
+
+    index_age: float | None = Field(
+        default=None,
+        description="Seconds since the job index was refreshed, the forecast is as of then",
+        examples=[3.2],
+    )
@@ -0,0 +1,45 @@
+from pydantic import BaseModel, Field
+
+
+class Health(BaseModel):
+    """Represents the result of a liveness or readiness probe."""
+
+    status: str = Field(
+        description="ok, warming or unavailable",
+        examples=["ok"],
+    )
+
+    reason: str | None = Field(
+        default=None,
+        description="Why the service isn't ok",
+        examples=["Redis didn't answer the ping within 1.0s."],
+    )
+
+    loop_lag_ms: float = Field(
+        description="Last measured event loop lag in milliseconds",
+        examples=[0.4],
+    )
+
+    redis_ping_ms: float | None = Field(
+        default=None,
+        description="Round-trip time of a PING through the shared pool, if Redis was pinged",
+        examples=[0.8],
+    )
+
+    index_age: float | None = Field(
+        default=None,
+        description="Seconds since the job index was refreshed, null if it never was",
+        examples=[3.2],
+    )
+
+    jobs_len: int | None = Field(
+        default=None,
+        description="Number of jobs in the job index",
+        examples=[1500],
+    )
+
+    warmup_progress: float | None = Field(
+        default=None,
+        description="Fraction of the jobs loaded by the startup warm-up",
+        examples=[1.0],
+    )
@@ -3,11 +3,12 @@ from enum import Enum
 from typing import Any
 from zoneinfo import ZoneInfo
 
-from core.config import Settings, get_app_settings
-from pydantic import BaseModel, Field
+from core.config import Settings, get_app_settings, get_timezone
+from pydantic import BaseModel, ConfigDict, Field
 from schemas.paged import Paged
 
 settings: Settings = get_app_settings()
+timezone: ZoneInfo = get_timezone()
 
 
 class JobStatus(str, Enum):
@@ -73,6 +74,13 @@ class JobsTimeStatistics(BaseModel):
         examples=[1.0],
     )
 
+    class Config:
+        """Pydantic model configuration."""
+
+        json_encoders = {
+            datetime: lambda v: v.astimezone(timezone).isoformat(),
+        }
+
 
 class Job(BaseModel):
     """Represents a job."""
@@ -107,6 +115,12 @@ class Job(BaseModel):
         examples=["ok"],
     )
 
+    error_signature: str | None = Field(
+        default=None,
+        description="Signature of the error of a failed job, to group identical failures",
+        examples=["ValueError: order <n> not found"],
+    )
+
     start_time: datetime | None = Field(
         default=None,
         description="Date and time when the job was started",
@@ -155,11 +169,18 @@ class Job(BaseModel):
         examples=[1],
     )
 
+    indexed_kwargs: dict[str, str] = Field(
+        default_factory=dict,
+        exclude=True,
+        description="Values of the indexed keyword arguments, kept for the kwarg index only",
+        examples=[{"customer_id": "123"}],
+    )
+
     class Config:
         """Pydantic model configuration."""
 
         json_encoders = {
-            datetime: lambda v: v.astimezone(ZoneInfo(settings.timezone)).isoformat(),
+            datetime: lambda v: v.astimezone(timezone).isoformat(),
         }
 
 
@@ -196,7 +217,7 @@ class JobCreate(BaseModel):
         """Pydantic model configuration."""
 
         json_encoders = {
-            datetime: lambda v: v.astimezone(ZoneInfo(settings.timezone)).isoformat(),
+            datetime: lambda v: v.astimezone(timezone).isoformat(),
         }
 
 
@@ -258,6 +279,67 @@ class JobsInfo(BaseModel):
         description="List of time statistics for jobs",
     )
 
+    partial: bool = Field(
+        default=False,
+        description="Indicates whether the jobs are still being loaded after a restart",
+        examples=[False],
+    )
+
+    progress: float = Field(
+        default=1.0,
+        description="Fraction of the jobs loaded, less than 1 while the response is partial",
+        examples=[1.0],
+    )
+
+    index_age: float | None = Field(
+        default=None,
+        description="Seconds since the job index was refreshed, for a lookup by keyword argument",
+        examples=[3.2],
+    )
+
+
+class JobChanges(BaseModel):
+    """Represents the jobs changed since a version of the job index."""
+
+    version: str = Field(
+        description="Version token to pass as ``since`` to get the next changes",
+        examples=["3f9a1c2e-1520"],
+    )
+
+    reset: bool = Field(
+        default=False,
+        description="Indicates whether the changes since the token aren't known anymore, "
+        "the jobs must be loaded again",
+        examples=[False],
+    )
+
+    created: list[Job] = Field(
+        default_factory=list,
+        description="Jobs found since the token",
+    )
+
+    updated: list[Job] = Field(
+        default_factory=list,
+        description="Jobs changed since the token",
+    )
+
+    removed: list[str] = Field(
+        default_factory=list,
+        description="Ids of the jobs gone since the token",
+        examples=[["b4e4bd2c1fd14f5d8a4d4fa3a8d4e1e3"]],
+    )
+
+    statistics_delta: Statistics = Field(
+        default_factory=Statistics,
+        description="Change of the number of jobs in Redis by status since the token",
+    )
+
+    index_age: float | None = Field(
+        default=None,
+        description="Seconds since the job index was refreshed, the changes are as of then",
+        examples=[3.2],
+    )
+
 
 class JobSortBy(str, Enum):
     """Enumeration for sorting options."""
@@ -281,3 +363,52 @@ class JobSortOrder(str, Enum):
 
     asc = "asc"
     desc = "desc"
+
+
+class JobField(str, Enum):
+    """Enumeration for the fields of a job."""
+
+    id = "id"
+    status = "status"
+    success = "success"
+    enqueue_time = "enqueue_time"
+    result = "result"
+    error_signature = "error_signature"
+    start_time = "start_time"
+    finish_time = "finish_time"
+    queue_name = "queue_name"
+    execution_duration = "execution_duration"
+    function = "function"
+    args = "args"
+    kwargs = "kwargs"
+    job_try = "job_try"
+
+
+class JobsQuery(BaseModel):
+    """Represents the filtering, sorting and paging parameters of a jobs request."""
+
+    model_config = ConfigDict(frozen=True)
+
+    limit: int = 50
+    offset: int = 0
+    sort_by: JobSortBy = JobSortBy.enqueue_time
+    sort_order: JobSortOrder = JobSortOrder.desc
+    statuses: tuple[JobStatus, ...] = ()
+    success: bool | None = None
+    function: str | None = None
+    search: str | None = None
+    signature: str | None = None
+    start_time: datetime | None = None
+    finish_time: datetime | None = None
+    ids: tuple[str, ...] = ()
+    kwargs: tuple[tuple[str, str], ...] = ()
+    fields: tuple[JobField, ...] = ()
+
+    @property
+    def exclude(self) -> dict[str, Any] | None:
+        """Get the fields of the jobs left out of the response, ``None`` to keep them all."""
+        if not self.fields:
+            return None
+        # The id is always returned, jobs can't be told apart without it.
+        excluded = {field.value for field in JobField} - {field.value for field in self.fields}
+        return {"paged_jobs": {"items": {"__all__": excluded - {JobField.id.value}}}}
@@ -0,0 +1,111 @@
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from core.config import get_timezone
+from pydantic import BaseModel, Field
+
+timezone: ZoneInfo = get_timezone()
+
+
+class WorkerHeartbeat(BaseModel):
+    """Represents the counters a worker reported in one health check."""
+
+    time: datetime = Field(
+        description="Date and time when the health check was seen",
+        examples=["2024-03-24T17:32:30.587000+00:00"],
+    )
+
+    jobs_complete: int = Field(
+        default=0,
+        description="Jobs completed by the worker since it started",
+        examples=[100],
+    )
+
+    jobs_failed: int = Field(
+        default=0,
+        description="Jobs failed by the worker since it started",
+        examples=[2],
+    )
+
+    jobs_retried: int = Field(
+        default=0,
+        description="Jobs retried by the worker since it started",
+        examples=[1],
+    )
+
+    jobs_ongoing: int = Field(
+        default=0,
+        description="Jobs the worker was running",
+        examples=[3],
+    )
+
+    queued: int = Field(
+        default=0,
+        description="Jobs in the queue of the worker",
+        examples=[10],
+    )
+
+    class Config:
+        """Pydantic model configuration."""
+
+        json_encoders = {
+            datetime: lambda v: v.astimezone(timezone).isoformat(),
+        }
+
+
+class Worker(BaseModel):
+    """Represents a worker, as reported by its health-check key."""
+
+    health_check_key: str = Field(
+        description="Redis key the worker writes its health check to",
+        examples=["arq:queue:health-check"],
+    )
+
+    alive: bool = Field(
+        default=False,
+        description="Indicates whether the health-check key exists",
+        examples=[True],
+    )
+
+    seconds_since_heartbeat: float | None = Field(
+        default=None,
+        description="Seconds since the worker last wrote its health check",
+        examples=[12.5],
+    )
+
+    seconds_to_expiry: float | None = Field(
+        default=None,
+        description="Seconds until the health check expires unless the worker writes it again",
+        examples=[3588.5],
+    )
+
+    throughput: float | None = Field(
+        default=None,
+        description="Jobs finished per minute over the heartbeat history",
+        examples=[42.0],
+    )
+
+    last: WorkerHeartbeat | None = Field(
+        default=None,
+        description="Counters of the last health check",
+    )
+
+    history: list[WorkerHeartbeat] = Field(
+        default_factory=list,
+        description="Recent health checks, oldest first",
+    )
+
+
+class WorkersInfo(BaseModel):
+    """Represents the workers and the jobs they are running."""
+
+    workers: list[Worker] = Field(
+        default_factory=list,
+        description="Workers of the configured health-check keys",
+    )
+
+    in_progress: int = Field(
+        default=0,
+        description="Jobs the live workers were running at their last health check",
+        examples=[3],
+    )
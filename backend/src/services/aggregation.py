@@ -0,0 +1,200 @@
+from datetime import UTC, datetime, timedelta
+
+from core.timing import phase
+from schemas.job import (
+    ColorStatistics,
+    Job,
+    JobsInfo,
+    JobSortOrder,
+    JobsQuery,
+    JobStatus,
+    JobsTimeStatistics,
+    Statistics,
+)
+from schemas.paged import Paged
+
+# Cost of a jobs request, in tokens of the per-client rate limit: a request answered
+# from the response cache costs one token, a computed one a token per thousand jobs and
+# per pass over them (statistics, filtering and sorting), more to search their text.
+QUERY_BASE_COST = 1.0
+QUERY_COST_PER_PASS = 1.0
+QUERY_SEARCH_COST = 3.0
+QUERY_JOBS_PER_TOKEN = 1000
+
+# The functions below are CPU-bound and free of I/O, so that they can be run
+# in the CPU executor (a thread or a process) instead of the event loop.
+
+
+def adjust_color_intensity(color_intensity: float) -> float:
+    """Adjust color intensity."""
+    if color_intensity < 0.4:  # noqa: PLR2004
+        return 0.3
+    if color_intensity < 0.6:  # noqa: PLR2004
+        return 0.5
+    if color_intensity < 0.8:  # noqa: PLR2004
+        return 0.7
+
+    return 1.0
+
+
+def statistics_window(now: datetime | None = None) -> datetime:
+    """Get the start of the first of the 60 one-minute buckets ending with the current one."""
+    now_fixed = (now or datetime.now(UTC)).replace(second=0, microsecond=0)
+    return now_fixed - timedelta(hours=1) + timedelta(minutes=1)
+
+
+def generate_statistics(jobs_list: list[Job]) -> list[JobsTimeStatistics]:
+    """Generate statistics for jobs."""
+    max_time_diff = 60
+    one_hour_ago = statistics_window()
+    current_minute = max_time_diff - 1
+
+    statistics = [
+        JobsTimeStatistics(date=(one_hour_ago + timedelta(minutes=i)))
+        for i in range(max_time_diff)
+    ]
+    for job in jobs_list:
+        created_diff = (job.enqueue_time - one_hour_ago).total_seconds() // max_time_diff
+        if 0 <= created_diff < max_time_diff:
+            statistics[int(created_diff)].total_created += 1
+
+        # Jobs which started before the window only count from its first minute.
+        if job.status == JobStatus.in_progress and job.start_time:
+            start_diff = int((job.start_time - one_hour_ago).total_seconds() // max_time_diff)
+            for i in range(max(start_diff, 0), current_minute + 1):
+                statistics[i].total_in_progress += 1
+
+        if job.status == JobStatus.complete and job.start_time and job.finish_time:
+            start_diff = int((job.start_time - one_hour_ago).total_seconds() // max_time_diff)
+            finish_diff = int(
+                (job.finish_time - one_hour_ago).total_seconds() // max_time_diff,
+            )
+            for i in range(max(start_diff, 0), min(finish_diff + 1, max_time_diff)):
+                statistics[i].total_in_progress += 1
+            if 0 <= finish_diff < max_time_diff:
+                if job.success:
+                    statistics[finish_diff].total_completed_successfully += 1
+                else:
+                    statistics[finish_diff].total_failed += 1
+
+    return color_statistics(statistics)
+
+
+def color_statistics(statistics: list[JobsTimeStatistics]) -> list[JobsTimeStatistics]:
+    """Set the color of every minute from its counts."""
+    max_jobs = max(
+        stat.total_completed_successfully + stat.total_in_progress for stat in statistics
+    )
+
+    for stat in statistics:
+        current_jobs = stat.total_completed_successfully + stat.total_in_progress
+        color_intensity = round(current_jobs / max_jobs, 1) if max_jobs > 0 else 1.0
+        stat.color_intensity = adjust_color_intensity(color_intensity)
+
+        if stat.total_completed_successfully == 0 and stat.total_failed == 0:
+            stat.color = ColorStatistics.gray
+            stat.color_intensity = 1
+        elif stat.total_failed == 0 and stat.total_completed_successfully > 0:
+            stat.color = ColorStatistics.green
+        elif stat.total_completed_successfully == 0 and stat.total_failed > 0:
+            stat.color = ColorStatistics.red
+        else:
+            stat.color = ColorStatistics.orange
+
+    return statistics
+
+
+def generate_status_statistics(jobs: list[Job]) -> Statistics:
+    """Count jobs by status."""
+    return Statistics(
+        total=len(jobs),
+        in_progress=len([job for job in jobs if job.status == JobStatus.in_progress]),
+        completed=len([job for job in jobs if job.status == JobStatus.complete]),
+        queued=len([job for job in jobs if job.status == JobStatus.queued]),
+        failed=len(
+            [job for job in jobs if job.status == JobStatus.complete and job.success is False],
+        ),
+    )
+
+
+def estimate_query_cost(query: JobsQuery | None, job_count: int) -> float:
+    """Estimate the cost of computing a jobs response, ``None`` for the statistics only."""
+    if query is None:
+        passes = QUERY_COST_PER_PASS
+    elif query.ids or query.kwargs:
+        return QUERY_BASE_COST + len(query.ids) / QUERY_JOBS_PER_TOKEN
+    else:
+        passes = 3 * QUERY_COST_PER_PASS
+        if query.search:
+            passes += QUERY_SEARCH_COST
+    return QUERY_BASE_COST + passes * job_count / QUERY_JOBS_PER_TOKEN
+
+
+def filter_jobs(jobs: list[Job], query: JobsQuery) -> list[Job]:
+    """Filter and sort jobs according to the query."""
+    # The query times are normalized to UTC, like the job times.
+    if query.start_time:
+        start_time = query.start_time
+        jobs = [
+            job
+            for job in jobs
+            if job.enqueue_time >= start_time
+            and (job.start_time is None or job.start_time >= start_time)
+        ]
+
+    if query.finish_time:
+        finish_time = query.finish_time
+        jobs = [
+            job
+            for job in jobs
+            if job.enqueue_time <= finish_time
+            and (job.finish_time is None or job.finish_time <= finish_time)
+        ]
+
+    if len(query.statuses) > 0:
+        jobs = [job for job in jobs if job.status in query.statuses]
+
+    if query.success is not None:
+        jobs = [job for job in jobs if job.success == query.success]
+
+    if query.function:
+        jobs = [job for job in jobs if job.function == query.function]
+
+    if query.signature:
+        jobs = [job for job in jobs if job.error_signature == query.signature]
+
+    if query.search:
+        search = query.search.lower()
+        jobs = [job for job in jobs if search in str(job).lower()]
+
+    sort_by = query.sort_by
+    return sorted(
+        jobs,
+        key=lambda x: (getattr(x, sort_by) is None, getattr(x, sort_by)),
+        reverse=query.sort_order == JobSortOrder.desc,
+    )
+
+
+def build_jobs_info(jobs: list[Job], query: JobsQuery) -> JobsInfo:
+    """Build the jobs page together with the statistics for all jobs."""
+    with phase("statistics"):
+        functions: list[str] = list({job.function for job in jobs})
+        statistics = generate_status_statistics(jobs)
+    with phase("statistics_hourly"):
+        time_statistic: list[JobsTimeStatistics] = generate_statistics(jobs)
+
+    with phase("filter_sort"):
+        jobs = filter_jobs(jobs, query)
+    paging_jobs = jobs[query.offset : query.offset + query.limit]
+
+    return JobsInfo(
+        functions=functions,
+        statistics=statistics,
+        statistics_hourly=time_statistic,
+        paged_jobs=Paged[Job](
+            items=paging_jobs,
+            count=len(jobs),
+            limit=query.limit,
+            offset=query.offset,
+        ),
+    )
@@ -0,0 +1,99 @@
+import bisect
+import math
+from collections import Counter
+
+from schemas.breakdown import BreakdownRow
+from schemas.job import Job, JobStatus
+
+# Bounds of the buckets of the duration histograms: 10% apart from 1 ms to about a week,
+# so that a percentile is estimated within 5% whatever the number of jobs.
+HISTOGRAM_GROWTH = 1.1
+HISTOGRAM_BOUNDS = [
+    0.001 * HISTOGRAM_GROWTH**index
+    for index in range(math.ceil(math.log(7 * 24 * 3600 / 0.001, HISTOGRAM_GROWTH)) + 1)
+]
+
+
+class DurationHistogram:
+    """Durations counted in logarithmic buckets, values can be removed as well as added."""
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def add(self, value: float, count: int = 1) -> None:
+        """Count a duration, or stop counting it with a count of -1."""
+        self.counts[bisect.bisect_left(HISTOGRAM_BOUNDS, value)] += count
+        self.count += count
+        self.sum += value * count
+
+    def mean(self) -> float | None:
+        """Get the average duration."""
+        return self.sum / self.count if self.count else None
+
+    def quantile(self, q: float) -> float | None:
+        """Estimate a quantile by the geometric middle of the bucket it falls in.
+
+        The first bucket starts at 0, e.g. for jobs started as soon as enqueued, so a
+        quantile falling in it is 0.
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= rank and bucket_count:
+                if index == 0:
+                    return 0.0
+                if index == len(HISTOGRAM_BOUNDS):
+                    return HISTOGRAM_BOUNDS[-1]
+                return math.sqrt(HISTOGRAM_BOUNDS[index - 1] * HISTOGRAM_BOUNDS[index])
+        return HISTOGRAM_BOUNDS[-1]
+
+
+class BreakdownGroup:
+    """Counters of the jobs of a function or a queue, maintained as jobs come and go."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.state_counts: Counter[str] = Counter()
+        self.durations = DurationHistogram()
+        self.queue_waits = DurationHistogram()
+
+    @property
+    def total(self) -> int:
+        """Get the number of jobs of the group."""
+        return self.state_counts.total()
+
+    def add(self, job: Job, state: str, count: int = 1) -> None:
+        """Count a job, or stop counting it with a count of -1."""
+        self.state_counts[state] += count
+        if job.status != JobStatus.complete:
+            return
+        if job.execution_duration is not None:
+            self.durations.add(job.execution_duration, count)
+        if job.start_time is not None:
+            self.queue_waits.add((job.start_time - job.enqueue_time).total_seconds(), count)
+
+    def to_schema(self, failed_state: str) -> BreakdownRow:
+        """Describe the group, costs O(histogram buckets)."""
+        failed = self.state_counts[failed_state]
+        completed = self.state_counts[JobStatus.complete.value] + failed
+        return BreakdownRow(
+            name=self.name,
+            total=self.total,
+            queued=(
+                self.state_counts[JobStatus.queued.value]
+                + self.state_counts[JobStatus.deferred.value]
+            ),
+            in_progress=self.state_counts[JobStatus.in_progress.value],
+            completed=completed,
+            failed=failed,
+            success_rate=(completed - failed) / completed if completed else None,
+            avg_duration=self.durations.mean(),
+            p95_duration=self.durations.quantile(0.95),
+            avg_queue_wait=self.queue_waits.mean(),
+            p95_queue_wait=self.queue_waits.quantile(0.95),
+        )
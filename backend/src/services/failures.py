@@ -0,0 +1,67 @@
+import re
+from collections import deque
+from datetime import datetime
+
+from schemas.failure import FailureSignature
+
+# Parts of error messages which differ between occurrences of the same error,
+# replaced in this order so that e.g. the digits of a UUID aren't replaced first.
+SIGNATURE_PATTERNS = (
+    (re.compile(r"[0-9a-fA-F]{8}-(?:[0-9a-fA-F]{4}-){3}[0-9a-fA-F]{12}"), "<uuid>"),
+    (re.compile(r"\b(?=[0-9a-fA-F]*\d)[0-9a-fA-F]{16,}\b"), "<hex>"),
+    # A whole version, e.g. v1.2.3 or 2.31.0, rather than the numbers after its first dot.
+    (re.compile(r"(?<![\w.])(?:[vV]\d+(?:\.\d+)*|\d+\.\d+\.\d+)(?!\.?\w)"), "<version>"),
+    (re.compile(r"(?<![A-Za-z0-9])\d+(?:[.:]\d+)*"), "<n>"),
+)
+MAX_MESSAGE_LENGTH = 200
+
+
+def error_signature(error: object) -> str:
+    """Get the signature of an error: its type and its message with ids and numbers stripped."""
+    message = " ".join(str(error).split())
+    for pattern, placeholder in SIGNATURE_PATTERNS:
+        message = pattern.sub(placeholder, message)
+    return f"{type(error).__name__}: {message[:MAX_MESSAGE_LENGTH]}"
+
+
+class FailureGroup:
+    """Failed jobs sharing an error signature."""
+
+    def __init__(self, signature: str, function: str, samples: int = 5) -> None:
+        self.signature = signature
+        self.function = function
+        self.count = 0
+        self.first_seen: datetime | None = None
+        self.last_seen: datetime | None = None
+        self.sample_ids: deque[str] = deque(maxlen=samples)
+
+    def add(self, job_id: str, finish_time: datetime | None) -> None:
+        """Count a failed job."""
+        self.count += 1
+        if finish_time is not None:
+            if self.first_seen is None or finish_time < self.first_seen:
+                self.first_seen = finish_time
+            if self.last_seen is None or finish_time > self.last_seen:
+                self.last_seen = finish_time
+        if job_id not in self.sample_ids:
+            self.sample_ids.append(job_id)
+
+    def remove(self, job_id: str) -> None:
+        """Stop counting a failed job, e.g. when its result expired.
+
+        The first and last seen times are kept, they are those of all the failures seen.
+        """
+        self.count -= 1
+        if job_id in self.sample_ids:
+            self.sample_ids.remove(job_id)
+
+    def to_schema(self) -> FailureSignature:
+        """Describe the group."""
+        return FailureSignature(
+            signature=self.signature,
+            function=self.function,
+            count=self.count,
+            first_seen=self.first_seen,
+            last_seen=self.last_seen,
+            sample_ids=list(self.sample_ids),
+        )
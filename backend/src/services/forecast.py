@@ -0,0 +1,98 @@
+import math
+from datetime import datetime
+
+from schemas.forecast import BacklogForecast, ForecastAlert
+
+
+def epoch_minute(value: datetime) -> int:
+    """Get the number of the minute a datetime falls in."""
+    return int(value.timestamp() // 60)
+
+
+class RateEstimator:
+    """Exponentially weighted average of a number of events per minute.
+
+    Events are counted in one-minute buckets, the same buckets ``generate_statistics``
+    uses, and a bucket is folded into the average once its minute is over. Adding an
+    event and reading the rate cost O(1) amortized, whatever the number of jobs.
+    """
+
+    def __init__(self, alpha: float = 0.2, horizon: int = 60) -> None:
+        self.alpha = alpha
+        # Minutes looked back when the rate is first read, or after a longer pause.
+        self.horizon = horizon
+        self.value = 0.0
+        self.folded: int | None = None
+        self.buckets: dict[int, int] = {}
+
+    def add(self, when: datetime) -> None:
+        """Count an event in the minute it happened."""
+        minute = epoch_minute(when)
+        if self.folded is not None and minute <= self.folded:
+            # Noticed after its minute was folded, e.g. between two refreshes of the index.
+            minute = self.folded + 1
+        self.buckets[minute] = self.buckets.get(minute, 0) + 1
+
+    def rate(self, now: datetime) -> float:
+        """Get the average number of events per minute up to the last complete minute."""
+        current = epoch_minute(now)
+        start = current - self.horizon
+        if self.folded is not None and self.folded >= start:
+            start = self.folded + 1
+        else:
+            # Nothing was folded for the whole horizon, the minutes before it don't count.
+            self.value = 0.0
+            for minute in [minute for minute in self.buckets if minute < start]:
+                del self.buckets[minute]
+        for minute in range(start, current):
+            self.value += self.alpha * (self.buckets.pop(minute, 0) - self.value)
+        self.folded = max(start, current) - 1
+        return self.value
+
+
+def forecast_alert(
+    queued: int,
+    drain_seconds: float | None,
+    warning: float,
+    critical: float,
+) -> ForecastAlert:
+    """Rate a backlog by its drain time; a backlog which doesn't drain is critical."""
+    if queued == 0:
+        return ForecastAlert.ok
+    if drain_seconds is None or drain_seconds > critical:
+        return ForecastAlert.critical
+    if drain_seconds > warning:
+        return ForecastAlert.warning
+    return ForecastAlert.ok
+
+
+def forecast_backlog(
+    function: str | None,
+    queued: int,
+    arrival_rate: float,
+    completion_rate: float,
+    warning: float,
+    critical: float,
+) -> BacklogForecast:
+    """Estimate when a backlog is drained at the current rates."""
+    net_rate = completion_rate - arrival_rate
+    if queued == 0:
+        drain_seconds: float | None = 0.0
+    elif net_rate > 0:
+        drain_seconds = queued / net_rate * 60
+    else:
+        drain_seconds = None
+    return BacklogForecast(
+        function=function,
+        queued=queued,
+        arrival_rate=arrival_rate,
+        completion_rate=completion_rate,
+        drain_seconds=drain_seconds,
+        alert=forecast_alert(queued, drain_seconds, warning, critical),
+    )
+
+
+def drain_seconds_value(forecast: BacklogForecast) -> float:
+    """Get the drain time as a metric value, infinite for a backlog which doesn't drain."""
+    return math.inf if forecast.drain_seconds is None else forecast.drain_seconds
+
@@ -0,0 +1,335 @@
+import asyncio
+import secrets
+import time
+from collections import Counter, defaultdict, deque
+from datetime import UTC, datetime
+
+from core.executor import CpuExecutor
+from core.metrics import job_duration_histogram
+from schemas.breakdown import Breakdown
+from schemas.failure import FailuresInfo
+from schemas.forecast import Forecast
+from schemas.job import Job, JobChanges, JobStatus, Statistics
+from services.breakdown import BreakdownGroup
+from services.failures import FailureGroup
+from services.forecast import RateEstimator, drain_seconds_value, forecast_backlog
+
+FAILED = "failed"
+# A change of a job: index version, job id, and states before and after (``None`` when
+# the job didn't exist or doesn't anymore).
+Change = tuple[int, str, str | None, str | None]
+# Jobs removed, added and replaced (previous and new version) by a refresh.
+JobsDiff = tuple[list[Job], list[Job], list[tuple[Job, Job]]]
+# Changes applied between two yields to the event loop.
+APPLY_CHUNK_SIZE = 1000
+
+
+def job_state(job: Job) -> str:
+    """Get the state a job is counted under: its status, or ``failed`` for failed jobs."""
+    if job.status == JobStatus.complete and not job.success:
+        return FAILED
+    return job.status.value
+
+
+def diff_jobs(indexed: dict[str, Job], jobs: list[Job]) -> JobsDiff:
+    """Compare the indexed jobs with a fresh list of all jobs in Redis, costs O(jobs).
+
+    Module level so that it can be sent to a process executor.
+    """
+    fresh = {job.id: job for job in jobs}
+    removed = [indexed[job_id] for job_id in indexed.keys() - fresh.keys()]
+    added = []
+    replaced = []
+    for job in fresh.values():
+        previous = indexed.get(job.id)
+        if previous is None:
+            added.append(job)
+        elif previous is not job and previous != job:
+            replaced.append((previous, job))
+    return removed, added, replaced
+
+
+class JobIndex:
+    """In-memory index of the jobs found in Redis.
+
+    Aggregates are maintained incrementally: each refresh only touches the jobs that
+    were added, changed or removed since the previous one, so reading them costs
+    O(number of aggregates) rather than O(number of jobs).
+    """
+
+    def __init__(
+        self,
+        forecast_alpha: float = 0.2,
+        changelog_size: int = 10000,
+        default_queue: str = "arq:queue",
+    ) -> None:
+        self.jobs: dict[str, Job] = {}
+        # Every change bumps the version; the latest changes are kept for delta polling.
+        # The epoch tells tokens of this index apart from those of a restarted process.
+        self.epoch = secrets.token_hex(4)
+        self.version = 0
+        self.changelog: deque[Change] = deque(maxlen=changelog_size)
+        self.state_counts: Counter[str] = Counter()
+        self.function_state_counts: Counter[tuple[str, str]] = Counter()
+        # Jobs enqueued and completed per minute, by function and overall (``None``).
+        self.arrivals: defaultdict[str | None, RateEstimator] = defaultdict(
+            lambda: RateEstimator(forecast_alpha),
+        )
+        self.completions: defaultdict[str | None, RateEstimator] = defaultdict(
+            lambda: RateEstimator(forecast_alpha),
+        )
+        # Failed jobs by function and error signature.
+        self.failures: dict[tuple[str, str], FailureGroup] = {}
+        # Counters and duration histograms by function and by queue. Only results know
+        # their queue, the other jobs are found in the default one.
+        self.default_queue = default_queue
+        self.function_groups: dict[str, BreakdownGroup] = {}
+        self.queue_groups: dict[str, BreakdownGroup] = {}
+        # Ids of the jobs by indexed keyword argument name and value.
+        self.kwargs: defaultdict[tuple[str, str], set[str]] = defaultdict(set)
+        self.updated_at: float | None = None
+        # Refreshes are applied one at a time, the jobs don't change while being compared.
+        self._refresh_lock = asyncio.Lock()
+
+    async def refresh(self, jobs: list[Job], executor: CpuExecutor) -> None:
+        """Replace the indexed jobs with a fresh list of all jobs in Redis.
+
+        The jobs are compared in the executor. Only the differences are applied in the
+        event loop, a chunk at a time, so a large refresh doesn't block other requests.
+        """
+        async with self._refresh_lock:
+            removed, added, replaced = await executor.run(diff_jobs, self.jobs, jobs)
+            changes: list[tuple[Job | None, Job | None]] = [
+                *((job, None) for job in removed),
+                *((None, job) for job in added),
+                *replaced,
+            ]
+            for start in range(0, len(changes), APPLY_CHUNK_SIZE):
+                if start:
+                    await asyncio.sleep(0)
+                for previous, job in changes[start : start + APPLY_CHUNK_SIZE]:
+                    if job is None:
+                        self.remove(previous)
+                    elif previous is None:
+                        self.add(job)
+                    else:
+                        self.replace(previous, job)
+            self.updated_at = time.time()
+
+    def add(self, job: Job) -> None:
+        """Add a job that wasn't indexed yet."""
+        self.jobs[job.id] = job
+        self.state_counts[job_state(job)] += 1
+        self.function_state_counts[job.function, job_state(job)] += 1
+        for function in (job.function, None):
+            self.arrivals[function].add(job.enqueue_time)
+        self.add_failure(job)
+        self.observe_completion(job)
+        self.add_kwargs(job)
+        self.count_in_groups(job, 1)
+        self.record(job.id, None, job_state(job))
+
+    def remove(self, job: Job) -> None:
+        """Remove an indexed job."""
+        del self.jobs[job.id]
+        self.state_counts[job_state(job)] -= 1
+        self.function_state_counts[job.function, job_state(job)] -= 1
+        self.remove_failure(job)
+        self.remove_kwargs(job)
+        self.count_in_groups(job, -1)
+        self.record(job.id, job_state(job), None)
+
+    def replace(self, previous: Job, job: Job) -> None:
+        """Replace an indexed job with its new version."""
+        self.jobs[job.id] = job
+        self.state_counts[job_state(previous)] -= 1
+        self.state_counts[job_state(job)] += 1
+        self.function_state_counts[previous.function, job_state(previous)] -= 1
+        self.function_state_counts[job.function, job_state(job)] += 1
+        self.remove_failure(previous)
+        self.add_failure(job)
+        if previous.status != JobStatus.complete:
+            self.observe_completion(job)
+        if previous.indexed_kwargs != job.indexed_kwargs:
+            self.remove_kwargs(previous)
+            self.add_kwargs(job)
+        self.count_in_groups(previous, -1)
+        self.count_in_groups(job, 1)
+        self.record(job.id, job_state(previous), job_state(job))
+
+    def count_in_groups(self, job: Job, count: int) -> None:
+        """Count a job in the groups of its function and its queue, or stop counting it."""
+        for groups, name in (
+            (self.function_groups, job.function),
+            (self.queue_groups, job.queue_name or self.default_queue),
+        ):
+            group = groups.get(name)
+            if group is None:
+                group = groups[name] = BreakdownGroup(name)
+            group.add(job, job_state(job), count)
+            if not group.total:
+                del groups[name]
+
+    def breakdown(self) -> Breakdown:
+        """Get the jobs by function and by queue, costs O(functions + queues)."""
+        return Breakdown(
+            functions=[
+                group.to_schema(FAILED)
+                for group in sorted(self.function_groups.values(), key=lambda g: -g.total)
+            ],
+            queues=[
+                group.to_schema(FAILED)
+                for group in sorted(self.queue_groups.values(), key=lambda g: -g.total)
+            ],
+        )
+
+    def record(self, job_id: str, before: str | None, after: str | None) -> None:
+        """Record a change of a job in the changelog."""
+        self.version += 1
+        self.changelog.append((self.version, job_id, before, after))
+
+    @property
+    def token(self) -> str:
+        """Get the token of the current version."""
+        return f"{self.epoch}-{self.version}"
+
+    def changes_since(self, token: str | None) -> JobChanges:
+        """Get the jobs changed since a version token, costs O(changes)."""
+        epoch, _, version = (token or "").partition("-")
+        since = int(version) if version.isdigit() else -1
+        oldest = self.changelog[0][0] if self.changelog else self.version + 1
+        if epoch != self.epoch or not 0 <= since <= self.version or oldest > since + 1:
+            return JobChanges(version=self.token, reset=True)
+
+        # The first state before and the last state after the token, by job.
+        transitions: dict[str, tuple[str | None, str | None]] = {}
+        for change_version, job_id, before, after in reversed(self.changelog):
+            if change_version <= since:
+                break
+            last = transitions.get(job_id, (None, after))[1]
+            transitions[job_id] = (before, last)
+
+        changes = JobChanges(version=self.token)
+        delta = Counter[str]()
+        for job_id, (before, after) in transitions.items():
+            if before is not None:
+                delta[before] -= 1
+            if after is not None:
+                delta[after] += 1
+            if after is None:
+                if before is not None:
+                    changes.removed.append(job_id)
+            elif before is None:
+                changes.created.append(self.jobs[job_id])
+            else:
+                changes.updated.append(self.jobs[job_id])
+        changes.statistics_delta = Statistics(
+            total=delta.total(),
+            completed=delta[JobStatus.complete.value] + delta[FAILED],
+            in_progress=delta[JobStatus.in_progress.value],
+            queued=delta[JobStatus.queued.value],
+            failed=delta[FAILED],
+        )
+        return changes
+
+    def add_kwargs(self, job: Job) -> None:
+        """Index a job under the values of its indexed keyword arguments."""
+        for item in job.indexed_kwargs.items():
+            self.kwargs[item].add(job.id)
+
+    def remove_kwargs(self, job: Job) -> None:
+        """Stop indexing a job under the values of its indexed keyword arguments."""
+        for item in job.indexed_kwargs.items():
+            ids = self.kwargs[item]
+            ids.discard(job.id)
+            if not ids:
+                del self.kwargs[item]
+
+    def find_by_kwargs(self, kwargs: tuple[tuple[str, str], ...]) -> list[Job]:
+        """Get the jobs having all these keyword argument values, costs O(matches)."""
+        matches = [self.kwargs.get(item, set()) for item in kwargs]
+        if not matches:
+            return []
+        # Intersect starting from the smallest set, the others are only probed.
+        matches.sort(key=len)
+        ids = matches[0].intersection(*matches[1:])
+        return [self.jobs[job_id] for job_id in ids]
+
+    def add_failure(self, job: Job) -> None:
+        """Count a failed job under its error signature."""
+        if job_state(job) != FAILED or job.error_signature is None:
+            return
+        key = (job.function, job.error_signature)
+        group = self.failures.get(key)
+        if group is None:
+            group = self.failures[key] = FailureGroup(job.error_signature, job.function)
+        group.add(job.id, job.finish_time)
+
+    def remove_failure(self, job: Job) -> None:
+        """Stop counting a failed job under its error signature."""
+        if job_state(job) != FAILED or job.error_signature is None:
+            return
+        key = (job.function, job.error_signature)
+        group = self.failures[key]
+        group.remove(job.id)
+        if group.count == 0:
+            del self.failures[key]
+
+    def failures_info(self) -> FailuresInfo:
+        """Get the failed jobs grouped by error signature, costs O(number of signatures)."""
+        return FailuresInfo(
+            total=sum(group.count for group in self.failures.values()),
+            signatures=[
+                group.to_schema()
+                for group in sorted(self.failures.values(), key=lambda group: -group.count)
+            ],
+        )
+
+    def observe_completion(self, job: Job) -> None:
+        """Record the duration and the completion of a job seen complete for the first time."""
+        if job.status != JobStatus.complete:
+            return
+        if job.execution_duration is not None:
+            job_duration_histogram.observe(job.execution_duration, function=job.function)
+        if job.finish_time is not None:
+            for function in (job.function, None):
+                self.completions[function].add(job.finish_time)
+
+    def forecast(self, warning: float, critical: float, now: datetime | None = None) -> Forecast:
+        """Estimate when the queued backlog is drained, overall and for every function.
+
+        Costs O(number of functions): the rates are maintained as the jobs are indexed.
+        """
+        now = now or datetime.now(UTC)
+        functions = [
+            forecast_backlog(
+                function,
+                self.function_state_counts[function, JobStatus.queued.value],
+                self.arrivals[function].rate(now),
+                self.completions[function].rate(now),
+                warning,
+                critical,
+            )
+            for function in {
+                function for (function, _), count in self.function_state_counts.items() if count
+            }
+        ]
+        overall = forecast_backlog(
+            None,
+            self.state_counts[JobStatus.queued.value],
+            self.arrivals[None].rate(now),
+            self.completions[None].rate(now),
+            warning,
+            critical,
+        )
+        return Forecast(
+            overall=overall,
+            functions=sorted(functions, key=drain_seconds_value, reverse=True),
+        )
+
+    @property
+    def age(self) -> float | None:
+        """Get seconds since the last refresh, ``None`` if never refreshed."""
+        if self.updated_at is None:
+            return None
+        return time.time() - self.updated_at
@@ -0,0 +1,58 @@
+import asyncio
+import contextlib
+import logging
+from collections.abc import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+Refresh = Callable[[], Awaitable[object]]
+
+
+class JobRefresher:
+    """Refreshes the job index in the background while clients read it.
+
+    A read only counts a poll and is answered from the index as it is. Every
+    ``interval`` seconds the index is refreshed if it was polled since the last refresh,
+    so Redis is scanned at a bounded pace whatever the number of readers, and not at all
+    when nobody reads.
+    """
+
+    def __init__(self, interval: float = 10.0) -> None:
+        self.interval = interval
+        self.polls = 0
+        self.refreshed_polls = 0
+        self._task: asyncio.Task[None] | None = None
+
+    def poll(self) -> None:
+        """Record that a client read the index."""
+        self.polls += 1
+
+    async def tick(self, refresh: Refresh) -> bool:
+        """Refresh the index if it was polled since the last refresh."""
+        if self.polls == self.refreshed_polls:
+            return False
+        # Polls arriving during the refresh ask for the next one.
+        self.refreshed_polls = self.polls
+        try:
+            await refresh()
+        except Exception:
+            logger.exception("Failed to refresh the job index.")
+        return True
+
+    async def _run(self, refresh: Refresh) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.tick(refresh)
+
+    def start(self, refresh: Refresh) -> None:
+        """Start refreshing the index, unless the interval is 0."""
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.create_task(self._run(refresh))
+
+    async def stop(self) -> None:
+        """Stop refreshing the index."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
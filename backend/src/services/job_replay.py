@@ -0,0 +1,178 @@
+import asyncio
+import base64
+import contextlib
+import gzip
+import heapq
+import itertools
+import json
+import logging
+from collections import Counter
+from collections.abc import Callable, Iterator
+from datetime import UTC, datetime, timedelta
+from typing import IO, Any
+
+import arq.jobs
+from core.serializers import JobDecoder
+from schemas.job import Job
+
+logger = logging.getLogger(__name__)
+
+CAPTURE_FORMAT = "arq-ui-jobs"
+CAPTURE_VERSION = 1
+
+BuildJob = Callable[[str, arq.jobs.JobStatus, arq.jobs.JobDef | None], Job | None]
+
+
+def open_capture(path: str, mode: str = "rt") -> IO[Any]:
+    """Open a capture file, compressed with gzip if its name ends with ``.gz``."""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode, encoding="utf-8")
+    return open(path, mode, encoding="utf-8")  # noqa: PTH123, SIM115
+
+
+def capture_header(serializer: str, captured_at: datetime) -> str:
+    """Get the first line of a capture file."""
+    return json.dumps(
+        {
+            "format": CAPTURE_FORMAT,
+            "version": CAPTURE_VERSION,
+            "serializer": serializer,
+            "captured_at": captured_at.isoformat(),
+        },
+    )
+
+
+def capture_line(job_id: str, status: arq.jobs.JobStatus, raw: bytes) -> str:
+    """Get the line of a job: its id, its status and its raw job definition or result."""
+    return json.dumps(
+        {"id": job_id, "status": status.value, "payload": base64.b64encode(raw).decode()},
+    )
+
+
+def read_capture_lines(lines: Iterator[str], size: int) -> list[tuple[str, str, bytes]]:
+    """Read the next ``size`` jobs of a capture file."""
+    batch = []
+    for line in itertools.islice(lines, size):
+        entry = json.loads(line)
+        batch.append((entry["id"], entry["status"], base64.b64decode(entry["payload"])))
+    return batch
+
+
+class JobReplay:
+    """Jobs loaded from a capture file, browsed without a live Redis.
+
+    The file written by ``tools/capture_jobs.py`` is read in batches, which are decoded
+    and built into jobs by the same code as the jobs fetched from Redis. Only the
+    ``max_jobs`` most recently enqueued jobs are kept, so a capture of any size is
+    loaded in bounded memory; every job is counted in ``status_counts`` though. Jobs
+    are looked up by id among the kept ones only, never in Redis. With ``shift_times``
+    the job times are moved forward by the time elapsed since the capture, so that the
+    time-based views show the jobs as they were then.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        decoder: JobDecoder,
+        max_jobs: int = 50000,
+        batch_size: int = 500,
+        shift_times: bool = True,  # noqa: FBT001, FBT002
+    ) -> None:
+        self.path = path
+        self.decoder = decoder
+        self.max_jobs = max_jobs
+        self.batch_size = batch_size
+        self.shift_times = shift_times
+        self.captured_at: datetime | None = None
+        self.time_shift = timedelta(0)
+        self.status_counts: Counter[str] = Counter()
+        self.jobs: list[Job] | None = None
+        self.jobs_by_id: dict[str, Job] = {}
+        self.error: str | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    async def load(self, build_job: BuildJob) -> None:
+        """Read the capture file, keeping the most recent jobs."""
+        retained: list[tuple[datetime, int, Job]] = []
+        counter = itertools.count()
+        with open_capture(self.path) as file:
+            header = json.loads(await asyncio.to_thread(file.readline))
+            if header.get("format") != CAPTURE_FORMAT:
+                raise ValueError(f"{self.path} isn't a capture of arq jobs.")
+            if header["serializer"] != self.decoder.serializer:
+                raise ValueError(
+                    f"Jobs of {self.path} were serialized with '{header['serializer']}',"
+                    f" the configured serializer is '{self.decoder.serializer}'.",
+                )
+            self.captured_at = datetime.fromisoformat(header["captured_at"])
+            if self.shift_times:
+                self.time_shift = datetime.now(UTC) - self.captured_at
+
+            while batch := await asyncio.to_thread(read_capture_lines, file, self.batch_size):
+                decoded_jobs = await self.decoder.decode_many(
+                    [
+                        (raw, status == arq.jobs.JobStatus.complete.value)
+                        for _, status, raw in batch
+                    ],
+                )
+                for (job_id, status, _), decoded in zip(batch, decoded_jobs, strict=True):
+                    job = build_job(job_id, arq.jobs.JobStatus(status), decoded)
+                    if job is None:
+                        continue
+                    self.status_counts[job.status.value] += 1
+                    entry = (job.enqueue_time, next(counter), job)
+                    if len(retained) < self.max_jobs:
+                        heapq.heappush(retained, entry)
+                    elif entry > retained[0]:
+                        heapq.heapreplace(retained, entry)
+
+        self.jobs = [self.shift(job) for _, _, job in retained]
+        self.jobs_by_id = {job.id: job for job in self.jobs}
+        logger.info(
+            f"Loaded {len(self.jobs)} of {self.status_counts.total()} jobs captured at"
+            f" {self.captured_at} from {self.path}.",
+        )
+
+    def shift(self, job: Job) -> Job:
+        """Move the times of a job by the time shift."""
+        if not self.time_shift:
+            return job
+        return job.model_copy(
+            update={
+                name: value + self.time_shift
+                for name in ("enqueue_time", "start_time", "finish_time")
+                if (value := getattr(job, name)) is not None
+            },
+        )
+
+    def start(self, build_job: BuildJob) -> None:
+        """Start loading the capture file."""
+        if self._task is None:
+            self._task = asyncio.create_task(self.load(build_job))
+            self._task.add_done_callback(self.loaded)
+
+    def loaded(self, task: asyncio.Task[None]) -> None:
+        """Record why the capture file couldn't be loaded, if it couldn't."""
+        if task.cancelled() or task.exception() is None:
+            return
+        self.error = f"Failed to load the capture file {self.path}: {task.exception()!r}"
+        logger.error(self.error, exc_info=task.exception())
+
+    async def get_jobs(self) -> list[Job] | None:
+        """Get the loaded jobs, waiting for the capture file to be read."""
+        if self._task is not None:
+            await asyncio.shield(self._task)
+        return self.jobs
+
+    async def get_job(self, job_id: str) -> Job | None:
+        """Get a loaded job by id, waiting for the capture file to be read."""
+        await self.get_jobs()
+        return self.jobs_by_id.get(job_id)
+
+    async def stop(self) -> None:
+        """Stop loading the capture file."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+        self._task = None
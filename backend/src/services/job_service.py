@@ -1,221 +1,442 @@
 import asyncio
+import itertools
 import logging
+import time
+from collections.abc import AsyncIterator
 from datetime import UTC, datetime, timedelta
-from zoneinfo import ZoneInfo
+from typing import TYPE_CHECKING, Any
 
 import arq
 import arq.constants
 import arq.jobs
-from arq import create_pool
-from arq.connections import RedisSettings
-from arq.jobs import DeserializationError
 from arq.jobs import Job as ArqJob
+from arq.utils import timestamp_ms
 from core.cache import LRUCache
 from core.config import Settings, get_app_settings
-from schemas.job import ColorStatistics, Job, JobCreate, JobStatus, JobsTimeStatistics
-
+from core.executor import CpuExecutor
+from core.helpers import to_utc
+from core.limiter import AdaptiveLimiter
+from core.metrics import cache_requests_counter, redis_fetch_histogram
+from core.rate_limit import TokenBucket
+from core.redis_pool import RedisPool
+from core.serializers import JobDecoder
+from core.timing import phase
+from schemas.cleanup import CleanupProgress, CleanupRequest
+from schemas.job import Job, JobCreate, JobStatus, JobsTimeStatistics, Statistics
+from services.failures import error_signature
+from services.job_index import JobIndex
+from services.job_replay import JobReplay
+
+if TYPE_CHECKING:
+    from services.job_snapshot import JobSnapshot
+
+logger = logging.getLogger(__name__)
 settings: Settings = get_app_settings()
 
 
+def indexed_kwargs(kwargs: dict[str, Any] | None) -> dict[str, str]:
+    """Extract the values of the indexed keyword arguments of a job, as strings."""
+    if not kwargs:
+        return {}
+    return {name: str(kwargs[name]) for name in settings.indexed_kwargs if name in kwargs}
+
+
+def recent_jobs(jobs: list[Job]) -> list[Job]:
+    """Keep the jobs enqueued or started during the last hour."""
+    one_hour_ago = datetime.now(UTC) - timedelta(hours=1)
+    return [
+        job
+        for job in jobs
+        if job.enqueue_time >= one_hour_ago
+        or (job.start_time and job.start_time >= one_hour_ago)
+    ]
+
+
+def build_job(
+    job_id: str,
+    status: arq.jobs.JobStatus,
+    decoded: arq.jobs.JobDef | None,
+) -> Job | None:
+    """Build the job schema from a decoded job definition or job result."""
+    if decoded is None:
+        logger.error(f"Error deserializing job {job_id}")
+        return None
+
+    if isinstance(decoded, arq.jobs.JobResult):
+        return Job(
+            id=job_id,
+            enqueue_time=to_utc(decoded.enqueue_time),
+            status=status.value,
+            function=decoded.function,
+            args=decoded.args,
+            kwargs=str(decoded.kwargs) if decoded.kwargs else None,
+            indexed_kwargs=indexed_kwargs(decoded.kwargs),
+            job_try=decoded.job_try,
+            result=str(decoded.result) if decoded.result else None,
+            error_signature=None if decoded.success else error_signature(decoded.result),
+            success=decoded.success,
+            start_time=to_utc(decoded.start_time),
+            finish_time=to_utc(decoded.finish_time),
+            queue_name=decoded.queue_name,
+            execution_duration=float(
+                (decoded.finish_time - decoded.start_time).total_seconds(),
+            ),
+        )
+
+    return Job(
+        id=job_id,
+        enqueue_time=to_utc(decoded.enqueue_time),
+        status=status.value,
+        function=decoded.function,
+        args=decoded.args,
+        kwargs=str(decoded.kwargs) if decoded.kwargs else None,
+        indexed_kwargs=indexed_kwargs(decoded.kwargs),
+        job_try=decoded.job_try,
+    )
+
+
+def build_jobs(
+    fetched: list[tuple[str, arq.jobs.JobStatus, bytes | None]],
+    decoded_jobs: list[arq.jobs.JobDef | None],
+) -> list[tuple[str, arq.jobs.JobStatus, Job]]:
+    """Build the job schemas of a batch of decoded payloads, skipping undecodable ones.
+
+    Module level so that it can be sent to a process executor.
+    """
+    built = []
+    for (job_id, status, _), decoded in zip(fetched, decoded_jobs, strict=True):
+        job = build_job(job_id, status, decoded)
+        if job is not None:
+            built.append((job_id, status, job))
+    return built
+
+
 class JobService:
     """Service class for interacting with Arq jobs."""
 
     def __init__(
         self,
-        redis_settings: RedisSettings,
+        redis_pool: RedisPool,
         cache: LRUCache,
-        request_semaphore_jobs: int = 5,
+        decoder: JobDecoder,
+        index: JobIndex | None = None,
+        snapshot: "JobSnapshot | JobReplay | None" = None,
+        limiter: AdaptiveLimiter | None = None,
+        executor: CpuExecutor | None = None,
     ) -> None:
-        self.redis_settings = redis_settings
+        self.redis_pool = redis_pool
         self.cache = cache
-        self.request_semaphore_jobs = request_semaphore_jobs
+        self.decoder = decoder
+        self.index = index
+        self.snapshot = snapshot
+        self.limiter = limiter or AdaptiveLimiter(settings.request_semaphore_jobs)
+        self.executor = executor or CpuExecutor("inline")
         self.logger = logging.getLogger(__name__)
 
+    @property
+    def replay(self) -> JobReplay | None:
+        """Get the capture file the jobs are replayed from, instead of Redis."""
+        return self.snapshot if isinstance(self.snapshot, JobReplay) else None
+
     async def get_status(self) -> dict[str, str]:
         """Get status redis."""
-        redis = await create_pool(self.redis_settings)
+        if self.replay is not None:
+            return {"jobs_len": str(self.replay.status_counts.total())}
+        if self.index is not None and self.index.age is not None:
+            # Counted by the index as jobs are added and removed, instead of scanning.
+            return {
+                "jobs_len": str(len(self.index.jobs)),
+                "jobs_len_age": f"{self.index.age:.1f}",
+            }
+        redis = await self.redis_pool.get()
         keys_queued = await redis.keys(arq.constants.job_key_prefix + "*")
         keys_results = await redis.keys(arq.constants.result_key_prefix + "*")
 
         processed_keys = keys_queued + keys_results
         return {"jobs_len": str(len(processed_keys))}
 
-    async def fetch_job_info(
+    async def fetch_jobs_raw(
         self,
-        semaphore: asyncio.Semaphore,
         redis: arq.ArqRedis,
-        key_id: str,
-    ) -> Job | None:
-        """Fetch job information."""
-        cached_result = self.cache.get(key_id)
-        if cached_result:
-            return cached_result
+        job_ids: list[str],
+    ) -> list[tuple[arq.jobs.JobStatus, bytes | None]]:
+        """Fetch status and the raw job definition or job result of jobs in one round-trip.
+
+        This is the same probe as ``arq.jobs.Job.status`` followed by a ``GET``,
+        but pipelined for many jobs at once.
+        """
+        async with redis.pipeline(transaction=False) as pipe:
+            for job_id in job_ids:
+                pipe.get(arq.constants.result_key_prefix + job_id)
+                pipe.exists(arq.constants.in_progress_key_prefix + job_id)
+                pipe.zscore(settings.queue_name, job_id)
+                pipe.get(arq.constants.job_key_prefix + job_id)
+            started = time.perf_counter()
+            replies = await pipe.execute()
+            redis_fetch_histogram.observe(time.perf_counter() - started, operation="pipeline")
+
+        now = timestamp_ms()
+        raw_jobs: list[tuple[arq.jobs.JobStatus, bytes | None]] = []
+        for index in range(0, len(replies), 4):
+            result_raw, is_in_progress, score, job_raw = replies[index : index + 4]
+            if result_raw is not None:
+                raw_jobs.append((arq.jobs.JobStatus.complete, result_raw))
+            elif is_in_progress:
+                raw_jobs.append((arq.jobs.JobStatus.in_progress, job_raw))
+            elif score:
+                status = arq.jobs.JobStatus.deferred if score > now else arq.jobs.JobStatus.queued
+                raw_jobs.append((status, job_raw))
+            else:
+                raw_jobs.append((arq.jobs.JobStatus.not_found, job_raw))
+        return raw_jobs
+
+    def strip_key_prefix(self, key_id: str) -> str:
+        """Get the job id from a job or result key."""
+        return key_id.replace(arq.constants.job_key_prefix, "").replace(
+            arq.constants.result_key_prefix,
+            "",
+        )
 
-        async with semaphore:
-            key_id_without_prefix = key_id.replace(arq.constants.job_key_prefix, "").replace(
-                arq.constants.result_key_prefix,
-                "",
+    async def fetch_jobs(self, redis: arq.ArqRedis, job_ids: list[str]) -> list[Job]:
+        """Fetch jobs, using the cache for completed jobs.
+
+        Jobs are cached under their id, whichever key they were found through.
+        """
+        jobs: list[Job] = []
+        uncached_ids: list[str] = []
+        for job_id in job_ids:
+            cached_result = self.cache.get(job_id)
+            if cached_result:
+                jobs.append(cached_result)
+            else:
+                uncached_ids.append(job_id)
+        cache_requests_counter.inc(len(jobs), cache="job", result="hit")
+        cache_requests_counter.inc(len(uncached_ids), cache="job", result="miss")
+
+        async def fetch_batch(batch: list[str]) -> list[tuple[arq.jobs.JobStatus, bytes | None]]:
+            async with self.limiter.acquire():
+                return await self.fetch_jobs_raw(redis, batch)
+
+        batch_size = settings.fetch_batch_size
+        with phase("redis_fetch"):
+            batches = await asyncio.gather(
+                *[
+                    fetch_batch(uncached_ids[start : start + batch_size])
+                    for start in range(0, len(uncached_ids), batch_size)
+                ],
+            )
+        # Fetch all raw payloads first, so that they can be decoded in a single batch.
+        fetched = [
+            (job_id, status, redis_raw)
+            for job_id, (status, redis_raw) in zip(
+                uncached_ids,
+                itertools.chain.from_iterable(batches),
+                strict=True,
+            )
+            if redis_raw is not None
+        ]
+        with phase("decode"):
+            decoded_jobs = await self.decoder.decode_many(
+                [
+                    (redis_raw, status == arq.jobs.JobStatus.complete)
+                    for _, status, redis_raw in fetched
+                ],
             )
 
-            arq_job = ArqJob(key_id_without_prefix, redis, _queue_name=settings.queue_name)
-            status = await arq_job.status()
-
+        with phase("build"):
+            built = await self.executor.run(build_jobs, fetched, decoded_jobs)
+        for job_id, status, job_schema in built:
             if status == arq.jobs.JobStatus.complete:
-                complete_key: str = arq.constants.result_key_prefix + key_id_without_prefix
-                redis_raw = await redis.get(complete_key)
-                try:
-                    job_result: arq.jobs.JobResult = arq.jobs.deserialize_result(redis_raw)
-                except DeserializationError:
-                    self.logger.exception("Error deserializing job result")
-                    return None
-
-                job_schema = Job(
-                    id=key_id_without_prefix,
-                    enqueue_time=job_result.enqueue_time,
-                    status=status.value,
-                    function=job_result.function,
-                    args=job_result.args,
-                    kwargs=str(job_result.kwargs) if job_result.kwargs else None,
-                    job_try=job_result.job_try,
-                    result=str(job_result.result) if job_result.result else None,
-                    success=job_result.success,
-                    start_time=job_result.start_time.replace(tzinfo=ZoneInfo(settings.timezone)),
-                    finish_time=job_result.finish_time.replace(tzinfo=ZoneInfo(settings.timezone)),
-                    queue_name=job_result.queue_name,
-                    execution_duration=float(
-                        (job_result.finish_time - job_result.start_time).total_seconds(),
-                    ),
-                )
                 # Cache only completed jobs
-                self.cache.set(key_id, job_schema)
+                self.cache.set(job_id, job_schema)
+            jobs.append(job_schema)
+        return jobs
+
+    async def scan_jobs(self, max_jobs: int = 50000) -> list[Job]:
+        """Find all jobs in Redis and fetch them."""
+        redis = await self.redis_pool.get()
+        return await self.fetch_jobs(redis, await self.scan_job_ids(max_jobs))
+
+    async def scan_job_ids(self, max_jobs: int = 50000) -> list[str]:
+        """Find the ids of all jobs in Redis."""
+        redis = await self.redis_pool.get()
+        started = time.perf_counter()
+        with phase("redis_keys"):
+            keys_queued = await redis.keys(arq.constants.job_key_prefix + "*")
+            keys_results = await redis.keys(arq.constants.result_key_prefix + "*")
+        redis_fetch_histogram.observe(time.perf_counter() - started, operation="keys")
+
+        # A job can have both keys for a moment while it is being finished.
+        job_ids = list(
+            dict.fromkeys(
+                self.strip_key_prefix(key.decode()) for key in keys_queued + keys_results
+            ),
+        )
 
-            else:
-                keys_queued_job = arq.constants.job_key_prefix + key_id_without_prefix
-                redis_raw = await redis.get(keys_queued_job)
-                job: arq.jobs.JobDef = arq.jobs.deserialize_job(redis_raw)
-                job_schema = Job(
-                    id=key_id_without_prefix,
-                    enqueue_time=job.enqueue_time.replace(tzinfo=ZoneInfo(settings.timezone)),
-                    status=status.value,
-                    function=job.function,
-                    args=job.args,
-                    kwargs=str(job.kwargs) if job.kwargs else None,
-                    job_try=job.job_try,
-                )
-            return job_schema
+        if len(job_ids) > max_jobs:
+            raise ValueError(f"There are too many tasks in Redis (max {max_jobs}), I won't work.")
+        return job_ids
 
     async def get_all_jobs(self, max_jobs: int = 50000) -> list[Job]:
-        """Get all jobs."""
-        redis = await create_pool(self.redis_settings)
-        keys_queued = await redis.keys(arq.constants.job_key_prefix + "*")
-        keys_results = await redis.keys(arq.constants.result_key_prefix + "*")
-
-        processed_keys = [key.decode() for key in keys_queued + keys_results]
-
-        if len(processed_keys) > max_jobs:
-            raise ValueError(f"There are too many tasks in Redis (max {max_jobs}), I won't work.")
+        """Get all jobs, from the shared snapshot if there is a fresh one, or the replay."""
+        jobs = None
+        if self.snapshot is not None:
+            with phase("snapshot"):
+                jobs = await self.snapshot.get_jobs()
+        if jobs is None:
+            jobs = await self.scan_jobs(max_jobs)
+
+        if self.index is not None:
+            with phase("index"):
+                await self.index.refresh(jobs, self.executor)
+
+        return await self.executor.run(recent_jobs, jobs)
+
+    @property
+    def server_side_statistics(self) -> bool:
+        """Check whether statistics are counted by a Lua script inside Redis."""
+        if not settings.server_side_statistics or self.replay is not None:
+            return False
+        # The Lua summary is opt-in, it is only imported when enabled.
+        from services.job_summary import LUA_SERIALIZERS  # noqa: PLC0415
+
+        return settings.job_serializer in LUA_SERIALIZERS
+
+    async def get_statistics_summary(self) -> tuple[Statistics, list[JobsTimeStatistics]]:
+        """Count the jobs of the last hour inside Redis, without fetching them."""
+        from services.job_summary import summarize_jobs  # noqa: PLC0415
+
+        redis = await self.redis_pool.get()
+        with phase("redis_summary"):
+            return await summarize_jobs(redis, settings.job_serializer, settings.queue_name)
+
+    async def get_jobs_by_ids(self, job_ids: list[str]) -> list[Job]:
+        """Get jobs by ids, without scanning Redis."""
+        if self.replay is not None:
+            jobs = [await self.replay.get_job(job_id) for job_id in dict.fromkeys(job_ids)]
+            return [job for job in jobs if job is not None]
+        redis = await self.redis_pool.get()
+        return await self.fetch_jobs(redis, list(dict.fromkeys(job_ids)))
+
+    async def get_job_by_id(
+        self,
+        job_id: str,
+        status: JobStatus | None = None,
+    ) -> Job | None:
+        """Get job by id.
 
-        semaphore = asyncio.Semaphore(self.request_semaphore_jobs)
+        If the caller knows that the job is complete, its result is read directly
+        instead of probing the job status first.
+        """
+        if self.replay is not None:
+            # Only the captured jobs exist, the live Redis may hold anything.
+            return await self.replay.get_job(job_id)
 
-        tasks = [self.fetch_job_info(semaphore, redis, key_id) for key_id in processed_keys]
-        jobs_task = await asyncio.gather(*tasks)
-        jobs: list[Job] = [job for job in jobs_task if job is not None]
+        cached_result = self.cache.get(job_id)
+        if cached_result:
+            return cached_result
 
-        one_hour_ago = datetime.now(UTC) - timedelta(hours=1)
-        return [
-            job
-            for job in jobs
-            if job.enqueue_time >= one_hour_ago
-            or (job.start_time and job.start_time >= one_hour_ago)
-        ]
+        redis = await self.redis_pool.get()
+        if status == JobStatus.complete:
+            async with self.limiter.acquire():
+                redis_raw = await redis.get(arq.constants.result_key_prefix + job_id)
+            if redis_raw is not None:
+                job_schema = build_job(
+                    job_id,
+                    arq.jobs.JobStatus.complete,
+                    self.decoder.decode(redis_raw, is_result=True),
+                )
+                if job_schema:
+                    self.cache.set(job_id, job_schema)
+                return job_schema
 
-    async def get_job_by_id(self, job_id: str) -> Job | None:
-        """Get job by id."""
-        redis = await create_pool(self.redis_settings)
-        key_id = arq.constants.job_key_prefix + job_id
-        return await self.fetch_job_info(
-            asyncio.Semaphore(self.request_semaphore_jobs),
-            redis,
-            key_id,
-        )
+        jobs = await self.fetch_jobs(redis, [job_id])
+        return jobs[0] if jobs else None
 
     async def abort_job(self, job_id: str) -> bool:
         """Abort job."""
-        redis = await create_pool(self.redis_settings)
+        redis = await self.redis_pool.get()
         job: ArqJob = ArqJob(job_id, redis, _queue_name=settings.queue_name)
         return await job.abort()
 
-    def adjust_color_intensity(self, color_intensity: float) -> float:
-        """Adjust color intensity."""
-        if color_intensity < 0.4:  # noqa: PLR2004
-            return 0.3
-        if color_intensity < 0.6:  # noqa: PLR2004
-            return 0.5
-        if color_intensity < 0.8:  # noqa: PLR2004
-            return 0.7
-
-        return 1.0
-
-    def generate_statistics(self, jobs_list: list[Job]) -> list[JobsTimeStatistics]:  # noqa: PLR0912, C901
-        """Generate statistics for jobs."""
-        # TODO: This function is too complex. It should be refactored.
-        max_time_diff = 60
-        now_fixed = datetime.now(UTC).replace(second=0, microsecond=0)
-
-        one_hour_ago = now_fixed - timedelta(hours=1) + timedelta(minutes=1)
-        current_minute = (now_fixed - one_hour_ago).total_seconds() // max_time_diff
-
-        statistics = [
-            JobsTimeStatistics(date=(one_hour_ago + timedelta(minutes=i)))
-            for i in range(max_time_diff)
-        ]
-        for job in jobs_list:
-            created_diff = (job.enqueue_time - one_hour_ago).total_seconds() // max_time_diff
-            if 0 <= created_diff < max_time_diff:
-                statistics[int(created_diff)].total_created += 1
-
-            if job.status == JobStatus.in_progress and job.start_time:
-                start_diff = int((job.start_time - one_hour_ago).total_seconds() // max_time_diff)
-                for i in range(start_diff, min(int(current_minute) + 1, max_time_diff)):
-                    statistics[i].total_in_progress += 1
-
-            if job.status == JobStatus.complete and job.start_time and job.finish_time:
-                start_diff = int((job.start_time - one_hour_ago).total_seconds() // max_time_diff)
-                finish_diff = int(
-                    (job.finish_time - one_hour_ago).total_seconds() // max_time_diff,
-                )
-                for i in range(start_diff, min(finish_diff + 1, max_time_diff)):
-                    statistics[i].total_in_progress += 1
-                if finish_diff < max_time_diff:
-                    if job.success:
-                        statistics[finish_diff].total_completed_successfully += 1
-                    else:
-                        statistics[finish_diff].total_failed += 1
-
-        max_jobs = max(
-            stat.total_completed_successfully + stat.total_in_progress for stat in statistics
+    def is_expired_result(self, decoded: arq.jobs.JobDef | None, request: CleanupRequest) -> bool:
+        """Check whether a decoded result is old enough to be deleted."""
+        if not isinstance(decoded, arq.jobs.JobResult):
+            return False
+        age = (datetime.now(UTC) - to_utc(decoded.finish_time)).total_seconds()
+        if age > request.older_than:
+            return True
+        return (
+            not decoded.success
+            and request.failed_older_than is not None
+            and age > request.failed_older_than
         )
 
-        for stat in statistics:
-            current_jobs = stat.total_completed_successfully + stat.total_in_progress
-            color_intensity = round(current_jobs / max_jobs, 1) if max_jobs > 0 else 1.0
-            stat.color_intensity = self.adjust_color_intensity(color_intensity)
-
-            if stat.total_completed_successfully == 0 and stat.total_failed == 0:
-                stat.color = ColorStatistics.gray
-                stat.color_intensity = 1
-            elif stat.total_failed == 0 and stat.total_completed_successfully > 0:
-                stat.color = ColorStatistics.green
-            elif stat.total_completed_successfully == 0 and stat.total_failed > 0:
-                stat.color = ColorStatistics.red
-            else:
-                stat.color = ColorStatistics.orange
-
-        return statistics
+    async def cleanup_results(self, request: CleanupRequest) -> AsyncIterator[CleanupProgress]:
+        """Delete old job results, yielding the progress after every batch.
+
+        Results are found with ``SCAN``, read with pipelined ``TTL`` and ``GET`` and
+        deleted with ``UNLINK``, which frees the memory in the background. Every key read
+        or deleted counts as a command, and no more than ``max_commands_per_second`` are
+        sent, so that the workers sharing Redis aren't slowed down.
+        """
+        redis = await self.redis_pool.get()
+        rate = min(
+            request.max_commands_per_second or settings.cleanup_max_commands_per_second,
+            settings.cleanup_max_commands_per_second,
+        )
+        bucket = TokenBucket(rate)
+        progress = CleanupProgress(dry_run=request.dry_run)
+        started = time.perf_counter()
+
+        cursor = 0
+        while True:
+            await bucket.acquire(1)
+            cursor, keys = await redis.scan(
+                cursor,
+                match=arq.constants.result_key_prefix + "*",
+                count=request.batch_size,
+            )
+            progress.commands += 1
+            if keys:
+                await bucket.acquire(2 * len(keys))
+                async with self.limiter.acquire(), redis.pipeline(transaction=False) as pipe:
+                    for key in keys:
+                        pipe.ttl(key)
+                        pipe.get(key)
+                    replies = await pipe.execute()
+                progress.commands += 2 * len(keys)
+
+                found = [
+                    (key, raw)
+                    for key, raw in zip(keys, replies[1::2], strict=True)
+                    if raw is not None
+                ]
+                decoded_results = await self.decoder.decode_many([(raw, True) for _, raw in found])
+                expired = [
+                    key
+                    for (key, _), decoded in zip(found, decoded_results, strict=True)
+                    if self.is_expired_result(decoded, request)
+                ]
+                progress.scanned += len(keys)
+                progress.without_ttl += sum(ttl == -1 for ttl in replies[0::2])
+                progress.matched += len(expired)
+
+                if expired and not request.dry_run:
+                    await bucket.acquire(len(expired))
+                    async with self.limiter.acquire():
+                        progress.deleted += await redis.unlink(*expired)
+                    progress.commands += len(expired)
+
+            progress.done = cursor == 0
+            progress.elapsed = time.perf_counter() - started
+            yield progress.model_copy()
+            if progress.done:
+                break
 
     async def create_job(self, new_job: JobCreate) -> Job | None:
         """Create a new job."""
-        redis = await create_pool(self.redis_settings)
+        redis = await self.redis_pool.get()
         await redis.enqueue_job(
             new_job.function,
             *new_job.args,
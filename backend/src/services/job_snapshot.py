@@ -0,0 +1,233 @@
+import asyncio
+import contextlib
+import fcntl
+import logging
+import mmap
+import operator
+import os
+import pickle
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+from core.executor import CpuExecutor
+from schemas.job import Job
+
+logger = logging.getLogger(__name__)
+
+# Seconds between two checks while waiting for a snapshot, or for a reader to ask for one.
+WAIT_STEP = 0.1
+
+
+def write_snapshot(path: str, jobs: list[Job], scan_seconds: float) -> None:
+    """Write the jobs and how long it took to scan them atomically.
+
+    Readers see either the old or the new file.
+    """
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    descriptor = os.open(temporary_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(descriptor, "wb") as file:
+        pickle.dump((scan_seconds, jobs), file, protocol=pickle.HIGHEST_PROTOCOL)
+    Path(temporary_path).replace(path)
+
+
+def read_snapshot(path: str) -> tuple[float, list[Job]]:
+    """Read the jobs and their scan duration, mapping the file instead of copying it first."""
+    with (
+        Path(path).open("rb") as file,
+        mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data,
+    ):
+        snapshot: tuple[float, list[Job]] = pickle.loads(data)  # noqa: S301
+    return snapshot
+
+
+def jobs_by_id(jobs: list[Job]) -> dict[str, Job]:
+    """Get the jobs by id, Redis returns keys in no particular order."""
+    return {job.id: job for job in jobs}
+
+
+class JobSnapshot:
+    """Job list shared by the worker processes of a multi-worker deployment.
+
+    The process holding the lock file is the leader: it scans Redis and writes the jobs to
+    ``path`` (preferably on ``/dev/shm``). Every process, the leader included, serves
+    requests from that file and loads it again only when it was replaced, so Redis is
+    scanned at most once per ``interval`` whatever the number of workers. When the leader
+    exits the lock is released and another worker takes over.
+
+    Readers touch ``<path>.polled`` to ask for a snapshot, and the leader scans only if it
+    was touched since its last scan started: an idle UI doesn't scan Redis at all. A
+    reader finding a stale snapshot waits for the leader rather than scanning Redis itself.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        interval: float = 2.0,
+        max_age: float | None = None,
+        executor: CpuExecutor | None = None,
+    ) -> None:
+        self.path = path
+        self.polled_path = f"{path}.polled"
+        self.interval = interval
+        self.configured_max_age = max_age
+        self.executor = executor
+        self.jobs: list[Job] | None = None
+        # Seconds the last scan took, as measured by the leader that wrote the snapshot.
+        self.scan_seconds: float | None = None
+        # Wall clock time the last scan of this process started at, compared to the polls.
+        self.scan_started = 0.0
+        self._polled_at: float | None = None
+        self._version: tuple[int, int] | None = None
+        self._published: dict[str, Job] | None = None
+        self._lock_descriptor: int | None = None
+        self._load_lock = asyncio.Lock()
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def max_age(self) -> float:
+        """Get the age after which a snapshot is stale, e.g. while the leader is being replaced.
+
+        A polled leader starts a scan at most an interval after the previous one ended, so
+        the bound follows the measured scan duration, with a margin for a slower scan.
+        Until a scan was measured it allows for five intervals.
+        """
+        if self.configured_max_age is not None:
+            return self.configured_max_age
+        if self.scan_seconds is None:
+            return self.interval * 5
+        return self.interval * 2 + self.scan_seconds * 3
+
+    @property
+    def is_leader(self) -> bool:
+        """Check whether this process scans Redis and writes the snapshot."""
+        return self._lock_descriptor is not None
+
+    def try_lead(self) -> bool:
+        """Try to take the leader lock without waiting for it."""
+        if self._lock_descriptor is None:
+            descriptor = os.open(f"{self.path}.lock", os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(descriptor, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(descriptor)
+                return False
+            self._lock_descriptor = descriptor
+            logger.info(f"Process {os.getpid()} is now the job snapshot leader.")
+        return True
+
+    def release(self) -> None:
+        """Give the leader lock up."""
+        if self._lock_descriptor is not None:
+            fcntl.flock(self._lock_descriptor, fcntl.LOCK_UN)
+            os.close(self._lock_descriptor)
+            self._lock_descriptor = None
+
+    async def run_in_executor(self, func: Callable[..., object], *args: object) -> object:
+        """Run file I/O and (un)pickling outside of the event loop when possible."""
+        if self.executor is None:
+            return func(*args)
+        return await self.executor.run(func, *args)
+
+    async def publish(self, jobs: list[Job], scan_seconds: float) -> None:
+        """Write the jobs, or only mark the snapshot as fresh if they didn't change."""
+        # Comparing every job is O(number of jobs), so it doesn't run on the event loop.
+        published: dict[str, Job] = await self.run_in_executor(jobs_by_id, jobs)  # type: ignore
+        if (
+            self._published is not None
+            and not await self.run_in_executor(operator.ne, published, self._published)
+            and Path(self.path).exists()  # noqa: ASYNC240
+        ):
+            os.utime(self.path)
+            return
+        await self.run_in_executor(write_snapshot, self.path, jobs, scan_seconds)
+        self._published = published
+
+    def poll(self) -> None:
+        """Ask the leader for a snapshot, touching the poll file at most twice per interval."""
+        now = time.monotonic()
+        if self._polled_at is not None and now - self._polled_at < self.interval / 2:
+            return
+        self._polled_at = now
+        Path(self.polled_path).touch()
+
+    def polled(self) -> bool:
+        """Check whether a reader asked for a snapshot since the last scan started."""
+        try:
+            return Path(self.polled_path).stat().st_mtime >= self.scan_started
+        except FileNotFoundError:
+            return False
+
+    async def get_fresh_stat(self) -> os.stat_result | None:
+        """Wait for a snapshot younger than ``max_age``, ``None`` if none came in time."""
+        deadline = time.monotonic() + self.max_age
+        while True:
+            try:
+                # A single stat call, cheaper than handing it to a thread.
+                stat = Path(self.path).stat()  # noqa: ASYNC240
+            except FileNotFoundError:
+                stat = None
+            if stat is not None and time.time() - stat.st_mtime <= self.max_age:
+                return stat
+            if time.monotonic() >= deadline:
+                return None
+            await asyncio.sleep(WAIT_STEP)
+
+    async def get_jobs(self) -> list[Job] | None:
+        """Get the jobs of the current snapshot, ``None`` if none is fresh after a wait.
+
+        The leader scanning only on demand, a snapshot is stale after a while without
+        readers: the reader then waits for the scan it asked for.
+        """
+        self.poll()
+        stat = await self.get_fresh_stat()
+        if stat is None:
+            return None
+
+        # ``write_snapshot`` replaces the file, so a new inode means new content.
+        version = (stat.st_dev, stat.st_ino)
+        if version != self._version:
+            async with self._load_lock:
+                if version != self._version:
+                    snapshot = await self.run_in_executor(read_snapshot, self.path)
+                    self.scan_seconds, self.jobs = snapshot  # type: ignore
+                    self._version = version
+        return self.jobs
+
+    async def tick(self, scan: Callable[[], Awaitable[list[Job]]]) -> bool:
+        """Scan Redis and publish the jobs if this process leads and a reader asked for them.
+
+        Returns whether it scanned.
+        """
+        if not self.try_lead() or not self.polled():
+            return False
+        self.scan_started = time.time()
+        started = time.perf_counter()
+        jobs = await scan()
+        self.scan_seconds = time.perf_counter() - started
+        await self.publish(jobs, self.scan_seconds)
+        return True
+
+    async def _run(self, scan: Callable[[], Awaitable[list[Job]]]) -> None:
+        while True:
+            scanned = False
+            try:
+                scanned = await self.tick(scan)
+            except Exception:
+                logger.exception("Failed to refresh the job snapshot.")
+            # Until a reader asks, only the poll file is checked, and often to answer quickly.
+            await asyncio.sleep(self.interval if scanned else min(WAIT_STEP, self.interval))
+
+    def start(self, scan: Callable[[], Awaitable[list[Job]]]) -> None:
+        """Start competing for the leader lock and refreshing the snapshot when leading."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(scan))
+
+    async def stop(self) -> None:
+        """Stop refreshing and release the leader lock."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        self.release()
@@ -0,0 +1,159 @@
+import time
+from datetime import UTC, datetime, timedelta
+
+import arq
+import arq.constants
+from core.metrics import redis_fetch_histogram
+from schemas.job import JobsTimeStatistics, Statistics
+from services.aggregation import color_statistics, statistics_window
+
+# Serializers Lua can decode with the libraries bundled with Redis.
+LUA_SERIALIZERS = {"msgpack", "json"}
+
+BUCKETS = 60
+# Order of the counters in the script reply, after the cursor.
+STATUS_COUNTERS = ("total", "in_progress", "completed", "queued", "failed")
+
+# Walks one SCAN page of job or result keys and counts the jobs of the last hour the way
+# ``generate_status_statistics`` and ``generate_statistics`` do, so only
+# 6 + 4 * 60 integers leave Redis instead of every payload. Keys are found with SCAN,
+# which is why the script doesn't declare them: it doesn't support Redis Cluster.
+JOB_SUMMARY_SCRIPT = """
+local cursor, pattern, count = ARGV[1], ARGV[2], ARGV[3]
+local now_ms, hour_ago_ms, window_ms = tonumber(ARGV[4]), tonumber(ARGV[5]), tonumber(ARGV[6])
+local buckets = tonumber(ARGV[7])
+local decode = ARGV[8] == 'json' and cjson.decode or cmsgpack.unpack
+local job_prefix, result_prefix, in_progress_prefix = ARGV[9], ARGV[10], ARGV[11]
+local queue_name = ARGV[12]
+
+local reply = redis.call('SCAN', cursor, 'MATCH', pattern, 'COUNT', count)
+-- cursor, total, in_progress, completed, queued, failed, then four series of buckets:
+-- created, in progress, completed successfully and failed.
+local summary = {reply[1], 0, 0, 0, 0, 0}
+for index = 1, 4 * buckets do
+    summary[6 + index] = 0
+end
+
+local function bucket(ms)
+    return math.floor((ms - window_ms) / 60000)
+end
+
+local function add(series, index)
+    if index >= 0 and index < buckets then
+        local position = 7 + series * buckets + index
+        summary[position] = summary[position] + 1
+    end
+end
+
+local function number(value)
+    if type(value) == 'number' then
+        return value
+    end
+    return nil
+end
+
+for _, key in ipairs(reply[2]) do
+    local is_result = string.sub(key, 1, #result_prefix) == result_prefix
+    local job_id = string.sub(key, #(is_result and result_prefix or job_prefix) + 1)
+    -- A job being finished has both keys for a moment, it is counted through its result.
+    if is_result or redis.call('EXISTS', result_prefix .. job_id) == 0 then
+        local raw = redis.call('GET', key)
+        local ok, job = false, nil
+        if raw then
+            ok, job = pcall(decode, raw)
+        end
+        local enqueue_ms = ok and type(job) == 'table' and number(job.et)
+        if enqueue_ms then
+            local start_ms = is_result and number(job.st)
+            local finish_ms = is_result and number(job.ft)
+            if enqueue_ms >= hour_ago_ms or (start_ms and start_ms >= hour_ago_ms) then
+                summary[2] = summary[2] + 1
+                add(0, bucket(enqueue_ms))
+                if is_result then
+                    local success = job.s == true
+                    summary[4] = summary[4] + 1
+                    if not success then
+                        summary[6] = summary[6] + 1
+                    end
+                    if start_ms and finish_ms then
+                        local finish_bucket = bucket(finish_ms)
+                        for index = math.max(bucket(start_ms), 0), finish_bucket do
+                            add(1, index)
+                        end
+                        add(success and 2 or 3, finish_bucket)
+                    end
+                elseif redis.call('EXISTS', in_progress_prefix .. job_id) == 1 then
+                    summary[3] = summary[3] + 1
+                else
+                    local score = tonumber(redis.call('ZSCORE', queue_name, job_id))
+                    if score and score <= now_ms then
+                        summary[5] = summary[5] + 1
+                    end
+                end
+            end
+        end
+    end
+end
+
+return summary
+"""
+
+
+async def summarize_jobs(
+    redis: arq.ArqRedis,
+    serializer: str,
+    queue_name: str,
+    scan_count: int = 1000,
+) -> tuple[Statistics, list[JobsTimeStatistics]]:
+    """Count the jobs of the last hour by status and by minute inside Redis."""
+    if serializer not in LUA_SERIALIZERS:
+        raise ValueError(f"Jobs serialized with '{serializer}' can't be decoded in Redis.")
+
+    script = redis.register_script(JOB_SUMMARY_SCRIPT)
+    now = datetime.now(UTC)
+    window = statistics_window(now)
+    counters = [0] * len(STATUS_COUNTERS)
+    series = [0] * 4 * BUCKETS
+
+    started = time.perf_counter()
+    for prefix in (arq.constants.job_key_prefix, arq.constants.result_key_prefix):
+        cursor = b"0"
+        while True:
+            reply = await script(
+                args=[
+                    cursor,
+                    prefix + "*",
+                    scan_count,
+                    int(now.timestamp() * 1000),
+                    int((now - timedelta(hours=1)).timestamp() * 1000),
+                    int(window.timestamp() * 1000),
+                    BUCKETS,
+                    serializer,
+                    arq.constants.job_key_prefix,
+                    arq.constants.result_key_prefix,
+                    arq.constants.in_progress_key_prefix,
+                    queue_name,
+                ],
+            )
+            cursor = reply[0]
+            counters = [total + value for total, value in zip(counters, reply[1:6], strict=True)]
+            series = [total + value for total, value in zip(series, reply[6:], strict=True)]
+            if int(cursor) == 0:
+                break
+    redis_fetch_histogram.observe(time.perf_counter() - started, operation="summary")
+
+    statistics = Statistics(**dict(zip(STATUS_COUNTERS, counters, strict=True)))
+    created, in_progress, completed, failed = (
+        series[index * BUCKETS : (index + 1) * BUCKETS] for index in range(4)
+    )
+    time_statistics = [
+        JobsTimeStatistics(
+            date=window + timedelta(minutes=minute),
+            total_created=created[minute],
+            total_in_progress=in_progress[minute],
+            total_completed_successfully=completed[minute],
+            total_failed=failed[minute],
+        )
+        for minute in range(BUCKETS)
+    ]
+    return statistics, color_statistics(time_statistics)
@@ -0,0 +1,90 @@
+import asyncio
+import contextlib
+import logging
+import time
+from enum import Enum
+
+from schemas.job import Job
+from services.job_service import JobService
+
+logger = logging.getLogger(__name__)
+
+
+class WarmupState(str, Enum):
+    """State of the loading of the jobs at startup."""
+
+    idle = "idle"
+    warming = "warming"
+    ready = "ready"
+    failed = "failed"
+
+
+class JobWarmup:
+    """Loads all jobs in the background at startup, so the first request isn't a cold scan.
+
+    The jobs are fetched ``chunk_size`` at a time and added to the job index after each
+    chunk. Until they are all loaded, the jobs requests are answered from those loaded so
+    far and flagged as partial instead of scanning Redis themselves. If the warm-up
+    fails, e.g. because Redis isn't reachable yet, requests scan Redis as before.
+    """
+
+    def __init__(self, chunk_size: int = 5000) -> None:
+        self.chunk_size = chunk_size
+        self.state = WarmupState.idle
+        self.total = 0
+        self.jobs: list[Job] = []
+        self.duration: float | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def warming(self) -> bool:
+        """Check whether the jobs are still being loaded."""
+        return self.state == WarmupState.warming
+
+    @property
+    def progress(self) -> float:
+        """Get the fraction of the jobs loaded, 1 when there is nothing to load."""
+        if self.state != WarmupState.warming:
+            return 1.0
+        return len(self.jobs) / self.total if self.total else 0.0
+
+    def loaded_jobs(self) -> list[Job]:
+        """Get the jobs loaded so far."""
+        return self.jobs
+
+    async def load(self, job_service: JobService, max_jobs: int) -> None:
+        """Fetch all jobs chunk by chunk, indexing them as they arrive."""
+        started = time.perf_counter()
+        try:
+            job_ids = await job_service.scan_job_ids(max_jobs)
+            self.total = len(job_ids)
+            redis = await job_service.redis_pool.get()
+            for start in range(0, len(job_ids), self.chunk_size):
+                chunk = job_ids[start : start + self.chunk_size]
+                # A new list, requests may be reading the previous one in the CPU executor.
+                self.jobs = self.jobs + await job_service.fetch_jobs(redis, chunk)
+                if job_service.index is not None:
+                    await job_service.index.refresh(self.jobs, job_service.executor)
+        except Exception as exc:  # noqa: BLE001
+            self.state = WarmupState.failed
+            logger.warning(f"Warm-up failed, requests will scan Redis themselves: {exc}")
+        else:
+            self.state = WarmupState.ready
+            self.duration = time.perf_counter() - started
+            logger.info(f"Warmed up with {len(self.jobs)} jobs in {self.duration:.2f}s.")
+        # Completed jobs stay in the job cache, the index keeps the rest.
+        self.jobs = []
+
+    def start(self, job_service: JobService, max_jobs: int) -> None:
+        """Start loading the jobs."""
+        if self._task is None:
+            self.state = WarmupState.warming
+            self._task = asyncio.create_task(self.load(job_service, max_jobs))
+
+    async def stop(self) -> None:
+        """Stop loading the jobs."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+        self._task = None
@@ -0,0 +1,139 @@
+import re
+import time
+from collections import deque
+from datetime import UTC, datetime, timedelta
+
+from core.config import get_timezone
+from core.limiter import AdaptiveLimiter
+from core.metrics import redis_fetch_histogram
+from core.redis_pool import RedisPool
+from schemas.worker import Worker, WorkerHeartbeat, WorkersInfo
+
+# Line written by ``arq.worker.Worker.record_health``.
+HEALTH_CHECK_PATTERN = re.compile(
+    r"^(?P<stamp>\w{3}-\d{2} \d{2}:\d{2}:\d{2}) j_complete=(?P<jobs_complete>\d+) "
+    r"j_failed=(?P<jobs_failed>\d+) j_retried=(?P<jobs_retried>\d+) "
+    r"j_ongoing=(?P<jobs_ongoing>\d+) queued=(?P<queued>\d+)",
+)
+
+
+def parse_health_check(line: str, now: datetime) -> WorkerHeartbeat | None:
+    """Parse a health-check line, ``None`` if it isn't one.
+
+    The line carries the local time of the worker without a year, it is read in the
+    configured timezone and placed in the last year it isn't in the future.
+    """
+    match = HEALTH_CHECK_PATTERN.match(line)
+    if match is None:
+        return None
+    counters = {name: int(value) for name, value in match.groupdict().items() if name != "stamp"}
+    local_now = now.astimezone(get_timezone())
+    try:
+        stamp = datetime.strptime(
+            f"{local_now.year}-{match['stamp']}",
+            "%Y-%b-%d %H:%M:%S",
+        ).replace(tzinfo=local_now.tzinfo)
+    except ValueError:
+        return WorkerHeartbeat(time=now, **counters)
+    if stamp > local_now + timedelta(days=1):
+        stamp = stamp.replace(year=stamp.year - 1)
+    return WorkerHeartbeat(time=min(stamp, local_now).astimezone(UTC), **counters)
+
+
+def finished(heartbeat: WorkerHeartbeat) -> int:
+    """Get the number of jobs a worker finished, successfully or not."""
+    return heartbeat.jobs_complete + heartbeat.jobs_failed
+
+
+class WorkerMonitor:
+    """Follows the workers through the health-check keys arq workers write.
+
+    Only the health-check keys are read, in one pipeline: no job is fetched and the
+    keyspace isn't walked. A heartbeat is recorded each time a health-check line changes, keeping
+    the last ``history_size`` of every worker to compute its throughput. The first
+    heartbeat seen is dated by the worker's own timestamp, the following ones by the
+    time they were noticed, so clocks out of sync only affect the first one.
+    """
+
+    def __init__(
+        self,
+        redis_pool: RedisPool,
+        health_check_keys: list[str],
+        limiter: AdaptiveLimiter | None = None,
+        history_size: int = 60,
+    ) -> None:
+        self.redis_pool = redis_pool
+        self.health_check_keys = health_check_keys
+        self.limiter = limiter or AdaptiveLimiter()
+        self.history_size = history_size
+        self.lines: dict[str, bytes] = {}
+        self.histories: dict[str, deque[WorkerHeartbeat]] = {}
+
+    async def get_workers(self) -> WorkersInfo:
+        """Read the health checks and record the heartbeats that happened since last time."""
+        redis = await self.redis_pool.get()
+        async with self.limiter.acquire(), redis.pipeline(transaction=False) as pipe:
+            for key in self.health_check_keys:
+                pipe.get(key)
+                pipe.pttl(key)
+            started = time.perf_counter()
+            replies = await pipe.execute()
+            redis_fetch_histogram.observe(time.perf_counter() - started, operation="workers")
+
+        now = datetime.now(UTC)
+        workers = [
+            self.update(key, line, ttl_ms, now)
+            for key, line, ttl_ms in zip(
+                self.health_check_keys,
+                replies[0::2],
+                replies[1::2],
+                strict=True,
+            )
+        ]
+        # The workers report their ongoing jobs, which spares walking the in-progress keys.
+        in_progress = sum(
+            worker.last.jobs_ongoing for worker in workers if worker.alive and worker.last
+        )
+        return WorkersInfo(workers=workers, in_progress=in_progress)
+
+    def update(self, key: str, line: bytes | None, ttl_ms: int, now: datetime) -> Worker:
+        """Record the heartbeat of a worker if its health check changed and describe it."""
+        history = self.histories.setdefault(key, deque(maxlen=self.history_size))
+        if line is None:
+            # The worker stopped, or stalled long enough for its health check to expire.
+            self.lines.pop(key, None)
+            return Worker(health_check_key=key, last=history[-1] if history else None)
+
+        ttl = ttl_ms / 1000 if ttl_ms >= 0 else None
+        if line != self.lines.get(key):
+            first_seen = key not in self.lines
+            self.lines[key] = line
+            heartbeat = parse_health_check(line.decode(errors="replace"), now)
+            if heartbeat is not None:
+                if not first_seen:
+                    heartbeat.time = now
+                if history and finished(heartbeat) < finished(history[-1]):
+                    # The worker restarted with new counters.
+                    history.clear()
+                history.append(heartbeat)
+
+        if not history:
+            return Worker(health_check_key=key, alive=True, seconds_to_expiry=ttl)
+        last = history[-1]
+        return Worker(
+            health_check_key=key,
+            alive=True,
+            seconds_since_heartbeat=max((now - last.time).total_seconds(), 0.0),
+            seconds_to_expiry=ttl,
+            throughput=self.throughput(history),
+            last=last,
+            history=list(history),
+        )
+
+    @staticmethod
+    def throughput(history: deque[WorkerHeartbeat]) -> float | None:
+        """Get the jobs finished per minute between the oldest and the newest heartbeat."""
+        elapsed = (history[-1].time - history[0].time).total_seconds()
+        if len(history) < 2 or elapsed <= 0:  # noqa: PLR2004
+            return None
+        return (finished(history[-1]) - finished(history[0])) / elapsed * 60
@@ -0,0 +1,154 @@
+"""Seed Redis with synthetic arq jobs, bypassing the workers.
+
+Writes the same keys arq writes (job definitions, queue entries, in-progress markers
+and results), so the API sees queued, in progress, complete and failed jobs without
+running anything. Only use it against a local Redis.
+
+    python worker/seeder.py --jobs 50000
+"""
+import argparse
+import asyncio
+import json
+import pickle
+import random
+import sys
+import time
+import uuid
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from arq import ArqRedis, create_pool
+from arq.constants import in_progress_key_prefix, job_key_prefix, result_key_prefix
+from arq.jobs import serialize_job, serialize_result
+from core.config import Settings, get_app_settings
+from core.depends import get_redis_settings
+from task_creator import FUNCTIONS
+
+settings: Settings = get_app_settings()
+
+Serializer = Callable[[dict[str, Any]], bytes]
+
+
+def get_serializer(name: str) -> Serializer:
+    """Get the serializer matching the JOB_SERIALIZER setting."""
+    if name == "msgpack":
+        import msgpack
+
+        return msgpack.packb
+    if name == "json":
+        return lambda data: json.dumps(data, default=str).encode()
+    return pickle.dumps
+
+
+def job_kinds(count: int, queued: float, in_progress: float, failed: float) -> list[str]:
+    """Split jobs between kinds according to the given ratios, the rest is complete."""
+    kinds = []
+    for index in range(count):
+        position = index / count
+        if position < queued:
+            kinds.append("queued")
+        elif position < queued + in_progress:
+            kinds.append("in_progress")
+        elif position < queued + in_progress + failed:
+            kinds.append("failed")
+        else:
+            kinds.append("complete")
+    return kinds
+
+
+async def seed_jobs(
+    redis: ArqRedis,
+    count: int,
+    queued: float = 0.1,
+    in_progress: float = 0.05,
+    failed: float = 0.1,
+    serializer_name: str = settings.job_serializer,
+    window_seconds: int = 3600,
+    batch_size: int = 1000,
+    random_seed: int = 0,
+) -> dict[str, int]:
+    """Write synthetic jobs spread over the last ``window_seconds`` and count them by kind."""
+    rng = random.Random(random_seed)
+    serializer = get_serializer(serializer_name)
+    now_ms = int(time.time() * 1000)
+    expires_ms = (window_seconds + 3600) * 1000
+    kinds = job_kinds(count, queued, in_progress, failed)
+    rng.shuffle(kinds)
+
+    written: dict[str, int] = {}
+    for start in range(0, count, batch_size):
+        async with redis.pipeline(transaction=False) as pipe:
+            for kind in kinds[start : start + batch_size]:
+                job_id = uuid.UUID(int=rng.getrandbits(128)).hex
+                function = rng.choice(FUNCTIONS)
+                kwargs = {"is_successful": kind != "failed", "customer_id": rng.randint(1, 1000)}
+                enqueue_ms = now_ms - rng.randint(0, window_seconds * 1000)
+
+                if kind in {"queued", "in_progress"}:
+                    pipe.psetex(
+                        job_key_prefix + job_id,
+                        expires_ms,
+                        serialize_job(function, (), kwargs, 1, enqueue_ms, serializer=serializer),
+                    )
+                    pipe.zadd(settings.queue_name, {job_id: enqueue_ms})
+                    if kind == "in_progress":
+                        pipe.psetex(in_progress_key_prefix + job_id, expires_ms, b"1")
+                else:
+                    start_ms = enqueue_ms + rng.randint(0, 5000)
+                    finish_ms = start_ms + rng.randint(100, 20000)
+                    pipe.psetex(
+                        result_key_prefix + job_id,
+                        expires_ms,
+                        serialize_result(
+                            function,
+                            (),
+                            kwargs,
+                            1,
+                            enqueue_ms,
+                            kind == "complete",
+                            '{"status": "ok"}' if kind == "complete" else f"{function} failed",
+                            start_ms,
+                            finish_ms,
+                            job_id,
+                            settings.queue_name,
+                            job_id,
+                            serializer=serializer,
+                        ),
+                    )
+                written[kind] = written.get(kind, 0) + 1
+            await pipe.execute()
+    return written
+
+
+async def clear_jobs(redis: ArqRedis) -> int:
+    """Delete every arq job key and the queue."""
+    deleted = 0
+    for prefix in (job_key_prefix, in_progress_key_prefix, result_key_prefix):
+        keys = [key async for key in redis.scan_iter(match=prefix + "*", count=1000)]
+        for start in range(0, len(keys), 1000):
+            deleted += await redis.unlink(*keys[start : start + 1000])
+    await redis.delete(settings.queue_name)
+    return deleted
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=10000)
+    parser.add_argument("--queued", type=float, default=0.1)
+    parser.add_argument("--in-progress", type=float, default=0.05)
+    parser.add_argument("--failed", type=float, default=0.1)
+    parser.add_argument("--clear", action="store_true", help="Delete existing arq jobs first.")
+    args = parser.parse_args()
+
+    redis = await create_pool(get_redis_settings(), default_queue_name=settings.queue_name)
+    if args.clear:
+        await clear_jobs(redis)
+    written = await seed_jobs(redis, args.jobs, args.queued, args.in_progress, args.failed)
+    print(json.dumps(written))
+    await redis.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
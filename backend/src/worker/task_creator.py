@@ -11,18 +11,18 @@ from core.depends import get_redis_settings
 logger = logging.getLogger(__name__)
 settings: Settings = get_app_settings()
 
+FUNCTIONS = [
+    "check_fuel_system",
+    "diagnose_navigation_system",
+    "test_life_support_system",
+    "check_communication_system",
+    "analyze_launch_readiness",
+]
+
 
 async def enqueue_job(redis_pool: ArqRedis, is_successful: bool):
     await redis_pool.enqueue_job(
-        random.choice(
-            [
-                "check_fuel_system",
-                "diagnose_navigation_system",
-                "test_life_support_system",
-                "check_communication_system",
-                "analyze_launch_readiness",
-            ],
-        ),
+        random.choice(FUNCTIONS),
         is_successful=is_successful,
     )
 
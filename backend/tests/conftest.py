@@ -0,0 +1,183 @@
+import os
+from pathlib import Path
+
+# The application runs from src, where its static files and .env are. The settings are
+# read once, when its modules are first imported.
+os.chdir(Path(__file__).resolve().parents[1] / "src")
+os.environ["WARMUP_ENABLED"] = "false"
+os.environ["RATE_LIMIT_RATE"] = "0"
+
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta, tzinfo
+from types import ModuleType
+from typing import Any
+
+import core.depends
+import core.redis_pool
+import fakeredis
+import httpx
+import pytest
+import services.aggregation
+import services.job_service
+import services.job_summary
+from arq import ArqRedis
+from arq.constants import in_progress_key_prefix, job_key_prefix, result_key_prefix
+from arq.jobs import Serializer, serialize_job, serialize_result
+from arq.utils import timestamp_ms
+from core.cache import LRUCache
+from main import app
+from schemas.job import Job, JobStatus
+from services.job_index import JobIndex
+from services.job_refresher import JobRefresher
+
+AddJob = Callable[..., Awaitable[None]]
+FreezeTime = Callable[[datetime], None]
+# Modules reading the clock to find the jobs of the last hour and their minutes.
+CLOCK_MODULES: tuple[ModuleType, ...] = (
+    services.aggregation,
+    services.job_service,
+    services.job_summary,
+)
+
+
+class FakeArqRedis(fakeredis.FakeAsyncRedis, ArqRedis):
+    """arq's Redis client backed by an in-memory fake server."""
+
+
+def make_job(  # noqa: PLR0913
+    job_id: str,
+    status: JobStatus = JobStatus.complete,
+    success: bool = True,  # noqa: FBT001, FBT002
+    function: str = "download_content",
+    enqueue_time: datetime = datetime(2024, 3, 15, 12, 0, tzinfo=UTC),
+    queue_wait: float | None = None,
+    duration: float | None = None,
+    **fields: Any,  # noqa: ANN401
+) -> Job:
+    """Build a job as read from Redis, started ``queue_wait`` seconds after its enqueue."""
+    start_time = finish_time = None
+    if queue_wait is not None:
+        start_time = enqueue_time + timedelta(seconds=queue_wait)
+        if duration is not None:
+            finish_time = start_time + timedelta(seconds=duration)
+    return Job(
+        id=job_id,
+        status=status,
+        success=success,
+        function=function,
+        enqueue_time=enqueue_time,
+        start_time=start_time,
+        finish_time=finish_time,
+        execution_duration=duration,
+        **fields,
+    )
+
+
+def api_client() -> httpx.AsyncClient:
+    """Get a client of the application, to be used within its lifespan."""
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.fixture(autouse=True)
+def job_index(monkeypatch: pytest.MonkeyPatch) -> JobIndex:
+    """Give every test an empty job index and empty caches."""
+    index = JobIndex()
+    cache = LRUCache(capacity=core.depends.settings.max_jobs)
+    monkeypatch.setattr(core.depends, "job_index_singleton", index)
+    monkeypatch.setattr(core.depends, "cache_singleton", cache)
+    monkeypatch.setattr(core.depends.job_service_singleton, "index", index)
+    monkeypatch.setattr(core.depends.job_service_singleton, "cache", cache)
+    core.depends.get_response_cache().clear()
+    return index
+
+
+@pytest.fixture(autouse=True)
+def job_refresher(monkeypatch: pytest.MonkeyPatch) -> JobRefresher:
+    """Give every test a refresher which only refreshes the index when told to tick."""
+    refresher = JobRefresher(interval=0)
+    monkeypatch.setattr(core.depends, "job_refresher_singleton", refresher)
+    return refresher
+
+
+@pytest.fixture()
+def freeze_time(monkeypatch: pytest.MonkeyPatch) -> FreezeTime:
+    """Get a function stopping the clock of the statistics at an aware datetime."""
+
+    def freeze(now: datetime) -> None:
+        class FrozenDatetime(datetime):
+            """A datetime whose ``now`` is fixed."""
+
+            @classmethod
+            def now(cls: type[datetime], tz: tzinfo | None = None) -> datetime:
+                """Get the fixed time in a timezone."""
+                return now.astimezone(tz)
+
+        for module in CLOCK_MODULES:
+            monkeypatch.setattr(module, "datetime", FrozenDatetime)
+
+    return freeze
+
+
+@pytest.fixture()
+def redis(monkeypatch: pytest.MonkeyPatch) -> FakeArqRedis:
+    """Get a client of an empty fake Redis, which the application pool connects to."""
+    server = fakeredis.FakeServer()
+
+    async def create_pool(*args: Any, **kwargs: Any) -> FakeArqRedis:  # noqa: ANN401
+        return FakeArqRedis(server=server)
+
+    monkeypatch.setattr(core.redis_pool, "create_pool", create_pool)
+    # Every test runs its own event loop, the shared pool connects again in it.
+    monkeypatch.setattr(core.depends.redis_pool_singleton, "pool", None)
+    return FakeArqRedis(server=server)
+
+
+@pytest.fixture()
+def add_job(redis: FakeArqRedis) -> AddJob:
+    """Get a function writing a job the way arq does, in the given state.
+
+    ``state`` is ``queued``, ``deferred``, ``in_progress``, ``complete`` or ``failed``,
+    times are in milliseconds.
+    """
+
+    async def add(  # noqa: PLR0913
+        job_id: str,
+        state: str,
+        enqueue_ms: int,
+        start_ms: int | None = None,
+        finish_ms: int | None = None,
+        function: str = "download_content",
+        serializer: Serializer | None = None,
+        queue_name: str = "arq:queue",
+        kwargs: dict[str, Any] | None = None,
+    ) -> None:
+        if state in {"complete", "failed"}:
+            await redis.set(
+                result_key_prefix + job_id,
+                serialize_result(
+                    function,
+                    (),
+                    kwargs or {},
+                    1,
+                    enqueue_ms,
+                    state == "complete",
+                    "ok" if state == "complete" else ValueError("boom"),
+                    start_ms or enqueue_ms,
+                    finish_ms or timestamp_ms(),
+                    job_id,
+                    queue_name,
+                    job_id,
+                    serializer=serializer,
+                ),
+            )
+            return
+        await redis.set(
+            job_key_prefix + job_id,
+            serialize_job(function, (), kwargs or {}, 1, enqueue_ms, serializer=serializer),
+        )
+        score = timestamp_ms() + 3_600_000 if state == "deferred" else enqueue_ms
+        await redis.zadd(queue_name, {job_id: score})
+        if state == "in_progress":
+            await redis.set(in_progress_key_prefix + job_id, b"1")
+
+    return add
@@ -0,0 +1,89 @@
+import pytest
+from schemas.job import JobStatus
+from services.breakdown import HISTOGRAM_BOUNDS, BreakdownGroup, DurationHistogram
+
+from tests.conftest import make_job
+
+
+def test_quantile_is_within_five_percent() -> None:
+    histogram = DurationHistogram()
+    for value in range(1, 1001):
+        histogram.add(value / 10)
+
+    assert histogram.quantile(0.5) == pytest.approx(50, rel=0.05)
+    assert histogram.quantile(0.95) == pytest.approx(95, rel=0.05)
+    assert histogram.mean() == pytest.approx(50.05)
+
+
+def test_quantile_of_zero_durations_is_zero() -> None:
+    histogram = DurationHistogram()
+    for _ in range(10):
+        histogram.add(0.0)
+
+    assert histogram.quantile(0.5) == 0.0
+    assert histogram.quantile(0.95) == 0.0
+
+
+def test_quantile_of_durations_beyond_the_bounds_is_the_last_bound() -> None:
+    histogram = DurationHistogram()
+    histogram.add(HISTOGRAM_BOUNDS[-1] * 2)
+
+    assert histogram.quantile(0.5) == HISTOGRAM_BOUNDS[-1]
+
+
+def test_empty_histogram() -> None:
+    histogram = DurationHistogram()
+
+    assert histogram.quantile(0.95) is None
+    assert histogram.mean() is None
+
+
+def test_removed_durations_are_no_longer_counted() -> None:
+    histogram = DurationHistogram()
+    for value in (1.0, 2.0, 100.0):
+        histogram.add(value)
+
+    histogram.add(100.0, -1)
+
+    assert histogram.count == 2
+    assert histogram.mean() == pytest.approx(1.5)
+    assert histogram.quantile(0.95) == pytest.approx(2.0, rel=0.05)
+
+
+def test_breakdown_group_remove_undoes_add() -> None:
+    jobs = [
+        (make_job("a", queue_wait=0.5, duration=2.0), "complete"),
+        (make_job("b", success=False, queue_wait=1.0, duration=30.0), "failed"),
+        (make_job("c", JobStatus.queued), "queued"),
+        (make_job("d", JobStatus.deferred), "deferred"),
+        (make_job("e", JobStatus.in_progress, queue_wait=0.0), "in_progress"),
+    ]
+    group = BreakdownGroup("download_content")
+    group.add(*jobs[0])
+    before = group.to_schema("failed")
+    counts = (list(group.durations.counts), list(group.queue_waits.counts))
+
+    for job, state in jobs[1:]:
+        group.add(job, state)
+    after_add = group.to_schema("failed")
+    for job, state in jobs[1:]:
+        group.add(job, state, -1)
+
+    assert after_add.total == 5
+    assert after_add.queued == 2
+    assert after_add.failed == 1
+    assert after_add.success_rate == 0.5
+    assert group.to_schema("failed") == before
+    assert (group.durations.counts, group.queue_waits.counts) == counts
+
+
+def test_breakdown_row_without_completed_jobs() -> None:
+    group = BreakdownGroup("upload")
+    group.add(make_job("a", JobStatus.queued), "queued")
+
+    row = group.to_schema("failed")
+
+    assert row.success_rate is None
+    assert row.avg_duration is None
+    assert row.p95_queue_wait is None
+    assert row.total == 1
@@ -0,0 +1,137 @@
+import asyncio
+from types import SimpleNamespace
+
+import core.cache
+import pytest
+from core.cache import CacheStatus, LRUCache, ResponseCache
+
+
+class Computation:
+    """A computation counting its calls, finishing once released."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self) -> int:
+        """Compute the value."""
+        self.calls += 1
+        await self.release.wait()
+        return self.calls
+
+
+@pytest.fixture()
+def clock(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    """Get the clock of the cache, only moving when told to."""
+    clock = SimpleNamespace(now=0.0)
+    monkeypatch.setattr(core.cache, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    return clock
+
+
+def test_concurrent_requests_share_one_computation() -> None:
+    cache = ResponseCache(ttl=0)
+
+    async def run() -> list[tuple[int, CacheStatus]]:
+        compute = Computation()
+        requests = [asyncio.create_task(cache.get_or_compute("key", compute)) for _ in range(3)]
+        await asyncio.sleep(0)
+        assert cache.is_available("key")
+        compute.release.set()
+        results = await asyncio.gather(*requests)
+        assert compute.calls == 1
+        return results
+
+    results = asyncio.run(run())
+
+    assert results == [
+        (1, CacheStatus.miss),
+        (1, CacheStatus.coalesced),
+        (1, CacheStatus.coalesced),
+    ]
+    # Without a TTL nothing is kept once the computation is over.
+    assert not cache.is_available("key")
+
+
+def test_cancelled_request_doesnt_cancel_the_computation() -> None:
+    cache = ResponseCache(ttl=0)
+
+    async def run() -> tuple[int, CacheStatus]:
+        compute = Computation()
+        first = asyncio.create_task(cache.get_or_compute("key", compute))
+        second = asyncio.create_task(cache.get_or_compute("key", compute))
+        await asyncio.sleep(0)
+        # The client of the request which started the computation went away.
+        first.cancel()
+        await asyncio.sleep(0)
+        compute.release.set()
+        return await second
+
+    assert asyncio.run(run()) == (1, CacheStatus.coalesced)
+
+
+def test_value_is_cached_for_the_ttl(clock: SimpleNamespace) -> None:
+    cache = ResponseCache(ttl=2.0)
+
+    async def run() -> list[tuple[int, CacheStatus]]:
+        compute = Computation()
+        compute.release.set()
+        results = [await cache.get_or_compute("key", compute)]
+        clock.now = 1.9
+        results.append(await cache.get_or_compute("key", compute))
+        clock.now = 2.0
+        assert not cache.is_available("key")
+        results.append(await cache.get_or_compute("key", compute))
+        return results
+
+    assert asyncio.run(run()) == [
+        (1, CacheStatus.miss),
+        (1, CacheStatus.hit),
+        (2, CacheStatus.miss),
+    ]
+
+
+def test_failure_is_not_cached(clock: SimpleNamespace) -> None:
+    cache = ResponseCache(ttl=2.0)
+    calls = 0
+
+    async def fail() -> int:
+        nonlocal calls
+        calls += 1
+        raise ValueError(calls)
+
+    async def run() -> None:
+        for _ in range(2):
+            with pytest.raises(ValueError, match="[12]"):
+                await cache.get_or_compute("key", fail)
+
+    asyncio.run(run())
+
+    assert calls == 2
+    assert not cache.is_available("key")
+
+
+def test_clear_drops_cached_values(clock: SimpleNamespace) -> None:
+    cache = ResponseCache(ttl=2.0)
+
+    async def compute() -> int:
+        return 1
+
+    asyncio.run(cache.get_or_compute("key", compute))
+    assert cache.is_available("key")
+
+    cache.clear()
+
+    assert not cache.is_available("key")
+
+
+def test_lru_cache_evicts_the_least_recently_used() -> None:
+    cache = LRUCache(capacity=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
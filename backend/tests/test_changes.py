@@ -0,0 +1,95 @@
+import asyncio
+import logging
+
+import pytest
+from arq.utils import timestamp_ms
+from core.depends import get_response_cache
+from endpoints.jobs import get_fresh_job_index
+from main import app, lifespan
+from services.job_refresher import JobRefresher
+
+from tests.conftest import AddJob, FakeArqRedis, api_client
+
+
+def test_polls_are_answered_from_the_index_refreshed_in_background(
+    redis: FakeArqRedis,
+    add_job: AddJob,
+    job_refresher: JobRefresher,
+) -> None:
+    async def poll() -> tuple[dict, dict, bool, dict]:
+        await add_job("first", "queued", timestamp_ms())
+        async with lifespan(app), api_client() as client:
+            # Without a token, the index is filled once to get the current version.
+            current = (await client.get("/arq/api/jobs/changes")).json()
+            await add_job("second", "queued", timestamp_ms())
+            get_response_cache().clear()
+            polled = (
+                await client.get("/arq/api/jobs/changes", params={"since": current["version"]})
+            ).json()
+            refreshed = await job_refresher.tick(lambda: get_fresh_job_index(max_age=0))
+            after_refresh = (
+                await client.get("/arq/api/jobs/changes", params={"since": current["version"]})
+            ).json()
+        return current, polled, refreshed, after_refresh
+
+    current, polled, refreshed, after_refresh = asyncio.run(poll())
+
+    assert current["index_age"] is not None
+    assert polled["created"] == []
+    assert polled["version"] == current["version"]
+    assert polled["index_age"] is not None
+    assert refreshed
+    assert [job["id"] for job in after_refresh["created"]] == ["second"]
+    assert job_refresher.polls == 3
+
+
+def test_refresher_refreshes_once_per_tick_when_polled() -> None:
+    refresher = JobRefresher(interval=10)
+    refreshes = []
+
+    async def refresh() -> None:
+        refreshes.append(refresher.polls)
+
+    async def tick() -> bool:
+        return await refresher.tick(refresh)
+
+    assert not asyncio.run(tick())
+    for _ in range(3):
+        refresher.poll()
+    assert asyncio.run(tick())
+    assert not asyncio.run(tick())
+    refresher.poll()
+    assert asyncio.run(tick())
+
+    assert refreshes == [3, 4]
+
+
+def test_poll_during_refresh_asks_for_the_next_one() -> None:
+    refresher = JobRefresher(interval=10)
+    refreshes = []
+
+    async def refresh() -> None:
+        refreshes.append(1)
+        if len(refreshes) == 1:
+            refresher.poll()
+
+    async def tick_three_times() -> list[bool]:
+        return [await refresher.tick(refresh) for _ in range(3)]
+
+    refresher.poll()
+
+    assert asyncio.run(tick_three_times()) == [True, True, False]
+    assert len(refreshes) == 2
+
+
+def test_failed_refresh_is_logged(caplog: pytest.LogCaptureFixture) -> None:
+    refresher = JobRefresher(interval=10)
+
+    async def refresh() -> None:
+        raise ConnectionError("Redis is down")
+
+    refresher.poll()
+    with caplog.at_level(logging.ERROR, logger="services.job_refresher"):
+        assert asyncio.run(refresher.tick(refresh))
+
+    assert "Failed to refresh the job index." in caplog.text
@@ -0,0 +1,79 @@
+import asyncio
+from typing import Any
+
+import endpoints.jobs
+import pytest
+from arq.constants import result_key_prefix
+from arq.utils import timestamp_ms
+from core.depends import get_job_decoder, job_service_singleton
+from main import app, lifespan
+from services.job_replay import JobReplay
+
+from tests.conftest import AddJob, FakeArqRedis, api_client
+
+OLD_KEY = result_key_prefix + "old"
+
+
+def run_cleanups(
+    redis: FakeArqRedis,
+    add_job: AddJob,
+    *bodies: dict[str, Any],
+) -> list[tuple[int, str, bool]]:
+    """Post cleanups after a job finished more than a week ago.
+
+    Get the status, the last progress line and whether the result is still there after
+    each of them.
+    """
+
+    async def post() -> list[tuple[int, str, bool]]:
+        week_ago_ms = timestamp_ms() - 8 * 24 * 3600 * 1000
+        await add_job("old", "complete", week_ago_ms, finish_ms=week_ago_ms)
+        outcomes = []
+        async with lifespan(app), api_client() as client:
+            for body in bodies:
+                response = await client.post("/arq/api/jobs/cleanup", json=body)
+                kept = bool(await redis.exists(OLD_KEY))
+                outcomes.append((response.status_code, response.text.splitlines()[-1], kept))
+        return outcomes
+
+    return asyncio.run(post())
+
+
+def test_cleanup_is_disabled_by_default(redis: FakeArqRedis, add_job: AddJob) -> None:
+    [(status_code, _, kept)] = run_cleanups(redis, add_job, {"dry_run": False})
+
+    assert status_code == 403
+    assert kept
+
+
+def test_cleanup_is_a_dry_run_by_default(
+    redis: FakeArqRedis,
+    add_job: AddJob,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(endpoints.jobs.settings, "cleanup_enabled", True)
+
+    dry_run, cleanup = run_cleanups(redis, add_job, {}, {"dry_run": False})
+
+    assert dry_run[0] == 200
+    assert '"matched":1' in dry_run[1]
+    assert '"deleted":0' in dry_run[1]
+    assert dry_run[2]
+    assert cleanup[0] == 200
+    assert '"deleted":1' in cleanup[1]
+    assert not cleanup[2]
+
+
+def test_cleanup_is_refused_while_replaying(
+    redis: FakeArqRedis,
+    add_job: AddJob,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(endpoints.jobs.settings, "cleanup_enabled", True)
+    replay = JobReplay("capture.jsonl", get_job_decoder())
+    monkeypatch.setattr(job_service_singleton, "snapshot", replay)
+
+    [(status_code, _, kept)] = run_cleanups(redis, add_job, {"dry_run": False})
+
+    assert status_code == 409
+    assert kept
@@ -0,0 +1,54 @@
+import asyncio
+import time
+
+from arq.utils import timestamp_ms
+from core.depends import get_job_service, get_response_cache
+from endpoints.jobs import settings
+from main import app, lifespan
+
+from tests.conftest import AddJob, FakeArqRedis, api_client
+
+JOBS = 20000
+POLL_INTERVAL = 0.01
+# The fake Redis blocks the loop while it answers a batch, so /status may wait for the
+# batches already being answered: ~2.5 batches were measured. Building and indexing the
+# jobs on the loop blocked it for ~8 batches.
+MAX_STATUS_DELAY_IN_BATCHES = 5
+
+
+def test_status_is_responsive_during_large_jobs_request(
+    redis: FakeArqRedis,
+    add_job: AddJob,
+) -> None:
+    async def poll_status_during_jobs() -> tuple[int, float, list[float]]:
+        async with lifespan(app), api_client() as client:
+            # Fill the job index first, /status then answers from it without Redis.
+            await client.get("/arq/api/jobs")
+            now = timestamp_ms()
+            for index in range(JOBS):
+                state = ("queued", "in_progress", "complete", "failed")[index % 4]
+                await add_job(f"job-{index}", state, now - index * 100, now - index * 50)
+            get_response_cache().clear()
+            job_service = await get_job_service()
+            # How long the loop is blocked by a batch on this machine, the unit of the delays.
+            batch = [f"job-{index}" for index in range(settings.fetch_batch_size)]
+            started = time.perf_counter()
+            await job_service.fetch_jobs_raw(redis, batch)
+            batch_seconds = time.perf_counter() - started
+
+            jobs_request = asyncio.create_task(client.get("/arq/api/jobs", params={"limit": 5}))
+            delays = []
+            while not jobs_request.done():
+                started = time.perf_counter()
+                await asyncio.sleep(POLL_INTERVAL)
+                response = await client.get("/arq/api/status")
+                assert response.status_code == 200
+                delays.append(time.perf_counter() - started - POLL_INTERVAL)
+            jobs_response = await jobs_request
+            return jobs_response.json()["statistics"]["total"], batch_seconds, delays
+
+    total, batch_seconds, delays = asyncio.run(poll_status_during_jobs())
+
+    assert total > 0
+    assert len(delays) > 10
+    assert max(delays) < batch_seconds * MAX_STATUS_DELAY_IN_BATCHES
@@ -0,0 +1,110 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from schemas.job import JobStatus
+from services.failures import MAX_MESSAGE_LENGTH, FailureGroup, error_signature
+from services.job_index import JobIndex
+
+from tests.conftest import make_job
+
+NOON = datetime(2024, 3, 15, 12, 0, tzinfo=UTC)
+
+
+@pytest.mark.parametrize(
+    ("error", "signature"),
+    [
+        (
+            KeyError("job 3f2b9c1e-8d4a-4b7e-9f1a-2c3d4e5f6a7b expired"),
+            "KeyError: 'job <uuid> expired'",
+        ),
+        (
+            ValueError("checksum deadbeefdeadbeef12 mismatch"),
+            "ValueError: checksum <hex> mismatch",
+        ),
+        (ValueError("order 1234 not found"), "ValueError: order <n> not found"),
+        (TimeoutError("no reply after 1.5s"), "TimeoutError: no reply after <n>s"),
+        (
+            ConnectionError("connect to 10.0.0.1:6379 refused"),
+            "ConnectionError: connect to <n> refused",
+        ),
+        (ValueError("order\n  12\tfailed"), "ValueError: order <n> failed"),
+        (ValueError("user abc123 unknown"), "ValueError: user abc123 unknown"),
+    ],
+)
+def test_error_signature_strips_ids_and_numbers(error: Exception, signature: str) -> None:
+    assert error_signature(error) == signature
+
+
+def test_versions_are_stripped_whole() -> None:
+    signatures = {
+        error_signature(RuntimeError("client v1.2.3 is too old")),
+        error_signature(RuntimeError("client v1.4.0 is too old")),
+        error_signature(RuntimeError("client v2 is too old")),
+    }
+
+    assert signatures == {"RuntimeError: client <version> is too old"}
+    assert (
+        error_signature(ImportError("requires redis 5.0.1."))
+        == "ImportError: requires redis <version>."
+    )
+
+
+def test_error_signature_is_truncated() -> None:
+    signature = error_signature(ValueError("x" * 1000))
+
+    assert signature == "ValueError: " + "x" * MAX_MESSAGE_LENGTH
+
+
+def test_failure_group_add_and_remove() -> None:
+    group = FailureGroup("ValueError: boom", "download_content", samples=2)
+
+    group.add("a", NOON)
+    group.add("b", NOON - timedelta(minutes=5))
+    group.add("c", NOON + timedelta(minutes=5))
+    group.add("d", None)
+
+    assert group.count == 4
+    assert group.first_seen == NOON - timedelta(minutes=5)
+    assert group.last_seen == NOON + timedelta(minutes=5)
+    assert list(group.sample_ids) == ["c", "d"]
+
+    group.remove("d")
+    group.remove("a")
+
+    schema = group.to_schema()
+    assert schema.count == 2
+    assert schema.sample_ids == ["c"]
+    # The times are those of all the failures ever seen.
+    assert schema.first_seen == NOON - timedelta(minutes=5)
+
+
+def test_failures_info_most_frequent_first() -> None:
+    index = JobIndex()
+    for job_id, function, signature in [
+        ("a", "download", "ValueError: boom"),
+        ("b", "download", "KeyError: 'x'"),
+        ("c", "download", "KeyError: 'x'"),
+        ("d", "upload", "KeyError: 'x'"),
+        ("e", "upload", "KeyError: 'x'"),
+        ("f", "upload", "KeyError: 'x'"),
+    ]:
+        index.add(make_job(job_id, success=False, function=function, error_signature=signature))
+    index.add(make_job("g", function="upload"))
+    index.add(make_job("h", JobStatus.queued, function="upload", error_signature="ignored"))
+
+    info = index.failures_info()
+
+    assert info.total == 6
+    assert [(row.function, row.signature, row.count) for row in info.signatures] == [
+        ("upload", "KeyError: 'x'", 3),
+        ("download", "KeyError: 'x'", 2),
+        ("download", "ValueError: boom", 1),
+    ]
+
+    for job_id in ("d", "e", "f"):
+        index.remove(index.jobs[job_id])
+
+    assert [row.function for row in index.failures_info().signatures] == [
+        "download",
+        "download",
+    ]
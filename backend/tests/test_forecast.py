@@ -0,0 +1,77 @@
+import math
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from schemas.forecast import ForecastAlert
+from services.forecast import RateEstimator, drain_seconds_value, forecast_backlog
+
+MINUTE = datetime(2024, 3, 15, 12, 0, tzinfo=UTC)
+
+
+def at(minutes: float) -> datetime:
+    return MINUTE + timedelta(minutes=minutes)
+
+
+def test_rate_folds_complete_minutes_only() -> None:
+    estimator = RateEstimator(alpha=0.5)
+    for _ in range(4):
+        estimator.add(at(0.5))
+
+    # The minute of the events isn't over yet.
+    assert estimator.rate(at(0.9)) == 0.0
+    assert estimator.rate(at(1)) == 2.0
+    # Reading again within the same minute doesn't fold anything.
+    assert estimator.rate(at(1.5)) == 2.0
+    assert estimator.rate(at(2)) == 1.0
+    assert estimator.rate(at(4)) == 0.25
+
+
+def test_event_noticed_late_counts_in_the_next_minute() -> None:
+    estimator = RateEstimator(alpha=0.5)
+    estimator.rate(at(2))
+    # Its minute was already folded into the average, it isn't lost.
+    estimator.add(at(1.5))
+
+    assert estimator.rate(at(3)) == 0.5
+
+
+def test_rate_restarts_after_a_pause_longer_than_the_horizon() -> None:
+    estimator = RateEstimator(alpha=0.5, horizon=10)
+    estimator.add(at(0))
+    assert estimator.rate(at(1)) == 0.5
+
+    estimator.add(at(5))
+    estimator.add(at(30))
+
+    # Only the last 10 minutes count, the event of minute 5 is dropped.
+    assert estimator.rate(at(31)) == 0.5
+
+
+@pytest.mark.parametrize(
+    ("queued", "arrival_rate", "completion_rate", "drain_seconds", "alert"),
+    [
+        (0, 5.0, 0.0, 0.0, ForecastAlert.ok),
+        (100, 0.0, 100.0, 60.0, ForecastAlert.ok),
+        (100, 0.0, 10.0, 600.0, ForecastAlert.ok),
+        (100, 0.0, 5.0, 1200.0, ForecastAlert.warning),
+        (100, 20.0, 22.0, 3000.0, ForecastAlert.critical),
+        (100, 10.0, 10.0, None, ForecastAlert.critical),
+        (100, 12.0, 10.0, None, ForecastAlert.critical),
+    ],
+)
+def test_forecast_backlog_thresholds(
+    queued: int,
+    arrival_rate: float,
+    completion_rate: float,
+    drain_seconds: float | None,
+    alert: ForecastAlert,
+) -> None:
+    forecast = forecast_backlog("f", queued, arrival_rate, completion_rate, 600.0, 1800.0)
+
+    assert forecast.drain_seconds == drain_seconds
+    assert forecast.alert == alert
+
+
+def test_drain_seconds_value_is_infinite_without_drain() -> None:
+    assert drain_seconds_value(forecast_backlog(None, 1, 1.0, 0.0, 600.0, 1800.0)) == math.inf
+    assert drain_seconds_value(forecast_backlog(None, 0, 1.0, 0.0, 600.0, 1800.0)) == 0.0
@@ -0,0 +1,130 @@
+import asyncio
+from typing import Any
+
+import endpoints.jobs
+import pytest
+from arq.utils import timestamp_ms
+from core.depends import get_response_cache
+from endpoints.jobs import get_fresh_job_index
+from main import app, lifespan
+from services.job_index import JobIndex
+from services.job_refresher import JobRefresher
+
+from tests.conftest import AddJob, FakeArqRedis, api_client
+
+
+def get_before_and_after_refresh(
+    add_job: AddJob,
+    job_index: JobIndex,
+    job_refresher: JobRefresher,
+    url: str,
+    state: str = "failed",
+    kwargs: dict[str, Any] | None = None,
+    **params: Any,  # noqa: ANN401
+) -> tuple[Any, Any, Any]:
+    """Get an endpoint served from the job index, then again after a job is added.
+
+    The third response is read once the background refresher ticked.
+    """
+
+    async def get() -> tuple[Any, Any, Any]:
+        await add_job("first", state, timestamp_ms(), kwargs=kwargs)
+        async with lifespan(app), api_client() as client:
+            first = (await client.get(url, params=params)).json()
+            await add_job("second", state, timestamp_ms(), kwargs=kwargs)
+            # As if nobody had asked for a while: the request still doesn't read Redis.
+            job_index.updated_at -= 60
+            get_response_cache().clear()
+            polled = (await client.get(url, params=params)).json()
+            await job_refresher.tick(lambda: get_fresh_job_index(max_age=0))
+            get_response_cache().clear()
+            refreshed = (await client.get(url, params=params)).json()
+        return first, polled, refreshed
+
+    return asyncio.run(get())
+
+
+def test_failures_are_served_from_the_index_as_it_is(
+    redis: FakeArqRedis,
+    add_job: AddJob,
+    job_index: JobIndex,
+    job_refresher: JobRefresher,
+) -> None:
+    first, polled, refreshed = get_before_and_after_refresh(
+        add_job,
+        job_index,
+        job_refresher,
+        "/arq/api/jobs/failures",
+    )
+
+    assert first["total"] == 1
+    assert polled["total"] == 1
+    assert polled["index_age"] >= 60
+    assert refreshed["total"] == 2
+    assert job_refresher.polls == 3
+
+
+def test_forecast_is_served_from_the_index_as_it_is(
+    redis: FakeArqRedis,
+    add_job: AddJob,
+    job_index: JobIndex,
+    job_refresher: JobRefresher,
+) -> None:
+    first, polled, refreshed = get_before_and_after_refresh(
+        add_job,
+        job_index,
+        job_refresher,
+        "/arq/api/jobs/forecast",
+        state="queued",
+    )
+
+    assert first["overall"]["queued"] == 1
+    assert polled["overall"]["queued"] == 1
+    assert polled["index_age"] >= 60
+    assert refreshed["overall"]["queued"] == 2
+    assert job_refresher.polls == 3
+
+
+def test_breakdown_is_served_from_the_index_as_it_is(
+    redis: FakeArqRedis,
+    add_job: AddJob,
+    job_index: JobIndex,
+    job_refresher: JobRefresher,
+) -> None:
+    first, polled, refreshed = get_before_and_after_refresh(
+        add_job,
+        job_index,
+        job_refresher,
+        "/arq/api/jobs/breakdown",
+        state="complete",
+    )
+
+    assert first["functions"][0]["total"] == 1
+    assert polled["functions"][0]["total"] == 1
+    assert polled["index_age"] >= 60
+    assert refreshed["functions"][0]["total"] == 2
+    assert job_refresher.polls == 3
+
+
+def test_kwarg_filter_is_served_from_the_index_as_it_is(
+    redis: FakeArqRedis,
+    add_job: AddJob,
+    job_index: JobIndex,
+    job_refresher: JobRefresher,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(endpoints.jobs.settings, "indexed_kwargs", ["customer_id"])
+    first, polled, refreshed = get_before_and_after_refresh(
+        add_job,
+        job_index,
+        job_refresher,
+        "/arq/api/jobs",
+        kwargs={"customer_id": 7},
+        **{"kwarg.customer_id": "7"},
+    )
+
+    assert first["statistics"]["total"] == 1
+    assert polled["statistics"]["total"] == 1
+    assert polled["index_age"] >= 60
+    assert refreshed["statistics"]["total"] == 2
+    assert job_refresher.polls == 3
@@ -0,0 +1,139 @@
+from typing import Any
+
+import pytest
+from schemas.job import Job, JobStatus
+from services.breakdown import BreakdownGroup
+from services.job_index import JobIndex
+
+from tests.conftest import make_job
+
+
+def histogram_state(group: BreakdownGroup) -> tuple[Any, ...]:
+    return (
+        dict(+group.state_counts),
+        list(group.durations.counts),
+        group.durations.count,
+        pytest.approx(group.durations.sum),
+        list(group.queue_waits.counts),
+        group.queue_waits.count,
+        pytest.approx(group.queue_waits.sum),
+    )
+
+
+def aggregates(index: JobIndex) -> dict[str, Any]:
+    """Get every aggregate the index maintains, without the zero counts it may keep."""
+    return {
+        "jobs": dict(index.jobs),
+        "state_counts": {key: count for key, count in index.state_counts.items() if count},
+        "function_state_counts": {
+            key: count for key, count in index.function_state_counts.items() if count
+        },
+        "failures": {
+            key: (group.count, list(group.sample_ids)) for key, group in index.failures.items()
+        },
+        "function_groups": {
+            name: histogram_state(group) for name, group in index.function_groups.items()
+        },
+        "queue_groups": {
+            name: histogram_state(group) for name, group in index.queue_groups.items()
+        },
+        "kwargs": {key: set(ids) for key, ids in index.kwargs.items()},
+    }
+
+
+def varied_jobs() -> list[Job]:
+    return [
+        make_job("queued", JobStatus.queued, indexed_kwargs={"customer_id": "1"}),
+        make_job("deferred", JobStatus.deferred, function="upload"),
+        make_job("running", JobStatus.in_progress, queue_wait=0.0),
+        make_job("done", queue_wait=0.5, duration=2.5, indexed_kwargs={"customer_id": "1"}),
+        make_job(
+            "failed",
+            success=False,
+            queue_wait=3.0,
+            duration=0.25,
+            function="upload",
+            queue_name="arq:other",
+            error_signature="ValueError: boom",
+        ),
+        make_job(
+            "failed-again",
+            success=False,
+            queue_wait=0.001,
+            duration=7.0,
+            function="upload",
+            queue_name="arq:other",
+            error_signature="ValueError: boom",
+            indexed_kwargs={"customer_id": "2"},
+        ),
+        make_job("not-found", JobStatus.not_found),
+    ]
+
+
+@pytest.fixture()
+def index() -> JobIndex:
+    """Get an index holding a job of every function and queue the varied jobs use."""
+    index = JobIndex()
+    index.add(make_job("base", queue_wait=0.1, duration=1.0))
+    index.add(make_job("base-upload", function="upload", queue_name="arq:other"))
+    return index
+
+
+def test_remove_undoes_add_for_every_aggregate(index: JobIndex) -> None:
+    before = aggregates(index)
+
+    jobs = varied_jobs()
+    for job in jobs:
+        index.add(job)
+    assert aggregates(index) != before
+    for job in reversed(jobs):
+        index.remove(job)
+
+    assert aggregates(index) == before
+
+
+def test_remove_in_another_order_undoes_add(index: JobIndex) -> None:
+    before = aggregates(index)
+
+    jobs = varied_jobs()
+    for job in jobs:
+        index.add(job)
+    for job in jobs:
+        index.remove(job)
+
+    assert aggregates(index) == before
+
+
+def test_replace_back_undoes_replace(index: JobIndex) -> None:
+    queued = make_job("job", JobStatus.queued, indexed_kwargs={"customer_id": "1"})
+    index.add(queued)
+    before = aggregates(index)
+    failed = make_job(
+        "job",
+        success=False,
+        queue_wait=1.0,
+        duration=2.0,
+        function="upload",
+        error_signature="KeyError: 'x'",
+        indexed_kwargs={"customer_id": "2"},
+    )
+
+    index.replace(queued, failed)
+    assert aggregates(index) != before
+    index.replace(failed, queued)
+
+    assert aggregates(index) == before
+
+
+def test_replaced_job_is_counted_as_its_new_version(index: JobIndex) -> None:
+    fresh = JobIndex()
+    fresh.add(make_job("base", queue_wait=0.1, duration=1.0))
+    fresh.add(make_job("base-upload", function="upload", queue_name="arq:other"))
+    queued = make_job("job", JobStatus.queued)
+    complete = make_job("job", queue_wait=1.0, duration=2.0)
+    fresh.add(complete)
+
+    index.add(queued)
+    index.replace(queued, complete)
+
+    assert aggregates(index) == aggregates(fresh)
@@ -0,0 +1,129 @@
+import asyncio
+import os
+from pathlib import Path
+
+import pytest
+from schemas.job import Job
+from services.job_snapshot import JobSnapshot
+
+from tests.conftest import make_job
+
+
+class Scan:
+    """A scan of Redis counting its calls, taking ``seconds`` each."""
+
+    def __init__(self, jobs: list[Job], seconds: float = 0.0) -> None:
+        self.jobs = jobs
+        self.seconds = seconds
+        self.calls = 0
+
+    async def __call__(self) -> list[Job]:
+        """Get the jobs."""
+        self.calls += 1
+        await asyncio.sleep(self.seconds)
+        return self.jobs
+
+
+@pytest.fixture()
+def path(tmp_path: Path) -> str:
+    return str(tmp_path / "jobs")
+
+
+def test_leader_scans_only_when_polled(path: str) -> None:
+    leader = JobSnapshot(path, interval=0.2)
+    scan = Scan([make_job("job")])
+
+    async def run() -> list[bool]:
+        ticks = [await leader.tick(scan)]
+        leader.poll()
+        ticks += [await leader.tick(scan), await leader.tick(scan)]
+        return ticks
+
+    assert asyncio.run(run()) == [False, True, False]
+    assert scan.calls == 1
+    leader.release()
+
+
+def test_poll_after_scan_started_asks_for_the_next_scan(path: str) -> None:
+    leader = JobSnapshot(path, interval=0)
+    follower = JobSnapshot(path, interval=0)
+    scan = Scan([make_job("job")], seconds=0.05)
+
+    async def run() -> list[bool]:
+        leader.poll()
+        scanning = asyncio.create_task(leader.tick(scan))
+        await asyncio.sleep(0.01)
+        # The scan already started, it may have missed what the follower asks for.
+        follower.poll()
+        ticks = [await scanning]
+        ticks += [await leader.tick(scan), await leader.tick(scan)]
+        return ticks
+
+    assert asyncio.run(run()) == [True, True, False]
+    assert scan.calls == 2
+    leader.release()
+
+
+def test_follower_waits_for_the_scan_it_asked_for(path: str) -> None:
+    leader = JobSnapshot(path, interval=0.2)
+    follower = JobSnapshot(path, interval=0.2)
+    scan = Scan([make_job("first"), make_job("second")], seconds=0.05)
+
+    async def run() -> list[Job] | None:
+        assert leader.try_lead()
+        assert not follower.try_lead()
+        # The follower has nothing to serve until the leader scanned on its behalf.
+        reading = asyncio.create_task(follower.get_jobs())
+        await asyncio.sleep(0.05)
+        assert await leader.tick(scan)
+        return await reading
+
+    jobs = asyncio.run(run())
+
+    assert jobs is not None
+    assert [job.id for job in jobs] == ["first", "second"]
+    assert scan.calls == 1
+    # The follower learns the measured scan duration from the snapshot.
+    assert follower.scan_seconds == leader.scan_seconds
+    assert leader.scan_seconds is not None
+    assert leader.scan_seconds >= 0.05
+    leader.release()
+
+
+def test_max_age_follows_the_scan_duration(path: str) -> None:
+    snapshot = JobSnapshot(path, interval=2.0)
+    assert snapshot.max_age == 10.0
+
+    snapshot.scan_seconds = 30.0
+    assert snapshot.max_age == 94.0
+
+    assert JobSnapshot(path, interval=2.0, max_age=1.0).max_age == 1.0
+
+
+def test_get_jobs_gives_up_without_a_leader(path: str) -> None:
+    follower = JobSnapshot(path, interval=0.2, max_age=0.2)
+
+    assert asyncio.run(follower.get_jobs()) is None
+    assert Path(follower.polled_path).exists()
+
+
+def test_publish_rewrites_only_changed_jobs(path: str) -> None:
+    leader = JobSnapshot(path)
+    first, second = make_job("first"), make_job("second")
+
+    async def run() -> list[int]:
+        await leader.publish([first, second], 0.1)
+        inodes = [Path(path).stat().st_ino]
+        os.utime(path, (0, 0))
+        # Redis returns the keys in another order, the jobs are the same.
+        await leader.publish([second, first], 0.1)
+        assert Path(path).stat().st_mtime > 0
+        inodes.append(Path(path).stat().st_ino)
+        await leader.publish([first], 0.1)
+        inodes.append(Path(path).stat().st_ino)
+        return inodes
+
+    inodes = asyncio.run(run())
+
+    assert inodes[0] == inodes[1]
+    assert inodes[1] != inodes[2]
@@ -0,0 +1,125 @@
+import asyncio
+import json
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import Any
+
+import msgpack
+import pytest
+from arq.jobs import Serializer
+from core.cache import LRUCache
+from core.depends import get_redis_pool
+from core.serializers import JobDecoder
+from schemas.job import JobsTimeStatistics, Statistics
+from services.aggregation import generate_statistics, generate_status_statistics
+from services.job_service import JobService
+from services.job_summary import summarize_jobs
+
+from tests.conftest import AddJob, FakeArqRedis, FreezeTime
+
+# In the middle of a minute, so that no job sits on the edge of a bucket.
+NOW = datetime(2024, 3, 15, 12, 30, 30, tzinfo=UTC)
+NOW_MS = int(NOW.timestamp() * 1000)
+MINUTE_MS = 60_000
+SERIALIZERS: dict[str, Serializer] = {
+    "json": lambda data: json.dumps(data, default=str).encode(),
+    "msgpack": lambda data: msgpack.packb(data, default=str),
+}
+Summary = tuple[Statistics, list[JobsTimeStatistics]]
+
+
+@pytest.fixture(autouse=True)
+def _frozen_now(freeze_time: FreezeTime) -> None:
+    freeze_time(NOW)
+
+
+async def add_mixed_jobs(add_job: AddJob, serializer: Serializer) -> None:
+    """Add jobs in every state, some of them older than the hour the summaries cover."""
+    states = ("queued", "deferred", "in_progress", "complete", "failed")
+    for index in range(90):
+        state = states[index % len(states)]
+        # Every 7.5 minutes from now back to over an hour ago.
+        enqueue_ms = NOW_MS - index * MINUTE_MS * 3 // 4 - 5_000
+        await add_job(
+            f"job-{index}",
+            state,
+            enqueue_ms,
+            start_ms=enqueue_ms + 2 * MINUTE_MS,
+            finish_ms=enqueue_ms + 5 * MINUTE_MS,
+            function=f"function_{index % 3}",
+            serializer=serializer,
+        )
+    # A job being finished has both a job and a result key for a moment.
+    await add_job("finishing", "queued", NOW_MS - MINUTE_MS, serializer=serializer)
+    await add_job(
+        "finishing",
+        "complete",
+        NOW_MS - MINUTE_MS,
+        start_ms=NOW_MS - MINUTE_MS,
+        finish_ms=NOW_MS - 5_000,
+        serializer=serializer,
+    )
+
+
+async def python_summary(serializer: str) -> Summary:
+    job_service = JobService(
+        get_redis_pool(),
+        LRUCache(capacity=1000),
+        JobDecoder(serializer, LRUCache(capacity=1000)),
+    )
+    jobs = await job_service.get_all_jobs()
+    return generate_status_statistics(jobs), generate_statistics(jobs)
+
+
+@pytest.mark.parametrize("serializer", SERIALIZERS)
+@pytest.mark.parametrize("scan_count", [1000, 7])
+def test_lua_summary_matches_python(
+    redis: FakeArqRedis,
+    add_job: AddJob,
+    serializer: str,
+    scan_count: int,
+) -> None:
+    async def summaries() -> tuple[Summary, Summary]:
+        if serializer == "msgpack" and not await redis.eval("return cmsgpack and 1 or 0", 0):
+            pytest.skip("The Lua runtime of the fake Redis has no cmsgpack.")
+        await add_mixed_jobs(add_job, SERIALIZERS[serializer])
+        expected = await python_summary(serializer)
+        summary = await summarize_jobs(redis, serializer, "arq:queue", scan_count=scan_count)
+        return expected, summary
+
+    (expected_statistics, expected_hourly), (statistics, hourly) = asyncio.run(summaries())
+
+    assert statistics == expected_statistics
+    assert hourly == expected_hourly
+    assert 0 < statistics.total < 91
+    assert statistics.queued
+    assert statistics.in_progress
+    assert statistics.failed
+    assert any(minute.total_completed_successfully for minute in hourly)
+
+
+def test_scan_pages_are_all_summarized(redis: FakeArqRedis, add_job: AddJob) -> None:
+    async def pages() -> tuple[int, Statistics]:
+        await add_mixed_jobs(add_job, SERIALIZERS["json"])
+        calls = 0
+        register_script: Callable[..., Any] = redis.register_script
+
+        def count_calls(script: str) -> Callable[..., Any]:
+            registered = register_script(script)
+
+            async def call(*args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+                nonlocal calls
+                calls += 1
+                return await registered(*args, **kwargs)
+
+            return call
+
+        redis.register_script = count_calls  # type: ignore[method-assign]
+        statistics, _ = await summarize_jobs(redis, "json", "arq:queue", scan_count=5)
+        return calls, statistics
+
+    calls, statistics = asyncio.run(pages())
+
+    # More than one page of job keys and of result keys.
+    assert calls > 4
+    assert statistics.total > 0
@@ -0,0 +1,146 @@
+import asyncio
+
+import core.limiter
+import pytest
+from core.limiter import AdaptiveLimiter
+
+
+class Clock:
+    """A ``perf_counter`` only moving when told to."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Get the time."""
+        return self.now
+
+
+@pytest.fixture()
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(core.limiter.time, "perf_counter", clock)
+    return clock
+
+
+def run_operations(limiter: AdaptiveLimiter, clock: Clock, latencies: list[float]) -> None:
+    async def run() -> None:
+        for latency in latencies:
+            async with limiter.acquire():
+                clock.now += latency
+
+    asyncio.run(run())
+
+
+def test_fast_operations_raise_the_limit_by_one_per_round(clock: Clock) -> None:
+    limiter = AdaptiveLimiter(initial_limit=4, latency_target=0.05)
+
+    run_operations(limiter, clock, [0.01] * 4)
+
+    expected = 4.0
+    for _ in range(4):
+        expected += 1 / expected
+    assert limiter.limit == pytest.approx(expected)
+    assert 4.9 < limiter.limit < 5
+
+
+def test_slow_operation_multiplies_the_limit_by_the_backoff(clock: Clock) -> None:
+    limiter = AdaptiveLimiter(initial_limit=10, latency_target=0.05, backoff=0.5)
+
+    run_operations(limiter, clock, [0.01, 0.1])
+
+    assert limiter.limit == pytest.approx((10 + 1 / 10) * 0.5)
+
+
+def test_latency_under_the_target_is_not_slow(clock: Clock) -> None:
+    limiter = AdaptiveLimiter(initial_limit=10, latency_target=0.05, tolerance=2.0)
+
+    # Four times the baseline, but still under the target.
+    run_operations(limiter, clock, [0.01, 0.04])
+
+    assert limiter.limit > 10
+
+
+def test_latency_under_the_tolerance_is_not_slow(clock: Clock) -> None:
+    limiter = AdaptiveLimiter(initial_limit=10, latency_target=0.05, tolerance=2.0)
+
+    # Over the target, but Redis is that slow for every operation.
+    run_operations(limiter, clock, [0.1, 0.15])
+
+    assert limiter.limit > 10
+
+
+def test_failed_operation_multiplies_the_limit_by_the_backoff(clock: Clock) -> None:
+    limiter = AdaptiveLimiter(initial_limit=10, backoff=0.5)
+
+    async def fail() -> None:
+        async with limiter.acquire():
+            raise ConnectionError
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(fail())
+
+    assert limiter.limit == 5
+    assert limiter.in_flight == 0
+
+
+def test_limit_stays_within_bounds(clock: Clock) -> None:
+    limiter = AdaptiveLimiter(initial_limit=2, min_limit=2, max_limit=3, backoff=0.5)
+
+    run_operations(limiter, clock, [0.01] * 20)
+    assert limiter.limit == 3
+
+    run_operations(limiter, clock, [1.0] * 5)
+    assert limiter.limit == 2
+
+
+def test_operations_over_the_limit_wait_in_order() -> None:
+    limiter = AdaptiveLimiter(initial_limit=2, max_limit=2)
+    started: list[int] = []
+
+    async def run() -> tuple[int, int]:
+        event = asyncio.Event()
+
+        async def operation(number: int) -> None:
+            async with limiter.acquire():
+                started.append(number)
+                await event.wait()
+
+        tasks = [asyncio.create_task(operation(number)) for number in range(5)]
+        await asyncio.sleep(0.01)
+        in_flight, waiting = limiter.in_flight, limiter.waiting
+        event.set()
+        await asyncio.gather(*tasks)
+        return in_flight, waiting
+
+    in_flight, waiting = asyncio.run(run())
+
+    assert (in_flight, waiting) == (2, 3)
+    assert started == [0, 1, 2, 3, 4]
+    assert limiter.in_flight == 0
+
+
+def test_cancelled_waiter_gives_its_place_up() -> None:
+    limiter = AdaptiveLimiter(initial_limit=1, max_limit=1)
+
+    async def run() -> None:
+        event = asyncio.Event()
+
+        async def operation() -> None:
+            async with limiter.acquire():
+                await event.wait()
+
+        running = asyncio.create_task(operation())
+        waiting = asyncio.create_task(operation())
+        await asyncio.sleep(0.01)
+        waiting.cancel()
+        await asyncio.sleep(0.01)
+        assert limiter.waiting == 0
+        event.set()
+        await running
+        # The slot is free again for the next operation.
+        await asyncio.wait_for(operation(), timeout=1)
+
+    asyncio.run(run())
+
+    assert limiter.in_flight == 0
@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+from arq.utils import timestamp_ms
+from core.depends import get_response_cache
+from core.metrics import index_age_gauge
+from endpoints.jobs import get_fresh_job_index
+from main import app, lifespan
+from services.job_index import JobIndex
+from services.job_refresher import JobRefresher
+
+from tests.conftest import AddJob, FakeArqRedis, api_client
+
+
+def test_scrape_serves_the_index_as_it_is(
+    redis: FakeArqRedis,
+    add_job: AddJob,
+    job_index: JobIndex,
+    job_refresher: JobRefresher,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(index_age_gauge, "values", {})
+
+    async def scrape() -> tuple[str, str, str, str]:
+        async with lifespan(app), api_client() as client:
+            await add_job("queued", "queued", timestamp_ms())
+            # The index was never filled, the scrape still doesn't read Redis.
+            unfilled = (await client.get("/arq/api/metrics")).text
+            await job_refresher.tick(lambda: get_fresh_job_index(max_age=0))
+            filled = (await client.get("/arq/api/metrics")).text
+            await add_job("failed", "failed", timestamp_ms())
+            # As if nobody had browsed the jobs for a while.
+            job_index.updated_at -= 60
+            polled = (await client.get("/arq/api/metrics")).text
+            # Refreshes are coalesced for JOBS_RESPONSE_TTL, as if it had passed.
+            get_response_cache().clear()
+            await job_refresher.tick(lambda: get_fresh_job_index(max_age=0))
+            refreshed = (await client.get("/arq/api/metrics")).text
+            return unfilled, filled, polled, refreshed
+
+    unfilled, filled, polled, refreshed = asyncio.run(scrape())
+
+    assert 'arq_ui_jobs{status="queued"} 0' in unfilled
+    assert "\narq_ui_index_age_seconds " not in unfilled
+    assert 'arq_ui_jobs{status="queued"} 1' in filled
+    assert "\narq_ui_index_age_seconds " in filled
+    assert 'arq_ui_jobs{status="failed"} 0' in polled
+    assert 'arq_ui_jobs{status="failed"} 1' in refreshed
+    assert job_refresher.polls == 4
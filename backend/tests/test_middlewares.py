@@ -0,0 +1,137 @@
+import asyncio
+import gzip
+
+import httpx
+from core.compression import CompressionMiddleware, negotiate_encoding
+from core.etag import ETagMiddleware, etag_matches, make_etag
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+BODY = b'{"jobs": [' + b",".join(b'{"id": "%d"}' % index for index in range(200)) + b"]}"
+
+
+async def large(request: Request) -> Response:
+    return Response(BODY, media_type="application/json")
+
+
+async def small(request: Request) -> Response:
+    return Response(b"{}", media_type="application/json")
+
+
+async def image(request: Request) -> Response:
+    return Response(BODY, media_type="image/png")
+
+
+async def created(request: Request) -> Response:
+    return Response(BODY, status_code=201, media_type="application/json")
+
+
+# Stacked as in the application: the ETag is computed on the uncompressed body.
+app = CompressionMiddleware(
+    ETagMiddleware(
+        Starlette(
+            routes=[
+                Route("/large", large),
+                Route("/small", small),
+                Route("/image", image),
+                Route("/created", created),
+            ],
+        ),
+    ),
+    encodings=("gzip",),
+)
+
+
+def get(path: str, **headers: str) -> httpx.Response:
+    async def request() -> httpx.Response:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            # The raw body is kept, httpx decodes it only when asked to.
+            response = await client.get(path, headers=headers)
+            await response.aread()
+            return response
+
+    return asyncio.run(request())
+
+
+def test_large_json_is_compressed_with_gzip() -> None:
+    response = get("/large", **{"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < len(BODY)
+    assert response.content == BODY
+
+
+def test_compressed_body_is_reused_for_the_same_etag() -> None:
+    etag = get("/large", **{"Accept-Encoding": "gzip"}).headers["etag"]
+
+    compressed = app.cache.get(f"gzip:{etag}")
+    assert compressed is not None
+    assert gzip.decompress(compressed) == BODY
+
+
+def test_uncompressed_without_gzip_but_still_varies() -> None:
+    response = get("/large", **{"Accept-Encoding": "identity"})
+
+    assert "content-encoding" not in response.headers
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.content == BODY
+
+
+def test_small_and_binary_responses_are_not_compressed() -> None:
+    assert "content-encoding" not in get("/small", **{"Accept-Encoding": "gzip"}).headers
+    response = get("/image", **{"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert "vary" not in response.headers
+
+
+def test_etag_is_the_same_whatever_the_encoding() -> None:
+    compressed = get("/large", **{"Accept-Encoding": "gzip"})
+    plain = get("/large", **{"Accept-Encoding": "identity"})
+
+    assert compressed.headers["etag"] == plain.headers["etag"] == make_etag(BODY)
+
+
+def test_matching_poll_gets_304_without_body() -> None:
+    etag = get("/large").headers["etag"]
+
+    response = get("/large", **{"If-None-Match": etag, "Accept-Encoding": "gzip"})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert "content-encoding" not in response.headers
+
+
+def test_changed_resource_gets_200() -> None:
+    response = get("/large", **{"If-None-Match": make_etag(b"old")})
+
+    assert response.status_code == 200
+    assert response.content == BODY
+
+
+def test_only_successful_responses_get_an_etag() -> None:
+    assert "etag" not in get("/created").headers
+
+
+def test_etag_matching() -> None:
+    etag = make_etag(BODY)
+
+    assert etag_matches(etag, "*")
+    assert etag_matches(etag, etag.removeprefix("W/"))
+    assert etag_matches(etag, f'"other", {etag}')
+    assert not etag_matches(etag, '"other"')
+
+
+def test_negotiate_encoding() -> None:
+    encodings = ["zstd", "br", "gzip"]
+
+    assert negotiate_encoding("gzip, br", encodings) == "br"
+    assert negotiate_encoding("br;q=0, gzip", encodings) == "gzip"
+    assert negotiate_encoding("*", encodings) == "zstd"
+    assert negotiate_encoding("identity", encodings) is None
+    assert negotiate_encoding("", encodings) is None
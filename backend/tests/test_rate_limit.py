@@ -0,0 +1,36 @@
+import endpoints.jobs
+import pytest
+from core.config import Settings
+from endpoints.jobs import client_id
+from fastapi import Request
+
+
+def request_from(address: str, headers: dict[str, str]) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "headers": [
+                (name.lower().encode(), value.encode())
+                for name, value in headers.items()
+            ],
+            "client": (address, 50000),
+        },
+    )
+
+
+def test_rate_limit_is_off_by_default(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("RATE_LIMIT_RATE")
+
+    assert Settings(_env_file=None).rate_limit_rate == 0
+
+
+def test_client_is_the_address_the_proxy_appended(monkeypatch: pytest.MonkeyPatch) -> None:
+    forged = request_from("10.0.0.1", {"X-Forwarded-For": "1.2.3.4, 203.0.113.7"})
+    direct = request_from("10.0.0.1", {})
+
+    assert client_id(forged) == "10.0.0.1"
+
+    monkeypatch.setattr(endpoints.jobs.settings, "rate_limit_client_header", "X-Forwarded-For")
+
+    assert client_id(forged) == "203.0.113.7"
+    assert client_id(direct) == "10.0.0.1"
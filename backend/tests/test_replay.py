@@ -0,0 +1,82 @@
+import asyncio
+import contextlib
+import logging
+from datetime import UTC, datetime
+from pathlib import Path
+
+import arq.jobs
+import core.depends
+import pytest
+from arq.jobs import serialize_job
+from arq.utils import timestamp_ms
+from core.depends import get_job_decoder, job_service_singleton
+from main import app, lifespan
+from services.job_replay import JobReplay, capture_header, capture_line
+
+from tests.conftest import AddJob, FakeArqRedis, api_client
+
+
+def replay_capture(monkeypatch: pytest.MonkeyPatch, path: Path) -> JobReplay:
+    """Serve the jobs from a capture file instead of Redis."""
+    replay = JobReplay(str(path), get_job_decoder())
+    monkeypatch.setattr(core.depends, "job_snapshot_singleton", replay)
+    monkeypatch.setattr(job_service_singleton, "snapshot", replay)
+    return replay
+
+
+def get_statuses(*urls: str, method: str = "GET") -> list[int]:
+    """Get the status codes of requests sent once the capture file is read."""
+
+    async def get() -> list[int]:
+        async with lifespan(app), api_client() as client:
+            with contextlib.suppress(ValueError):
+                await core.depends.job_snapshot_singleton.get_jobs()
+            return [(await client.request(method, url)).status_code for url in urls]
+
+    return asyncio.run(get())
+
+
+def test_job_missing_from_capture_is_not_read_from_redis(
+    redis: FakeArqRedis,
+    add_job: AddJob,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    capture = tmp_path / "capture.jsonl"
+    raw = serialize_job("download_content", (), {}, 1, timestamp_ms())
+    capture.write_text(
+        capture_header("pickle", datetime.now(UTC))
+        + "\n"
+        + capture_line("captured", arq.jobs.JobStatus.queued, raw)
+        + "\n",
+    )
+    replay_capture(monkeypatch, capture)
+    asyncio.run(add_job("live", "queued", timestamp_ms()))
+
+    statuses = get_statuses(
+        "/arq/api/jobs/captured",
+        "/arq/api/jobs/live",
+        "/arq/api/jobs?ids=captured&ids=live",
+    )
+
+    assert statuses == [200, 404, 200]
+    assert get_statuses("/arq/api/jobs/live", method="DELETE") == [409]
+
+
+def test_failed_capture_load_is_reported(
+    redis: FakeArqRedis,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    capture = tmp_path / "capture.jsonl"
+    capture.write_text('{"format": "something else"}\n')
+    replay = replay_capture(monkeypatch, capture)
+
+    with caplog.at_level(logging.ERROR, logger="services.job_replay"):
+        [status_code] = get_statuses("/arq/api/health/ready")
+
+    assert status_code == 503
+    assert replay.error is not None
+    assert "isn't a capture of arq jobs" in replay.error
+    assert replay.error in caplog.text
@@ -0,0 +1,131 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+from itertools import pairwise
+from typing import Any
+from zoneinfo import ZoneInfo
+
+import endpoints.jobs
+import pytest
+import schemas.job
+from main import app, lifespan
+
+from tests.conftest import AddJob, FakeArqRedis, FreezeTime, api_client
+
+MOSCOW = ZoneInfo("Europe/Moscow")
+# Clocks went forward from 02:00 +01:00 to 03:00 +02:00 at 01:00 UTC that day.
+BERLIN = ZoneInfo("Europe/Berlin")
+
+
+def ms(value: datetime) -> int:
+    return int(value.timestamp() * 1000)
+
+
+@pytest.fixture()
+def use_timezone(monkeypatch: pytest.MonkeyPatch) -> Any:  # noqa: ANN401
+    """Get a function setting the TIMEZONE the API reads and displays times in."""
+
+    def use(zone: ZoneInfo) -> None:
+        monkeypatch.setattr(schemas.job, "timezone", zone)
+        monkeypatch.setattr(endpoints.jobs, "get_timezone", lambda: zone)
+
+    return use
+
+
+def get_json(url: str, **params: Any) -> Any:  # noqa: ANN401
+    async def get() -> Any:  # noqa: ANN401
+        async with lifespan(app), api_client() as client:
+            response = await client.get(url, params=params)
+            assert response.status_code == 200
+            return response.json()
+
+    return asyncio.run(get())
+
+
+def created_buckets(statistics: list[dict[str, Any]]) -> list[str]:
+    return [minute["date"] for minute in statistics if minute["total_created"]]
+
+
+def test_hourly_buckets_in_fixed_offset_zone(
+    redis: FakeArqRedis,
+    add_job: AddJob,
+    freeze_time: FreezeTime,
+    use_timezone: Any,  # noqa: ANN401
+) -> None:
+    now = datetime(2024, 3, 15, 12, 30, 30, tzinfo=UTC)
+    freeze_time(now)
+    use_timezone(MOSCOW)
+    enqueued = datetime(2024, 3, 15, 12, 0, 10, tzinfo=UTC)
+    asyncio.run(
+        add_job(
+            "complete",
+            "complete",
+            ms(enqueued),
+            start_ms=ms(enqueued + timedelta(seconds=10)),
+            finish_ms=ms(enqueued + timedelta(minutes=5, seconds=30)),
+        ),
+    )
+
+    statistics = get_json("/arq/api/jobs/statistics/hourly")
+
+    assert len(statistics) == 60
+    assert statistics[0]["date"] == "2024-03-15T14:31:00+03:00"
+    assert statistics[-1]["date"] == "2024-03-15T15:30:00+03:00"
+    assert created_buckets(statistics) == ["2024-03-15T15:00:00+03:00"]
+    assert [
+        minute["date"] for minute in statistics if minute["total_completed_successfully"]
+    ] == ["2024-03-15T15:05:00+03:00"]
+
+
+def test_hourly_buckets_across_dst_change(
+    redis: FakeArqRedis,
+    add_job: AddJob,
+    freeze_time: FreezeTime,
+    use_timezone: Any,  # noqa: ANN401
+) -> None:
+    now = datetime(2024, 3, 31, 1, 30, 30, tzinfo=UTC)
+    freeze_time(now)
+    use_timezone(BERLIN)
+
+    async def add_jobs() -> None:
+        # The last minute before the change, and the first one after it.
+        await add_job("before", "queued", ms(datetime(2024, 3, 31, 0, 59, 50, tzinfo=UTC)))
+        await add_job("after", "queued", ms(datetime(2024, 3, 31, 1, 0, 10, tzinfo=UTC)))
+
+    asyncio.run(add_jobs())
+
+    statistics = get_json("/arq/api/jobs/statistics/hourly")
+
+    dates = [datetime.fromisoformat(minute["date"]) for minute in statistics]
+    # Still 60 consecutive minutes, though the wall clock skips an hour.
+    assert [later - earlier for earlier, later in pairwise(dates)] == [
+        timedelta(minutes=1),
+    ] * 59
+    assert statistics[0]["date"] == "2024-03-31T01:31:00+01:00"
+    assert statistics[-1]["date"] == "2024-03-31T03:30:00+02:00"
+    assert created_buckets(statistics) == [
+        "2024-03-31T01:59:00+01:00",
+        "2024-03-31T03:00:00+02:00",
+    ]
+
+
+def test_naive_time_filter_is_in_configured_zone(
+    redis: FakeArqRedis,
+    add_job: AddJob,
+    freeze_time: FreezeTime,
+    use_timezone: Any,  # noqa: ANN401
+) -> None:
+    freeze_time(datetime(2024, 3, 15, 12, 30, 30, tzinfo=UTC))
+    use_timezone(MOSCOW)
+
+    async def add_jobs() -> None:
+        await add_job("earlier", "queued", ms(datetime(2024, 3, 15, 11, 59, tzinfo=UTC)))
+        await add_job("later", "queued", ms(datetime(2024, 3, 15, 12, 1, tzinfo=UTC)))
+
+    asyncio.run(add_jobs())
+
+    # 15:00 in Moscow is 12:00 UTC.
+    jobs_info = get_json("/arq/api/jobs", start_time="2024-03-15T15:00:00")
+
+    jobs = jobs_info["paged_jobs"]["items"]
+    assert [job["id"] for job in jobs] == ["later"]
+    assert jobs[0]["enqueue_time"] == "2024-03-15T15:01:00+03:00"
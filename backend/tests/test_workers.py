@@ -0,0 +1,36 @@
+import asyncio
+
+from core.depends import redis_pool_singleton
+from core.limiter import AdaptiveLimiter
+from services.worker_monitor import WorkerMonitor
+
+from tests.conftest import AddJob, FakeArqRedis
+
+HEALTH_CHECK = "Mar-15 12:30:00 j_complete={} j_failed=1 j_retried=0 j_ongoing={} queued=4"
+
+
+def test_in_progress_is_reported_by_live_workers(redis: FakeArqRedis, add_job: AddJob) -> None:
+    async def get_workers() -> tuple[list[bool], int, int]:
+        await redis.set("first:health-check", HEALTH_CHECK.format(10, 2), ex=60)
+        await redis.set("second:health-check", HEALTH_CHECK.format(20, 3), ex=60)
+        # Jobs left with an in-progress key aren't counted, only what workers report.
+        await add_job("stale", "in_progress", 0)
+        monitor = WorkerMonitor(
+            redis_pool_singleton,
+            ["first:health-check", "second:health-check", "gone:health-check"],
+            limiter=AdaptiveLimiter(),
+        )
+        workers_info = await monitor.get_workers()
+        await redis.delete("second:health-check")
+        stopped_info = await monitor.get_workers()
+        return (
+            [worker.alive for worker in workers_info.workers],
+            workers_info.in_progress,
+            stopped_info.in_progress,
+        )
+
+    alive, in_progress, in_progress_after_stop = asyncio.run(get_workers())
+
+    assert alive == [True, True, False]
+    assert in_progress == 5
+    assert in_progress_after_stop == 2
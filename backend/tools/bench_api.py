@@ -0,0 +1,189 @@
+"""Benchmark the API against a local Redis seeded with synthetic jobs.
+
+For every dataset size the arq keys are cleared, synthetic jobs are written with
+``worker/seeder.py`` and every endpoint is requested by concurrent clients.
+The report (JSON) contains latency percentiles, the Redis commands executed during
+the run and the resident memory of the server, so runs can be compared across commits.
+
+Start the server first (``cd src && MAX_JOBS=600000 uvicorn main:app``, add
+``JOBS_RESPONSE_TTL=0`` to measure without the response cache), then from the backend
+directory::
+
+    pdm run python tools/bench_api.py --sizes 10000 50000 --server-pid $(pgrep -f uvicorn)
+"""
+
+import argparse
+import asyncio
+import http.client
+import json
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src" / "worker"))
+from arq import ArqRedis, create_pool
+from core.config import Settings, get_app_settings
+from core.depends import get_redis_settings
+from redis.exceptions import RedisError
+from seeder import clear_jobs, seed_jobs
+
+settings: Settings = get_app_settings()
+
+DEFAULT_ENDPOINTS = [
+    "/arq/api/jobs?limit=50&sort_by=enqueue_time",
+    "/arq/api/jobs?limit=50&search=fuel",
+    "/arq/api/jobs/statistics/hourly",
+    "/arq/api/status",
+]
+
+
+def percentile(values: list[float], percent: float) -> float:
+    """Get a percentile with linear interpolation."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    position = (len(ordered) - 1) * percent / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def run_client(base_url: str, path: str, requests: int) -> tuple[list[float], int]:
+    """Send requests one after another over a keep-alive connection."""
+    url = urlsplit(base_url)
+    connection = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=300)
+    latencies = []
+    errors = 0
+    for _ in range(requests):
+        started = time.perf_counter()
+        connection.request("GET", path)
+        response = connection.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - started)
+        if response.status != 200:  # noqa: PLR2004
+            errors += 1
+    connection.close()
+    return latencies, errors
+
+
+def drive(base_url: str, path: str, concurrency: int, requests: int) -> dict[str, Any]:
+    """Run ``concurrency`` clients sending ``requests`` requests each."""
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        clients = [pool.submit(run_client, base_url, path, requests) for _ in range(concurrency)]
+        results = [client.result() for client in clients]
+    elapsed = time.perf_counter() - started
+
+    latencies = [latency for client_latencies, _ in results for latency in client_latencies]
+    return {
+        "requests": len(latencies),
+        "errors": sum(errors for _, errors in results),
+        "rps": round(len(latencies) / elapsed, 2),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2),
+    }
+
+
+async def redis_info(redis: ArqRedis, section: str) -> dict[str, Any]:
+    """Get a section of ``INFO``, empty if the server doesn't support it."""
+    try:
+        return await redis.info(section)
+    except RedisError:
+        return {}
+
+
+async def command_stats(redis: ArqRedis) -> dict[str, int]:
+    """Get the number of calls per Redis command since the server started."""
+    info = await redis_info(redis, "commandstats")
+    return {name.removeprefix("cmdstat_"): stats["calls"] for name, stats in info.items()}
+
+
+def rss_bytes(pid: int | None) -> int | None:
+    """Get the resident memory of the server process (Linux only)."""
+    if pid is None:
+        return None
+    for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+        if line.startswith("VmRSS:"):
+            return int(line.split()[1]) * 1024
+    return None
+
+
+def git_revision() -> str | None:
+    """Get the current commit, to label the report."""
+    command = ["git", "rev-parse", "--short", "HEAD"]
+    try:
+        return subprocess.check_output(command, text=True).strip()  # noqa: S603
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    redis = await create_pool(get_redis_settings(), default_queue_name=settings.queue_name)
+    report: dict[str, Any] = {
+        "revision": git_revision(),
+        "concurrency": args.concurrency,
+        "requests_per_client": args.requests,
+        "datasets": [],
+    }
+    for size in args.sizes:
+        await clear_jobs(redis)
+        seeded = await seed_jobs(redis, size, serializer_name=args.serializer)
+        dataset: dict[str, Any] = {"jobs": size, "seeded": seeded, "endpoints": {}}
+        for path in args.endpoints:
+            # The first request warms the caches, it is reported separately.
+            cold = await asyncio.to_thread(run_client, args.url, path, 1)
+            before = await command_stats(redis)
+            result = await asyncio.to_thread(
+                drive,
+                args.url,
+                path,
+                args.concurrency,
+                args.requests,
+            )
+            after = await command_stats(redis)
+            result["cold_ms"] = round(cold[0][0] * 1000, 2)
+            result["redis_commands"] = {
+                name: calls - before.get(name, 0)
+                for name, calls in after.items()
+                if calls - before.get(name, 0) > 0
+            }
+            result["rss_bytes"] = rss_bytes(args.server_pid)
+            dataset["endpoints"][path] = result
+        dataset["redis_used_memory"] = (await redis_info(redis, "memory")).get("used_memory")
+        report["datasets"].append(dataset)
+
+    if not args.keep:
+        await clear_jobs(redis)
+    await redis.aclose()
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 50000])
+    parser.add_argument("--endpoints", nargs="+", default=DEFAULT_ENDPOINTS)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=20, help="Requests per client.")
+    parser.add_argument("--serializer", default=settings.job_serializer)
+    parser.add_argument("--server-pid", type=int, default=None, help="Report the server RSS.")
+    parser.add_argument("--keep", action="store_true", help="Keep the last dataset in Redis.")
+    parser.add_argument("--output", type=Path, default=None, help="Write the report to a file.")
+    args = parser.parse_args()
+
+    report = json.dumps(asyncio.run(run(args)), indent=2)
+    if args.output:
+        args.output.write_text(report)
+    print(report)  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
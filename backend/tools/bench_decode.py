@@ -0,0 +1,99 @@
+"""Benchmark decoding of arq job results.
+
+Usage (from the backend directory)::
+
+    pdm run python tools/bench_decode.py --jobs 50000 --serializer msgpack
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import pickle
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+from arq.jobs import serialize_result
+from core.cache import LRUCache
+from core.serializers import JobDecoder, decode_payloads
+
+
+def get_serializer(name: str) -> Callable[[dict[str, Any]], bytes]:
+    if name == "msgpack":
+        import msgpack  # noqa: PLC0415
+
+        return msgpack.packb
+    if name == "json":
+        return lambda data: json.dumps(data).encode()
+    return pickle.dumps
+
+
+def generate_results(count: int, serializer_name: str) -> list[tuple[bytes, bool]]:
+    serializer = get_serializer(serializer_name)
+    now_ms = int(time.time() * 1000)
+    payloads = []
+    for index in range(count):
+        raw = serialize_result(
+            function="check_fuel_system",
+            args=[],
+            kwargs={"is_successful": index % 10 != 0},
+            job_try=1,
+            enqueue_time_ms=now_ms - 5000,
+            success=index % 10 != 0,
+            result={"fuel_level": index / 7, "pumps_status": "active"},
+            start_ms=now_ms - 4000,
+            finished_ms=now_ms,
+            ref=str(index),
+            queue_name="arq:queue",
+            job_id=f"{index:032x}",
+            serializer=serializer,
+        )
+        payloads.append((raw, True))
+    return payloads
+
+
+async def run(count: int, serializer: str, pool_workers: int | None) -> dict[str, float]:
+    payloads = generate_results(count, serializer)
+    timings: dict[str, float] = {}
+
+    started = time.perf_counter()
+    decode_payloads(payloads, serializer)
+    timings["inline"] = time.perf_counter() - started
+
+    decoder = JobDecoder(
+        serializer,
+        LRUCache(capacity=count),
+        process_pool_threshold=1,
+        process_pool_workers=pool_workers,
+    )
+    # Start the worker processes before measuring.
+    await decoder.decode_many(payloads[: pool_workers or os.cpu_count() or 1])
+    decoder.cache = LRUCache(capacity=count)
+
+    started = time.perf_counter()
+    await decoder.decode_many(payloads)
+    timings["process_pool"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    await decoder.decode_many(payloads)
+    timings["cached"] = time.perf_counter() - started
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=50000)
+    parser.add_argument("--serializer", default="pickle", choices=["pickle", "msgpack", "json"])
+    parser.add_argument("--pool-workers", type=int, default=None)
+    args = parser.parse_args()
+
+    timings = asyncio.run(run(args.jobs, args.serializer, args.pool_workers))
+    print(json.dumps({"jobs": args.jobs, "serializer": args.serializer, "seconds": timings}))  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Benchmark serialization of the jobs page and hourly statistics.
+
+Compares what FastAPI does with a ``response_model`` (dump, validate again,
+``jsonable_encoder``, ``json.dumps``) with ``core.responses.dump_json`` and checks that
+both produce the same bytes.
+
+Usage (from the backend directory)::
+
+    pdm run python tools/bench_serialize.py --page-size 500
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+from core.responses import dump_json, get_type_adapter
+from fastapi.encoders import jsonable_encoder
+from schemas.job import Job, JobsInfo, JobsQuery, JobStatus, JobsTimeStatistics
+from services.aggregation import build_jobs_info
+from starlette.responses import JSONResponse
+
+
+def generate_jobs(count: int) -> list[Job]:
+    now = datetime.now(UTC)
+    jobs = []
+    for index in range(count):
+        enqueue_time = now - timedelta(seconds=index % 3600)
+        complete = index % 4 != 0
+        jobs.append(
+            Job(
+                id=f"{index:032x}",
+                status=JobStatus.complete if complete else JobStatus.queued,
+                success=index % 10 != 0,
+                enqueue_time=enqueue_time,
+                result='{"fuel_level": 0.75, "pumps_status": "active"}' if complete else None,
+                start_time=enqueue_time + timedelta(seconds=1) if complete else None,
+                finish_time=enqueue_time + timedelta(seconds=3.5) if complete else None,
+                queue_name="arq:queue",
+                execution_duration=2.5 if complete else None,
+                function="check_fuel_system",
+                args=[index, "tank-1"],
+                kwargs="{'is_successful': True}",
+                job_try=1,
+            ),
+        )
+    return jobs
+
+
+def default_fastapi(type_: Any, content: Any) -> bytes:  # noqa: ANN401
+    adapter = get_type_adapter(type_)
+    dumped = adapter.dump_python(content, by_alias=True)
+    validated = adapter.validate_python(dumped)
+    return JSONResponse(
+        jsonable_encoder(adapter.dump_python(validated, mode="json", by_alias=True)),
+    ).body
+
+
+def measure(func: Callable[[], bytes], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=10000)
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    jobs_info = build_jobs_info(generate_jobs(args.jobs), JobsQuery(limit=args.page_size))
+    cases = {
+        "jobs_page": (JobsInfo, jobs_info),
+        "statistics_hourly": (list[JobsTimeStatistics], jobs_info.statistics_hourly),
+    }
+
+    report: dict[str, Any] = {"jobs": args.jobs, "page_size": args.page_size}
+    for name, (type_, content) in cases.items():
+        expected = default_fastapi(type_, content)
+        if dump_json(type_, content) != expected:
+            raise SystemExit(f"{name}: the fast path produced different bytes.")
+        default = measure(lambda t=type_, c=content: default_fastapi(t, c), args.repeat)
+        fast = measure(lambda t=type_, c=content: dump_json(t, c), args.repeat)
+        report[name] = {
+            "bytes": len(expected),
+            "default_ms": round(default * 1000, 3),
+            "fast_ms": round(fast * 1000, 3),
+            "speedup": round(default / fast, 2),
+        }
+    print(json.dumps(report))  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
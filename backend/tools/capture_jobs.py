@@ -0,0 +1,85 @@
+"""Capture the arq jobs of a Redis database into a file arq-ui can replay.
+
+Every job is written as a JSON line with its status and its raw job definition or
+result, as read by the API. The keys are walked with SCAN and fetched in pipelined
+batches, so the capture runs in bounded memory whatever the number of jobs. A name
+ending with ``.gz`` compresses the file.
+
+Start arq-ui with ``REPLAY_PATH=<file>`` to browse the capture without Redis, e.g. to
+look into an incident after the fact or to benchmark against a fixed dataset. An RDB
+file is captured by loading it into a local ``redis-server`` first::
+
+    pdm run python tools/capture_jobs.py jobs.jsonl.gz
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+import arq.constants
+import arq.jobs
+from core.config import Settings, get_app_settings
+from core.depends import get_job_service
+from services.job_replay import capture_header, capture_line, open_capture
+
+settings: Settings = get_app_settings()
+
+
+async def capture(path: str, batch_size: int) -> dict[str, int]:
+    """Write the jobs found in Redis to a capture file, returning the count by status."""
+    job_service = await get_job_service()
+    redis = await job_service.redis_pool.get()
+    counts: dict[str, int] = {}
+    with open_capture(path, "wt") as file:
+        file.write(capture_header(settings.job_serializer, datetime.now(UTC)) + "\n")
+        for prefix in (arq.constants.job_key_prefix, arq.constants.result_key_prefix):
+            async for keys in scan_batches(redis, prefix + "*", batch_size):
+                job_ids = [key.decode().removeprefix(prefix) for key in keys]
+                raw_jobs = await job_service.fetch_jobs_raw(redis, job_ids)
+                for job_id, (status, raw) in zip(job_ids, raw_jobs, strict=True):
+                    # A job being finished has both keys, it is captured through its result.
+                    is_result = status == arq.jobs.JobStatus.complete
+                    if raw is None or is_result != (prefix == arq.constants.result_key_prefix):
+                        continue
+                    file.write(capture_line(job_id, status, raw) + "\n")
+                    counts[status.value] = counts.get(status.value, 0) + 1
+    await job_service.redis_pool.close()
+    return counts
+
+
+async def scan_batches(
+    redis: arq.ArqRedis,
+    pattern: str,
+    batch_size: int,
+) -> AsyncIterator[list[bytes]]:
+    """Yield the keys matching a pattern, a SCAN page at a time."""
+    cursor = 0
+    while True:
+        cursor, keys = await redis.scan(cursor, match=pattern, count=batch_size)
+        if keys:
+            yield keys
+        if cursor == 0:
+            break
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path", help="capture file, compressed if it ends with .gz")
+    parser.add_argument("--batch-size", type=int, default=settings.fetch_batch_size)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    counts = asyncio.run(capture(args.path, args.batch_size))
+    print(  # noqa: T201
+        json.dumps({"jobs": counts, "seconds": round(time.perf_counter() - started, 2)}),
+    )
+
+
+if __name__ == "__main__":
+    main()
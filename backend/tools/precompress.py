@@ -0,0 +1,54 @@
+"""Write precompressed variants of the UI build for the static file server.
+
+Next to every compressible file of at least ``--min-size`` bytes, writes ``.gz`` and,
+when the optional libraries are installed, ``.br`` and ``.zst`` variants at the best
+compression level. A variant which is not smaller than the original is not kept.
+
+Usage (from the backend directory, after the frontend build is copied)::
+
+    pdm run python tools/precompress.py src/static
+"""
+
+import argparse
+import json
+import mimetypes
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+from core.compression import BEST_LEVELS, COMPRESSORS, is_compressible
+from core.static import PRECOMPRESSED_SUFFIXES
+
+
+def precompress(directory: Path, min_size: int) -> dict[str, int]:
+    written = dict.fromkeys(COMPRESSORS, 0)
+    suffixes = set(PRECOMPRESSED_SUFFIXES.values())
+    for path in sorted(directory.rglob("*")):
+        if not path.is_file() or path.suffix in suffixes:
+            continue
+        content_type, _ = mimetypes.guess_type(path.name)
+        data = path.read_bytes()
+        if content_type is None or not is_compressible(content_type) or len(data) < min_size:
+            continue
+        for encoding, compress in COMPRESSORS.items():
+            variant = path.with_name(path.name + PRECOMPRESSED_SUFFIXES[encoding])
+            compressed = compress(data, BEST_LEVELS[encoding])
+            if len(compressed) < len(data):
+                variant.write_bytes(compressed)
+                written[encoding] += 1
+            else:
+                variant.unlink(missing_ok=True)
+    return written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("directory", type=Path)
+    parser.add_argument("--min-size", type=int, default=1024)
+    args = parser.parse_args()
+
+    print(json.dumps(precompress(args.directory, args.min_size)))  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
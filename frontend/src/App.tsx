@@ -12,17 +12,30 @@ import { useEffect } from "react";
 
 import "@mantine/core/styles.css";
 import "@mantine/notifications/styles.css";
+import { Breakdown } from "./components/breakdown";
 import { Filters } from "./components/filters";
 import Footer from "./components/footer";
 import { Header } from "./components/header";
 import { Statistics } from "./components/statistics";
 import { TableJobs } from "./components/tablejobs";
 import { TimeLine } from "./components/timeline";
+import { Workers } from "./components/workers";
 import { rootStore } from "./stores";
 
 function App() {
   useEffect(() => {
     rootStore.loadData();
+    rootStore.loadWorkers();
+    // Heartbeats are recorded when the workers are polled, which keeps their history.
+    // Workers write a health check every `health_check_interval`, an hour by default,
+    // so a slow poll notices them soon enough.
+    const interval = setInterval(() => rootStore.loadWorkers(), 60000);
+    // Only the changes since the last poll are transferred.
+    const changesInterval = setInterval(() => rootStore.loadChanges(), 5000);
+    return () => {
+      clearInterval(interval);
+      clearInterval(changesInterval);
+    };
   }, []);
   return (
     <>
@@ -40,6 +53,8 @@ function App() {
               <Stack gap="xl">
                 <Statistics />
                 <TimeLine />
+                <Workers />
+                <Breakdown />
                 <Filters />
                 <TableJobs />
               </Stack>
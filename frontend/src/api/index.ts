@@ -1,4 +1,11 @@
-import { IFetchJobsParams, IJob, IJobsInfo } from "./types";
+import {
+  IBreakdown,
+  IFetchJobsParams,
+  IJob,
+  IJobChanges,
+  IJobsInfo,
+  IWorkersInfo,
+} from "./types";
 
 function joinPathsSafely(basePath: string, relativePath: string): string {
   const trimmedBasePath = basePath.endsWith("/")
@@ -49,6 +56,27 @@ export function fetchJobs(params: IFetchJobsParams = {}): Promise<IJobsInfo> {
   });
 }
 
+/**
+ * Fetches the jobs changed since a version token, or only the current token.
+ */
+export function fetchChanges(since?: string): Promise<IJobChanges> {
+  const changesUrl = joinPathsSafely(
+    import.meta.env.VITE_API_HOST,
+    "jobs/changes",
+  );
+  const url = since
+    ? `${changesUrl}?${new URLSearchParams({ since }).toString()}`
+    : changesUrl;
+
+  return fetch(url).then(async (response) => {
+    const data = await response.json();
+    if (!response.ok) {
+      throw new Error(data.text || "Unknown error");
+    }
+    return data as IJobChanges;
+  });
+}
+
 export function abortJob(jobId: string): Promise<void> {
   const jobsUrl = joinPathsSafely(import.meta.env.VITE_API_HOST, "jobs");
   const url = `${jobsUrl}/${jobId}`;
@@ -73,3 +101,33 @@ export function fetchJob(jobId: string): Promise<IJob> {
     return data;
   });
 }
+
+/**
+ * Fetches the workers and their recent heartbeats from their health-check keys.
+ */
+export function fetchWorkers(): Promise<IWorkersInfo> {
+  const url = joinPathsSafely(import.meta.env.VITE_API_HOST, "workers");
+
+  return fetch(url).then(async (response) => {
+    const data = await response.json();
+    if (!response.ok) {
+      throw new Error(data.text || "Unknown error");
+    }
+    return data as IWorkersInfo;
+  });
+}
+
+/**
+ * Fetches the jobs broken down by function and by queue.
+ */
+export function fetchBreakdown(): Promise<IBreakdown> {
+  const url = joinPathsSafely(import.meta.env.VITE_API_HOST, "jobs/breakdown");
+
+  return fetch(url).then(async (response) => {
+    const data = await response.json();
+    if (!response.ok) {
+      throw new Error(data.text || "Unknown error");
+    }
+    return data as IBreakdown;
+  });
+}
@@ -45,6 +45,19 @@ export interface IJobsInfo {
   functions: string[];
   statistics: IStatistics;
   statistics_hourly: IJobsTimeStatistics[];
+  partial: boolean;
+  progress: number;
+  index_age: number | null;
+}
+
+export interface IJobChanges {
+  version: string;
+  reset: boolean;
+  created: IJob[];
+  updated: IJob[];
+  removed: string[];
+  statistics_delta: IStatistics;
+  index_age: number | null;
 }
 
 export interface IDetailItem {
@@ -75,3 +88,46 @@ export interface IJobsTimeStatistics {
   color: ColorStatistics;
   color_intensity: number;
 }
+
+export interface IWorkerHeartbeat {
+  time: Date;
+  jobs_complete: number;
+  jobs_failed: number;
+  jobs_retried: number;
+  jobs_ongoing: number;
+  queued: number;
+}
+
+export interface IWorker {
+  health_check_key: string;
+  alive: boolean;
+  seconds_since_heartbeat: number | null;
+  seconds_to_expiry: number | null;
+  throughput: number | null;
+  last: IWorkerHeartbeat | null;
+  history: IWorkerHeartbeat[];
+}
+
+export interface IWorkersInfo {
+  workers: IWorker[];
+  in_progress: number;
+}
+
+export interface IBreakdownRow {
+  name: string;
+  total: number;
+  queued: number;
+  in_progress: number;
+  completed: number;
+  failed: number;
+  success_rate: number | null;
+  avg_duration: number | null;
+  p95_duration: number | null;
+  avg_queue_wait: number | null;
+  p95_queue_wait: number | null;
+}
+
+export interface IBreakdown {
+  functions: IBreakdownRow[];
+  queues: IBreakdownRow[];
+}
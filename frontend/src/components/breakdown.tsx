@@ -0,0 +1,89 @@
+import {
+  Group,
+  Paper,
+  ScrollArea,
+  SegmentedControl,
+  Table,
+  Text,
+} from "@mantine/core";
+import { observer } from "mobx-react-lite";
+import { useState } from "react";
+
+import { rootStore } from "../stores";
+
+function formatSeconds(seconds: number | null): string {
+  if (seconds === null) return "-";
+  if (seconds < 1) return `${Math.round(seconds * 1000)}ms`;
+  if (seconds < 60) return `${seconds.toFixed(1)}s`;
+  if (seconds < 3600) return `${(seconds / 60).toFixed(1)}m`;
+  return `${(seconds / 3600).toFixed(1)}h`;
+}
+
+function formatRate(rate: number | null): string {
+  return rate === null ? "-" : `${(rate * 100).toFixed(1)}%`;
+}
+
+export const Breakdown = observer(() => {
+  const [groupBy, setGroupBy] = useState<"functions" | "queues">("functions");
+  const breakdownRows = rootStore.breakdown[groupBy];
+  if (!breakdownRows.length) {
+    return null;
+  }
+  const rows = breakdownRows.map((row) => (
+    <Table.Tr key={row.name}>
+      <Table.Td>
+        <Text size="sm">{row.name}</Text>
+      </Table.Td>
+      <Table.Td>{row.total}</Table.Td>
+      <Table.Td>{row.queued}</Table.Td>
+      <Table.Td>{row.in_progress}</Table.Td>
+      <Table.Td>{`${row.completed} / ${row.failed}`}</Table.Td>
+      <Table.Td>{formatRate(row.success_rate)}</Table.Td>
+      <Table.Td>
+        {formatSeconds(row.avg_duration)} / {formatSeconds(row.p95_duration)}
+      </Table.Td>
+      <Table.Td>
+        {formatSeconds(row.avg_queue_wait)} /{" "}
+        {formatSeconds(row.p95_queue_wait)}
+      </Table.Td>
+    </Table.Tr>
+  ));
+
+  return (
+    <Paper withBorder p="md" radius="md" shadow="sm">
+      <Group justify="space-between" mb="sm">
+        <Text size="xs" c="dimmed" fw={700} tt="uppercase">
+          Breakdown
+        </Text>
+        <SegmentedControl
+          size="xs"
+          value={groupBy}
+          onChange={(value) => setGroupBy(value as "functions" | "queues")}
+          data={[
+            { label: "By function", value: "functions" },
+            { label: "By queue", value: "queues" },
+          ]}
+        />
+      </Group>
+      <ScrollArea>
+        <Table miw={800}>
+          <Table.Thead>
+            <Table.Tr>
+              <Table.Th>
+                {groupBy === "functions" ? "Function" : "Queue"}
+              </Table.Th>
+              <Table.Th>Total</Table.Th>
+              <Table.Th>Queued</Table.Th>
+              <Table.Th>In progress</Table.Th>
+              <Table.Th>Complete / failed</Table.Th>
+              <Table.Th>Success rate</Table.Th>
+              <Table.Th>Duration avg / p95</Table.Th>
+              <Table.Th>Queue wait avg / p95</Table.Th>
+            </Table.Tr>
+          </Table.Thead>
+          <Table.Tbody>{rows}</Table.Tbody>
+        </Table>
+      </ScrollArea>
+    </Paper>
+  );
+});
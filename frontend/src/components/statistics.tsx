@@ -1,4 +1,4 @@
-import { Group, Paper, SimpleGrid, Text } from "@mantine/core";
+import { Alert, Group, Paper, SimpleGrid, Stack, Text } from "@mantine/core";
 import {
   IconActivity,
   IconBug,
@@ -39,40 +39,49 @@ const Card = ({
 );
 
 export const Statistics = observer(() => (
-  <SimpleGrid cols={{ xs: 1, sm: 2, md: 4 }}>
-    <Card
-      title="Total jobs"
-      value={rootStore.statistics.total}
-      description="Total jobs in the database"
-      icon={
-        <IconCircleNumber0
-          className={classes.icon}
-          size="1.4rem"
-          stroke={1.5}
-        />
-      }
-    />
-    <Card
-      title="Queued"
-      value={rootStore.statistics.queued}
-      description="Total jobs in the queue"
-      icon={
-        <IconActivity className={classes.icon} size="1.4rem" stroke={1.5} />
-      }
-    />
-    <Card
-      title="In progress"
-      value={rootStore.statistics.in_progress}
-      description="Total jobs in progress"
-      icon={
-        <IconProgress className={classes.icon} size="1.4rem" stroke={1.5} />
-      }
-    />
-    <Card
-      title="Errors"
-      value={rootStore.statistics.failed}
-      description="Total jobs with errors"
-      icon={<IconBug className={classes.icon} size="1.4rem" stroke={1.5} />}
-    />
-  </SimpleGrid>
+  <Stack>
+    {rootStore.loading_progress !== null && (
+      <Alert color="yellow">
+        Loading jobs after a restart:{" "}
+        {Math.round(rootStore.loading_progress * 100)}%. The figures below are
+        incomplete until all jobs are loaded.
+      </Alert>
+    )}
+    <SimpleGrid cols={{ xs: 1, sm: 2, md: 4 }}>
+      <Card
+        title="Total jobs"
+        value={rootStore.statistics.total}
+        description="Total jobs in the database"
+        icon={
+          <IconCircleNumber0
+            className={classes.icon}
+            size="1.4rem"
+            stroke={1.5}
+          />
+        }
+      />
+      <Card
+        title="Queued"
+        value={rootStore.statistics.queued}
+        description="Total jobs in the queue"
+        icon={
+          <IconActivity className={classes.icon} size="1.4rem" stroke={1.5} />
+        }
+      />
+      <Card
+        title="In progress"
+        value={rootStore.statistics.in_progress}
+        description="Total jobs in progress"
+        icon={
+          <IconProgress className={classes.icon} size="1.4rem" stroke={1.5} />
+        }
+      />
+      <Card
+        title="Errors"
+        value={rootStore.statistics.failed}
+        description="Total jobs with errors"
+        icon={<IconBug className={classes.icon} size="1.4rem" stroke={1.5} />}
+      />
+    </SimpleGrid>
+  </Stack>
 ));
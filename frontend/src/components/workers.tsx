@@ -0,0 +1,85 @@
+import { Badge, Paper, ScrollArea, Table, Text } from "@mantine/core";
+import { format } from "date-fns";
+import { observer } from "mobx-react-lite";
+
+import { IWorker } from "../api/types";
+import { rootStore } from "../stores";
+
+function formatAge(seconds: number | null): string {
+  if (seconds === null) return "-";
+  if (seconds < 60) return `${Math.round(seconds)}s ago`;
+  if (seconds < 3600) return `${Math.round(seconds / 60)}m ago`;
+  return `${Math.round(seconds / 3600)}h ago`;
+}
+
+function WorkerStatus({ worker }: { worker: IWorker }) {
+  if (!worker.alive) {
+    return <Badge color="red">gone</Badge>;
+  }
+  // arq writes the health check again before it expires, unless the worker is stuck.
+  if (worker.seconds_to_expiry !== null && worker.seconds_to_expiry < 1) {
+    return <Badge color="orange">stalled</Badge>;
+  }
+  return <Badge color="green">alive</Badge>;
+}
+
+export const Workers = observer(() => {
+  if (!rootStore.workers.length) {
+    return null;
+  }
+  const rows = rootStore.workers.map((worker) => (
+    <Table.Tr key={worker.health_check_key}>
+      <Table.Td>
+        <Text size="sm">{worker.health_check_key}</Text>
+      </Table.Td>
+      <Table.Td>
+        <WorkerStatus worker={worker} />
+      </Table.Td>
+      <Table.Td>
+        <Text size="sm">
+          {formatAge(worker.seconds_since_heartbeat)}
+          {worker.last && (
+            <Text span size="xs" c="dimmed">
+              {" "}
+              ({format(worker.last.time, "HH:mm:ss")})
+            </Text>
+          )}
+        </Text>
+      </Table.Td>
+      <Table.Td>{worker.last?.jobs_ongoing ?? "-"}</Table.Td>
+      <Table.Td>
+        {worker.last
+          ? `${worker.last.jobs_complete} / ${worker.last.jobs_failed} / ${worker.last.jobs_retried}`
+          : "-"}
+      </Table.Td>
+      <Table.Td>
+        {worker.throughput === null ? "-" : worker.throughput.toFixed(1)}
+      </Table.Td>
+      <Table.Td>{worker.last?.queued ?? "-"}</Table.Td>
+    </Table.Tr>
+  ));
+
+  return (
+    <Paper withBorder p="md" radius="md" shadow="sm">
+      <Text size="xs" c="dimmed" fw={700} tt="uppercase" mb="sm">
+        Workers · {rootStore.workers_in_progress} jobs in progress
+      </Text>
+      <ScrollArea>
+        <Table miw={700}>
+          <Table.Thead>
+            <Table.Tr>
+              <Table.Th>Health check</Table.Th>
+              <Table.Th>Status</Table.Th>
+              <Table.Th>Last heartbeat</Table.Th>
+              <Table.Th>Ongoing</Table.Th>
+              <Table.Th>Complete / failed / retried</Table.Th>
+              <Table.Th>Jobs per minute</Table.Th>
+              <Table.Th>Queued</Table.Th>
+            </Table.Tr>
+          </Table.Thead>
+          <Table.Tbody>{rows}</Table.Tbody>
+        </Table>
+      </ScrollArea>
+    </Paper>
+  );
+});
@@ -1,8 +1,20 @@
 import { notifications } from "@mantine/notifications";
 import { makeAutoObservable, runInAction } from "mobx";
 
-import { abortJob, fetchJob, fetchJobs } from "../api";
-import { IFetchJobsParams, IJobsInfo } from "../api/types";
+import {
+  abortJob,
+  fetchBreakdown,
+  fetchChanges,
+  fetchJob,
+  fetchJobs,
+  fetchWorkers,
+} from "../api";
+import {
+  IBreakdown,
+  IFetchJobsParams,
+  IJobsInfo,
+  IWorker,
+} from "../api/types";
 
 import {
   AbortStatus,
@@ -20,6 +32,11 @@ export class RootStore {
   functions: string[] = [];
   statistics: Statistics = new Statistics();
   statistics_hourly: JobsTimeStatistics[] = [];
+  workers: IWorker[] = [];
+  workers_in_progress: number = 0;
+  loading_progress: number | null = null;
+  changes_version: string | null = null;
+  breakdown: IBreakdown = { functions: [], queues: [] };
 
   constructor() {
     makeAutoObservable(this);
@@ -48,8 +65,13 @@ export class RootStore {
     }
 
     try {
-      const jobsData: IJobsInfo = await fetchJobs(params);
+      // The token is taken along with the jobs, later changes are polled.
+      const [changes, jobsData] = await Promise.all([
+        fetchChanges(),
+        fetchJobs(params),
+      ]);
       runInAction(() => {
+        this.changes_version = changes.version;
         this.tableJobs.items = jobsData.paged_jobs.items.map(
           (jobData) => new Job(jobData),
         );
@@ -58,7 +80,14 @@ export class RootStore {
         this.functions = jobsData.functions;
         this.statistics = jobsData.statistics;
         this.statistics_hourly = jobsData.statistics_hourly;
+        this.loading_progress = jobsData.partial ? jobsData.progress : null;
       });
+      // Served from the job index the jobs request has just refreshed.
+      this.loadBreakdown();
+      if (jobsData.partial) {
+        // Jobs are still loading after a restart, reload until they all are.
+        setTimeout(() => this.loadData(), 2000);
+      }
     } catch (error) {
       console.error("Failed to load data", error);
 
@@ -74,6 +103,54 @@ export class RootStore {
     }
   }
 
+  async loadChanges() {
+    if (this.changes_version === null || this.isLoading) {
+      return;
+    }
+    try {
+      const changes = await fetchChanges(this.changes_version);
+      if (changes.reset) {
+        this.loadData();
+        return;
+      }
+      runInAction(() => {
+        this.changes_version = changes.version;
+        // Jobs on the page are patched, new ones appear on the next load.
+        for (const jobData of changes.updated) {
+          const job = this.tableJobs.items.find((job) => job.id === jobData.id);
+          if (job) {
+            Object.assign(job, jobData);
+          }
+        }
+      });
+    } catch (error) {
+      console.error("Failed to load changes", error);
+    }
+  }
+
+  async loadBreakdown() {
+    try {
+      const breakdown = await fetchBreakdown();
+      runInAction(() => {
+        this.breakdown = breakdown;
+      });
+    } catch (error) {
+      console.error("Failed to load breakdown", error);
+    }
+  }
+
+  async loadWorkers() {
+    try {
+      const workersData = await fetchWorkers();
+      runInAction(() => {
+        this.workers = workersData.workers;
+        this.workers_in_progress = workersData.in_progress;
+      });
+    } catch (error) {
+      console.error("Failed to load workers", error);
+    }
+  }
+
   async loadJob(jobId: string) {
     const newJob = await fetchJob(jobId);
     const job = this.tableJobs.items.find((job) => job.id === jobId);